@@ -0,0 +1,89 @@
+import argparse
+import time
+from typing import Any, Callable, Dict, List
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.svm import SVC
+from src.artifacts import load_artifact
+from src.preprocess import transform_corpus
+from src.scoring import build_scorer
+from src.utils.logger import setup_logger
+
+logger = setup_logger("spam_classifier.bench_scoring")
+
+
+def legacy_score(model: Any, vector_input) -> tuple:
+    """Score the way SpamClassifier did before the fused scorer: predict, then predict_proba"""
+    return model.predict(vector_input), model.predict_proba(vector_input).max(axis=1)
+
+
+def time_per_call(func: Callable[[], Any], repeat: int) -> float:
+    """Median microseconds per call over repeat calls"""
+    samples = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start_time)
+    return float(np.median(samples) * 1e6)
+
+
+def run_benchmark(data_path: str, vectorizer_path: str, model_path: str,
+                  repeat: int = 200, batch_size: int = 64) -> List[Dict[str, Any]]:
+    """
+    Compare the legacy predict + predict_proba path with the fused scorer
+
+    Args:
+        data_path: Dataset CSV providing benchmark messages
+        vectorizer_path: Fitted vectorizer artifact
+        model_path: Model artifact benchmarked alongside SVC and random forest models
+        repeat: Timed calls per measurement
+        batch_size: Messages per batch measurement
+
+    Returns:
+        One result row per model and input size
+    """
+    df = pd.read_csv(data_path, encoding='latin-1')[['v1', 'v2']]
+    vectorizer = load_artifact(vectorizer_path)
+    X = vectorizer.transform(transform_corpus(df['v2'].tolist()))
+    y = (df['v1'] == 'spam').astype(int).values
+
+    # The shipped model plus the slower algorithms train.py can produce
+    models = {
+        type(load_artifact(model_path)).__name__: load_artifact(model_path),
+        'SVC(linear, probability)': SVC(kernel='linear', probability=True, random_state=42).fit(X[:2000], y[:2000]),
+        'RandomForestClassifier': RandomForestClassifier(n_estimators=100, random_state=42).fit(X[:2000], y[:2000]),
+    }
+
+    results = []
+    for name, model in models.items():
+        scorer = build_scorer(model)
+        for label, vector_input in [('single', X[2500:2501]), (f'batch_{batch_size}', X[2500:2500 + batch_size])]:
+            legacy_us = time_per_call(lambda: legacy_score(model, vector_input), repeat)
+            fused_us = time_per_call(lambda: scorer.score(vector_input), repeat)
+            results.append({
+                'model': name,
+                'scorer': type(scorer).__name__,
+                'input': label,
+                'legacy_us': legacy_us,
+                'fused_us': fused_us,
+                'speedup': legacy_us / fused_us
+            })
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the fused scoring path")
+    parser.add_argument("--data-path", default="data/spam.csv", help="Dataset CSV")
+    parser.add_argument("--vectorizer", default="models/vectorizer.pkl", help="Vectorizer artifact")
+    parser.add_argument("--model", default="models/model.pkl", help="Model artifact")
+    parser.add_argument("--repeat", type=int, default=200, help="Timed calls per measurement")
+    parser.add_argument("--batch-size", type=int, default=64, help="Messages per batch measurement")
+
+    args = parser.parse_args()
+
+    rows = run_benchmark(args.data_path, args.vectorizer, args.model, args.repeat, args.batch_size)
+    print(f"{'model':<26}{'scorer':<14}{'input':<10}{'legacy us':>11}{'fused us':>10}{'speedup':>9}")
+    for row in rows:
+        print(f"{row['model']:<26}{row['scorer']:<14}{row['input']:<10}"
+              f"{row['legacy_us']:>11.1f}{row['fused_us']:>10.1f}{row['speedup']:>8.1f}x")
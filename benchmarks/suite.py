@@ -0,0 +1,367 @@
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from typing import Any, Dict, List
+import numpy as np
+import pandas as pd
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+SAMPLE_TEXTS = [
+    "URGENT! You have won a 1 week FREE membership in our £100,000 Prize Jackpot! Txt the word: CLAIM to No: 81010",
+    "Hey, are we still meeting for lunch today? Let me know if you're running late.",
+    "Congratulations ur awarded 500 of CD vouchers or 125gift guaranteed & Free entry 2 100 wkly draw txt MUSIC to 87066",
+    "I'll be home late tonight, don't wait up. Can you feed the cat?",
+]
+
+
+def _metric(value: float, unit: str, higher_is_better: bool = False, gated: bool = True) -> Dict[str, Any]:
+    """Build one machine-readable benchmark metric, gated metrics fail the suite on regression"""
+    return {"value": round(float(value), 3), "unit": unit, "higher_is_better": higher_is_better, "gated": gated}
+
+
+def _percentiles(name: str, samples: List[float]) -> Dict[str, Dict[str, Any]]:
+    """p50 and p95 microsecond metrics for a list of second timings, gating on p50 only"""
+    micros = np.asarray(samples) * 1e6
+    return {
+        f"{name}_p50_us": _metric(np.percentile(micros, 50), "us"),
+        f"{name}_p95_us": _metric(np.percentile(micros, 95), "us", gated=False),
+    }
+
+
+def _stream_handlers():
+    """Stream handlers of the application loggers, including the async log listener's"""
+    from src.utils import logger as log_setup
+
+    handlers = []
+    for name, item in list(logging.Logger.manager.loggerDict.items()):
+        if name.startswith("spam_classifier") and isinstance(item, logging.Logger):
+            handlers.extend(item.handlers)
+    if log_setup._queue_listener is not None:
+        handlers.extend(log_setup._queue_listener.handlers)
+    return [handler for handler in handlers if isinstance(handler, logging.StreamHandler)]
+
+
+@contextmanager
+def quiet_logs():
+    """Send application and server logs to /dev/null while benchmarking"""
+    devnull = open(os.devnull, 'w')
+    stdout = sys.stdout
+    saved = {handler: handler.setStream(devnull) for handler in _stream_handlers()}
+    werkzeug_logger = logging.getLogger("werkzeug")
+    werkzeug_level = werkzeug_logger.level
+    werkzeug_logger.setLevel(logging.ERROR)
+
+    # Loggers set up inside the block bind to sys.stdout when created
+    sys.stdout = devnull
+    try:
+        yield devnull
+    finally:
+        sys.stdout = stdout
+        for handler in _stream_handlers():
+            if handler.stream is devnull:
+                handler.setStream(saved.get(handler, stdout))
+        werkzeug_logger.setLevel(werkzeug_level)
+        devnull.close()
+
+
+def bench_predict_stages(classifier: Any, repeat: int = 500) -> Dict[str, Dict[str, Any]]:
+    """
+    Time SpamClassifier.predict and each stage it reports
+
+    Stage timings come from the classifier's own stage listener hook, so
+    they always measure the code predict actually runs.
+
+    Args:
+        classifier: Loaded SpamClassifier
+        repeat: Timed predictions
+
+    Returns:
+        p50/p95 latency metrics for every reported stage (preprocess,
+        vectorize, model and logging with the caches disabled) and the
+        end-to-end predict call
+    """
+    timings: Dict[str, List[float]] = {}
+
+    def record(stage: str, seconds: float, batch_size: int) -> None:
+        timings.setdefault(stage, []).append(seconds)
+
+    predict_seconds = []
+    classifier.add_stage_listener(record)
+    try:
+        for index in range(repeat):
+            text = SAMPLE_TEXTS[index % len(SAMPLE_TEXTS)]
+            start_time = time.perf_counter()
+            classifier.predict(text)
+            predict_seconds.append(time.perf_counter() - start_time)
+    finally:
+        classifier.remove_stage_listener(record)
+    timings["predict"] = predict_seconds
+
+    metrics: Dict[str, Dict[str, Any]] = {}
+    for stage, samples in timings.items():
+        metrics.update(_percentiles(f"stage_{stage}", samples))
+    return metrics
+
+
+def bench_endpoint_throughput(concurrency: int = 8, requests_per_worker: int = 50) -> Dict[str, Dict[str, Any]]:
+    """
+    Load the Flask /predict endpoint from concurrent local clients
+
+    The app is served by a threaded werkzeug server on an ephemeral port.
+
+    Args:
+        concurrency: Client threads sending requests
+        requests_per_worker: Requests sent by each client thread
+
+    Returns:
+        Throughput and p50/p95 request latency metrics
+    """
+    from werkzeug.serving import make_server
+    from src.api import app, classifier
+
+    classifier.wait_until_ready(60)
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+    url = f"http://127.0.0.1:{server.server_port}/predict"
+
+    latencies: List[float] = []
+    errors: List[Exception] = []
+    lock = threading.Lock()
+
+    def client(worker: int) -> None:
+        local = []
+        for index in range(requests_per_worker):
+            body = json.dumps({"text": SAMPLE_TEXTS[(worker + index) % len(SAMPLE_TEXTS)]}).encode("utf-8")
+            req = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+            start_time = time.perf_counter()
+            try:
+                with urllib.request.urlopen(req, timeout=30) as response:
+                    response.read()
+            except Exception as e:
+                with lock:
+                    errors.append(e)
+                continue
+            local.append(time.perf_counter() - start_time)
+        with lock:
+            latencies.extend(local)
+
+    try:
+        threads = [threading.Thread(target=client, args=(worker,)) for worker in range(concurrency)]
+        start_time = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start_time
+    finally:
+        server.shutdown()
+        server_thread.join()
+
+    if errors:
+        raise RuntimeError(f"{len(errors)} of {concurrency * requests_per_worker} requests failed: {errors[0]}")
+
+    metrics = {"endpoint_throughput_rps": _metric(len(latencies) / elapsed, "req/s", higher_is_better=True)}
+    metrics.update(_percentiles("endpoint_latency", latencies))
+    return metrics
+
+
+def bench_preprocess_throughput(data_path: str = "data/spam.csv", workers: int = 1) -> Dict[str, Dict[str, Any]]:
+    """
+    Measure training preprocessing throughput over the dataset
+
+    The stem cache is cleared first so the measurement matches a fresh
+    training run.
+
+    Args:
+        data_path: Dataset CSV
+        workers: Worker processes passed to transform_corpus
+
+    Returns:
+        Messages per second metric
+    """
+    from src.preprocess import clear_stem_cache, transform_corpus
+
+    texts = pd.read_csv(data_path, encoding='latin-1')['v2'].tolist()
+    clear_stem_cache()
+    start_time = time.perf_counter()
+    transform_corpus(texts, workers=workers)
+    elapsed = time.perf_counter() - start_time
+    return {"preprocess_throughput_msgs_per_s": _metric(len(texts) / elapsed, "msg/s", higher_is_better=True)}
+
+
+def bench_batch_vectorize(vectorizer_path: str = "models/vectorizer.pkl", data_path: str = "data/spam.csv",
+                          batch_size: int = 2000, repeat: int = 5) -> Dict[str, Dict[str, Any]]:
+    """
+    Time the TF-IDF transform of one large batch, as /predict/batch and bulk scoring run it
+
+    The compact vectorizer is timed on its first call, when every distinct
+    term still has to be hashed, and again once its term column cache is
+    warm. The TfidfVectorizer it is built from is timed as a reference
+    when the artifact holds one.
+
+    Args:
+        vectorizer_path: Vectorizer artifact
+        data_path: Dataset CSV the batch is taken from
+        batch_size: Messages per batch
+        repeat: Timed transforms per measurement, the median is reported
+
+    Returns:
+        Median cold, warm and reference batch transform metrics
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from src.artifacts import compact_vectorizer, load_artifact
+    from src.preprocess import transform_corpus
+
+    texts = pd.read_csv(data_path, encoding='latin-1')['v2'].tolist()[:batch_size]
+    batch = transform_corpus(texts)
+    vectorizer = load_artifact(vectorizer_path)
+
+    def median_seconds(transform, fresh=None):
+        samples = []
+        for _ in range(repeat):
+            if fresh is not None:
+                transform = fresh().transform
+            start_time = time.perf_counter()
+            transform(batch)
+            samples.append(time.perf_counter() - start_time)
+        return float(np.median(samples))
+
+    compact = compact_vectorizer(vectorizer)
+    metrics = {
+        "batch_vectorize_cold_us": _metric(median_seconds(None, lambda: compact_vectorizer(vectorizer)) * 1e6, "us"),
+        "batch_vectorize_us": _metric(median_seconds(compact.transform) * 1e6, "us")
+    }
+    if isinstance(vectorizer, TfidfVectorizer):
+        metrics["batch_vectorize_sklearn_us"] = _metric(median_seconds(vectorizer.transform) * 1e6, "us", gated=False)
+    return metrics
+
+
+def run_suite(repeat: int = 500, concurrency: int = 8, requests_per_worker: int = 50,
+              data_path: str = "data/spam.csv") -> Dict[str, Any]:
+    """
+    Run every benchmark
+
+    Args:
+        repeat: Timed predictions per stage
+        concurrency: Client threads for the endpoint benchmark
+        requests_per_worker: Requests per endpoint client thread
+        data_path: Dataset CSV for the preprocessing benchmark
+
+    Returns:
+        Report with environment details and a flat metrics dict
+    """
+    with quiet_logs():
+        from src.predict import SpamClassifier
+
+        classifier = SpamClassifier(
+            model_path=os.getenv("MODEL_PATH", "models/model.pkl"),
+            vectorizer_path=os.getenv("VECTORIZER_PATH", "models/vectorizer.pkl"),
+            cache_size=0,
+            near_duplicate_size=0
+        )
+        metrics: Dict[str, Dict[str, Any]] = {}
+        metrics.update(bench_predict_stages(classifier, repeat))
+        metrics.update(bench_endpoint_throughput(concurrency, requests_per_worker))
+        metrics.update(bench_preprocess_throughput(data_path))
+        metrics.update(bench_batch_vectorize(classifier.vectorizer_path, data_path))
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": sys.version.split()[0],
+        "cpu_count": os.cpu_count(),
+        "metrics": metrics
+    }
+
+
+def compare_to_baseline(metrics: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+                        threshold: float = 0.25, min_latency_delta_us: float = 50.0) -> List[str]:
+    """
+    Find metrics that regressed against a baseline
+
+    A latency regresses when it grows by more than threshold and by more
+    than min_latency_delta_us, so jitter on stages that take a few
+    microseconds does not fail the gate. A throughput regresses when it
+    drops by more than threshold. Ungated metrics such as tail latencies
+    and metrics missing from either side are ignored.
+
+    Args:
+        metrics: Current metrics from run_suite
+        baseline: Baseline metrics from a previous run_suite
+        threshold: Allowed relative change, e.g. 0.25 for 25%
+        min_latency_delta_us: Smallest latency increase counted as a regression
+
+    Returns:
+        Human-readable description of every regression
+    """
+    regressions = []
+    for name, current in metrics.items():
+        reference = baseline.get(name)
+        if not current.get("gated", True) or reference is None or reference["value"] <= 0:
+            continue
+        change = current["value"] / reference["value"] - 1
+        if current.get("higher_is_better"):
+            change = -change
+        elif current["value"] - reference["value"] <= min_latency_delta_us:
+            continue
+        if change > threshold:
+            regressions.append(
+                f"{name}: {current['value']} {current['unit']} vs baseline "
+                f"{reference['value']} {reference['unit']} ({change:+.0%} worse)"
+            )
+    return regressions
+
+
+def main(argv: List[str] = None) -> int:
+    """Run the suite from the command line, returning the process exit code"""
+    parser = argparse.ArgumentParser(description="Latency and throughput benchmarks with regression gating")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline report to compare against")
+    parser.add_argument("--threshold", type=float, default=float(os.getenv("BENCHMARK_THRESHOLD", 0.5)),
+                        help="Allowed relative regression per metric")
+    parser.add_argument("--min-latency-delta-us", type=float, default=50.0,
+                        help="Smallest latency increase counted as a regression")
+    parser.add_argument("--update-baseline", action="store_true", help="Store this run as the new baseline")
+    parser.add_argument("--repeat", type=int, default=500, help="Timed predictions per stage")
+    parser.add_argument("--concurrency", type=int, default=8, help="Endpoint client threads")
+    parser.add_argument("--requests", type=int, default=50, help="Requests per endpoint client thread")
+    parser.add_argument("--data-path", default="data/spam.csv", help="Dataset CSV")
+
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.repeat, args.concurrency, args.requests, args.data_path)
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.baseline}", file=sys.stderr)
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        report["baseline"] = args.baseline
+        report["threshold"] = args.threshold
+        report["regressions"] = compare_to_baseline(
+            report["metrics"], baseline["metrics"], args.threshold, args.min_latency_delta_us
+        )
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        print(text)
+
+    # Keep stdout a clean JSON document
+    for regression in report.get("regressions", []):
+        print(f"Benchmark regression: {regression}", file=sys.stderr)
+    return 1 if report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
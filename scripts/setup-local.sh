@@ -18,9 +18,7 @@ echo "Installing Python dependencies..."
 pip install --upgrade pip
 pip install -r requirements.txt
 
-# Download NLTK data
-echo "Downloading NLTK data..."
-python -c "import nltk; nltk.download('punkt'); nltk.download('punkt_tab'); nltk.download('stopwords')"
+# NLTK stopwords and Punkt tables are vendored in src/nltk_data
 
 echo ""
 echo "===== Setup Complete ====="
@@ -0,0 +1,183 @@
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+# Queued requests are admitted from the first non-empty lane in this order
+LANES = ('interactive', 'batch')
+
+
+class RequestShedError(RuntimeError):
+    """Raised when a request is rejected to protect the latency of admitted ones"""
+
+    def __init__(self, lane: str, reason: str, retry_after: int):
+        super().__init__(f"Request shed from the {lane} lane: {reason}")
+        self.lane = lane
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    """A queued request waiting for a free slot"""
+
+    __slots__ = ('event', 'admitted')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.admitted = False
+
+
+class AdmissionController:
+    """
+    Adaptive concurrency limit with a bounded, deadline-aware queue
+
+    At most limit requests run at once. The limit follows the latency of
+    completed requests: it grows by 1/limit per request completed while
+    the limit was fully used and latency stayed within the target, and is
+    cut by backoff_ratio, at most once per target interval, when latency
+    exceeds it. Requests over the limit wait in a per-lane FIFO queue;
+    interactive requests are admitted before batch ones. A request is shed
+    at once if the queue is full or its expected wait already exceeds its
+    deadline, and is shed if its deadline passes while it waits.
+    """
+
+    def __init__(self, max_limit: int = 64, min_limit: int = 1, initial_limit: Optional[int] = None,
+                 latency_target_ms: float = 200.0, queue_size: int = 50, queue_timeout_ms: float = 1000.0,
+                 backoff_ratio: float = 0.9, on_shed: Optional[Callable[[str, str], None]] = None):
+        """
+        Initialize admission controller
+
+        Args:
+            max_limit: Upper bound of the concurrency limit
+            min_limit: Lower bound of the concurrency limit
+            initial_limit: Starting concurrency limit (defaults to max_limit)
+            latency_target_ms: Request latency above which the limit shrinks
+            queue_size: Maximum requests waiting across all lanes
+            queue_timeout_ms: Longest a request may wait for a slot, unless
+                its own deadline is shorter
+            backoff_ratio: Factor applied to the limit when latency is over target
+            on_shed: Optional callback receiving (lane, reason) for every
+                request shed, reason being 'queue_full', 'deadline' or 'timeout'
+        """
+        self.max_limit = max_limit
+        self.min_limit = max(min_limit, 1)
+        self.latency_target = latency_target_ms / 1000
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout_ms / 1000
+        self.backoff_ratio = backoff_ratio
+        self.on_shed = on_shed
+        self.admitted = 0
+        self.shed: Dict[str, int] = {'queue_full': 0, 'deadline': 0, 'timeout': 0}
+
+        self._limit = float(min(initial_limit or max_limit, max_limit))
+        self._in_flight = 0
+        self._latency = self.latency_target / 2
+        self._next_decrease = 0.0
+        self._queues: Dict[str, Deque[_Waiter]] = {lane: deque() for lane in LANES}
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        """Requests currently allowed to run at once"""
+        return max(self.min_limit, int(self._limit))
+
+    def _queued(self) -> int:
+        """Requests waiting in every lane; caller holds the lock"""
+        return sum(len(waiters) for waiters in self._queues.values())
+
+    def _expected_wait(self, position: int) -> float:
+        """Seconds until the request at a queue position gets a slot; caller holds the lock"""
+        return position * self._latency / self.limit
+
+    def _shed(self, lane: str, reason: str, position: int) -> RequestShedError:
+        """Count a shed request; caller holds the lock"""
+        self.shed[reason] += 1
+        retry_after = max(1, math.ceil(self._expected_wait(position)))
+        return RequestShedError(lane, reason, retry_after)
+
+    def acquire(self, lane: str = 'interactive', timeout_ms: Optional[float] = None) -> float:
+        """
+        Wait for a slot to run a request
+
+        Args:
+            lane: 'interactive' or 'batch'
+            timeout_ms: The caller's own deadline, if shorter than queue_timeout_ms
+
+        Returns:
+            Seconds spent queued
+
+        Raises:
+            RequestShedError: If the request is rejected
+        """
+        timeout = self.queue_timeout if timeout_ms is None else min(timeout_ms / 1000, self.queue_timeout)
+        start_time = time.monotonic()
+        error = None
+        with self._lock:
+            queued = self._queued()
+            if not queued and self._in_flight < self.limit:
+                self._in_flight += 1
+                self.admitted += 1
+                return 0.0
+            if queued >= self.queue_size:
+                error = self._shed(lane, 'queue_full', queued + 1)
+            elif self._expected_wait(queued + 1) > timeout:
+                error = self._shed(lane, 'deadline', queued + 1)
+            else:
+                waiter = _Waiter()
+                self._queues[lane].append(waiter)
+        if error is None:
+            waiter.event.wait(timeout)
+            with self._lock:
+                if waiter.admitted:
+                    return time.monotonic() - start_time
+                self._queues[lane].remove(waiter)
+                error = self._shed(lane, 'timeout', self._queued() + 1)
+
+        if self.on_shed is not None:
+            self.on_shed(lane, error.reason)
+        raise error
+
+    def release(self, latency: Optional[float] = None) -> None:
+        """
+        Free a slot and admit the next queued request
+
+        Args:
+            latency: Seconds the request took once admitted, None to leave
+                the limit unchanged
+        """
+        with self._lock:
+            if latency is not None:
+                self._observe(latency)
+            self._in_flight -= 1
+            while self._in_flight < self.limit:
+                waiter = next((waiters.popleft() for waiters in self._queues.values() if waiters), None)
+                if waiter is None:
+                    break
+                waiter.admitted = True
+                self._in_flight += 1
+                self.admitted += 1
+                waiter.event.set()
+
+    def _observe(self, latency: float) -> None:
+        """Adapt the limit to a completed request's latency; caller holds the lock"""
+        self._latency += 0.1 * (latency - self._latency)
+        if latency > self.latency_target:
+            now = time.monotonic()
+            if now >= self._next_decrease:
+                self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+                self._next_decrease = now + self.latency_target
+        elif self._in_flight >= self.limit:
+            self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get admission statistics"""
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "in_flight": self._in_flight,
+                "queued": {lane: len(waiters) for lane, waiters in self._queues.items()},
+                "admitted": self.admitted,
+                "shed": dict(self.shed),
+                "latency_ms": self._latency * 1000
+            }
@@ -1,10 +1,21 @@
-from flask import Flask, request, jsonify
+import time
+
+# Taken before the other imports so the import phase of startup is measured
+_import_started = time.perf_counter()
+
+from flask import Flask, g, request, jsonify
 import os
-from src.predict import SpamClassifier
+import threading
+from src.admission import AdmissionController, RequestShedError
+from src.batching import MicroBatcher
+from src.predict import ModelNotReadyError, SpamClassifier
+from src.preprocess import get_stem_cache_info
+from src.registry import ModelRegistry
+from src.shadow import ShadowEvaluator
 from src.utils.health import get_health_status, get_readiness_status
-from src.utils.logger import setup_logger
-from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
-import time
+from src.utils.logger import get_log_queue_stats, setup_logger
+from src.utils.profiler import SamplingProfiler
+from prometheus_client import Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
 
 app = Flask(__name__)
 logger = setup_logger("spam_classifier.api")
@@ -12,16 +23,381 @@ logger = setup_logger("spam_classifier.api")
 # Prometheus metrics
 REQUEST_COUNT = Counter('spam_classifier_requests_total', 'Total requests', ['method', 'endpoint', 'status'])
 REQUEST_LATENCY = Histogram('spam_classifier_request_latency_seconds', 'Request latency', ['endpoint'])
-PREDICTION_COUNT = Counter('spam_classifier_predictions_total', 'Total predictions', ['prediction'])
+PREDICTION_COUNT = Counter('spam_classifier_predictions_total', 'Total predictions', ['prediction', 'model_version'])
+BATCH_SIZE = Histogram('spam_classifier_batch_size', 'Texts per batch prediction request',
+                       buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000))
+BATCH_LATENCY = Histogram('spam_classifier_batch_latency_seconds', 'Batch prediction latency')
+STAGE_LATENCY = Histogram('spam_classifier_stage_latency_seconds', 'Time spent in each prediction stage',
+                          ['stage', 'mode'],
+                          buckets=(0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001,
+                                   0.0025, 0.005, 0.01, 0.025, 0.05, 0.1))
+STEM_CACHE_HITS = Gauge('spam_classifier_stem_cache_hits', 'Stem cache hits')
+STEM_CACHE_MISSES = Gauge('spam_classifier_stem_cache_misses', 'Stem cache misses')
+STEM_CACHE_SIZE = Gauge('spam_classifier_stem_cache_size', 'Entries in the stem cache')
+STEM_CACHE_HITS.set_function(lambda: get_stem_cache_info()['hits'])
+STEM_CACHE_MISSES.set_function(lambda: get_stem_cache_info()['misses'])
+STEM_CACHE_SIZE.set_function(lambda: get_stem_cache_info()['size'])
+
+PREDICTION_CACHE_HITS = Gauge('spam_classifier_prediction_cache_hits', 'Prediction cache hits')
+PREDICTION_CACHE_MISSES = Gauge('spam_classifier_prediction_cache_misses', 'Prediction cache misses')
+PREDICTION_CACHE_HIT_RATIO = Gauge('spam_classifier_prediction_cache_hit_ratio', 'Prediction cache hit ratio')
+PREDICTION_CACHE_SIZE = Gauge('spam_classifier_prediction_cache_size', 'Entries in the prediction cache')
+NEAR_DUPLICATE_HITS = Gauge('spam_classifier_near_duplicate_hits', 'Predictions answered from a spam cluster')
+NEAR_DUPLICATE_MISSES = Gauge('spam_classifier_near_duplicate_misses', 'Near-duplicate lookups matching no cluster')
+NEAR_DUPLICATE_HIT_RATIO = Gauge('spam_classifier_near_duplicate_hit_ratio', 'Near-duplicate index hit ratio')
+NEAR_DUPLICATE_SIZE = Gauge('spam_classifier_near_duplicate_clusters', 'Spam clusters in the near-duplicate index')
+NEAR_DUPLICATE_EVICTED = Gauge('spam_classifier_near_duplicate_evicted', 'Spam clusters evicted because the index was full')
+
+MICRO_BATCH_SIZE = Histogram('spam_classifier_micro_batch_size', 'Coalesced /predict requests per model call',
+                             buckets=(1, 2, 4, 8, 16, 32, 64, 128))
+MICRO_BATCH_QUEUE_DEPTH = Histogram('spam_classifier_micro_batch_queue_depth',
+                                    'Requests still queued when a micro-batch is dispatched',
+                                    buckets=(0, 1, 2, 4, 8, 16, 32, 64, 128, 256))
+
+LOG_QUEUE_DEPTH = Gauge('spam_classifier_log_queue_depth', 'Log records waiting to be written')
+LOG_RECORDS_DROPPED = Gauge('spam_classifier_log_records_dropped', 'Log records dropped because the log queue was full')
+LOG_QUEUE_DEPTH.set_function(lambda: get_log_queue_stats()['depth'])
+LOG_RECORDS_DROPPED.set_function(lambda: get_log_queue_stats()['dropped'])
+
+MODEL_INFO = Gauge('spam_classifier_model_info', 'Model version currently being served', ['model_version'])
+MODEL_RELOADS = Counter('spam_classifier_model_reloads_total', 'Model reload attempts', ['status'])
+SHADOW_COMPARISONS = Counter('spam_classifier_shadow_comparisons_total',
+                             'Shadow model predictions compared with the primary', ['outcome'])
+SHADOW_LATENCY = Histogram('spam_classifier_shadow_latency_seconds', 'Shadow model scoring latency',
+                           buckets=(0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001,
+                                    0.0025, 0.005, 0.01, 0.025, 0.05, 0.1))
+SHADOW_DROPPED = Gauge('spam_classifier_shadow_dropped', 'Inputs not shadow scored because the shadow pool was saturated')
+SHADOW_ERRORS = Gauge('spam_classifier_shadow_errors', 'Shadow scoring failures')
+SHADOW_AGREEMENT_RATE = Gauge('spam_classifier_shadow_agreement_rate', 'Fraction of shadow predictions matching the primary')
+REQUESTS_SHED = Counter('spam_classifier_requests_shed_total', 'Requests rejected by admission control',
+                        ['lane', 'reason'])
+ADMISSION_LIMIT = Gauge('spam_classifier_admission_limit', 'Adaptive limit on concurrently running predictions')
+ADMISSION_IN_FLIGHT = Gauge('spam_classifier_admission_in_flight', 'Predictions running under admission control')
+ADMISSION_QUEUED = Gauge('spam_classifier_admission_queued', 'Predictions waiting for an admission slot', ['lane'])
+ADMISSION_QUEUE_WAIT = Histogram('spam_classifier_admission_queue_wait_seconds', 'Time admitted requests spent queued',
+                                 buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5))
+STARTUP_SECONDS = Gauge('spam_classifier_startup_seconds', 'Seconds spent in each startup phase', ['phase'])
+
+MAX_BATCH_SIZE = int(os.getenv('MAX_BATCH_SIZE', 1000))
+ADMIN_TOKEN = os.getenv('ADMIN_TOKEN')
+MODEL_WATCH_INTERVAL = float(os.getenv('MODEL_WATCH_INTERVAL', 0))
+MICRO_BATCH_MAX_SIZE = int(os.getenv('MICRO_BATCH_MAX_SIZE', 0))
+MICRO_BATCH_MAX_WAIT_MS = float(os.getenv('MICRO_BATCH_MAX_WAIT_MS', 5))
+PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'false').lower() == 'true'
+PROFILER_INTERVAL_MS = float(os.getenv('PROFILER_INTERVAL_MS', 1))
+MODEL_REGISTRY_CONFIG = os.getenv('MODEL_REGISTRY_CONFIG')
+SHADOW_MODEL_PATH = os.getenv('SHADOW_MODEL_PATH')
+SHADOW_MODEL_VERSION = os.getenv('SHADOW_MODEL_VERSION', 'shadow')
+SHADOW_WORKERS = int(os.getenv('SHADOW_WORKERS', 1))
+SHADOW_MAX_PENDING = int(os.getenv('SHADOW_MAX_PENDING', 100))
+ADMISSION_MAX_CONCURRENCY = int(os.getenv('ADMISSION_MAX_CONCURRENCY', 0))
+ADMISSION_MIN_CONCURRENCY = int(os.getenv('ADMISSION_MIN_CONCURRENCY', 1))
+ADMISSION_LATENCY_TARGET_MS = float(os.getenv('ADMISSION_LATENCY_TARGET_MS', 200))
+ADMISSION_QUEUE_SIZE = int(os.getenv('ADMISSION_QUEUE_SIZE', 50))
+ADMISSION_QUEUE_TIMEOUT_MS = float(os.getenv('ADMISSION_QUEUE_TIMEOUT_MS', 1000))
+
+# Admission lane of each prediction endpoint; probes, /metrics and every
+# other endpoint bypass admission control so they are never queued or shed
+ADMISSION_LANES = {'/predict': 'interactive', '/predict/batch': 'batch', '/predict/compare': 'batch'}
+
+# Initialize classifier; the model is loaded and warmed up in the background
+# so probes answer while it loads
+classifier = SpamClassifier(
+    model_path=os.getenv("MODEL_PATH", "models/model.pkl"),
+    vectorizer_path=os.getenv("VECTORIZER_PATH", "models/vectorizer.pkl"),
+    load=False
+)
+
+
+def _prediction_cache_stat(name):
+    """Read a prediction cache statistic, 0 when the cache is disabled"""
+    if classifier.prediction_cache is None:
+        return 0
+    return classifier.prediction_cache.stats()[name]
+
+
+PREDICTION_CACHE_HITS.set_function(lambda: _prediction_cache_stat('hits'))
+PREDICTION_CACHE_MISSES.set_function(lambda: _prediction_cache_stat('misses'))
+PREDICTION_CACHE_HIT_RATIO.set_function(lambda: _prediction_cache_stat('hit_ratio'))
+PREDICTION_CACHE_SIZE.set_function(lambda: _prediction_cache_stat('size'))
+
+
+def _near_duplicate_stat(name):
+    """Read a near-duplicate index statistic, 0 when the index is disabled"""
+    if classifier.near_duplicates is None:
+        return 0
+    return classifier.near_duplicates.stats()[name]
+
+
+NEAR_DUPLICATE_HITS.set_function(lambda: _near_duplicate_stat('hits'))
+NEAR_DUPLICATE_MISSES.set_function(lambda: _near_duplicate_stat('misses'))
+NEAR_DUPLICATE_HIT_RATIO.set_function(lambda: _near_duplicate_stat('hit_ratio'))
+NEAR_DUPLICATE_SIZE.set_function(lambda: _near_duplicate_stat('size'))
+NEAR_DUPLICATE_EVICTED.set_function(lambda: _near_duplicate_stat('evicted'))
+
+
+def _record_reload(previous_version, model_version, error):
+    """Update reload metrics after the admin endpoint or file watcher reloads"""
+    if error is not None:
+        MODEL_RELOADS.labels(status='failure').inc()
+        return
+    MODEL_RELOADS.labels(status='success').inc()
+    # The previous version may never have been exported, after a failed
+    # startup, so drop every label rather than removing that one
+    MODEL_INFO.clear()
+    MODEL_INFO.labels(model_version=model_version).set(1)
+
+
+def _record_stage(stage, seconds, batch_size):
+    """Observe the time a prediction spent in one stage"""
+    STAGE_LATENCY.labels(stage=stage, mode='single' if batch_size == 1 else 'batch').observe(seconds)
+
+
+# Additional models selectable per request, and a candidate scoring live
+# traffic in the background, both loaded alongside the default model
+registry = None
+shadow = None
+
+# Load state of each serving component besides the default model, reported
+# by the health and readiness probes
+components = {}
+
+
+def _start_loading(name, load, required):
+    """
+    Run a component loader on its own thread, recording its state for the probes
+
+    A failure is logged and kept in the component state rather than raised,
+    so it never stops the default model, the startup metrics or the other
+    components from loading.
+
+    Args:
+        name: Component name reported by the probes
+        load: Function loading the component
+        required: Whether the pod is not ready until the component loads,
+            and unhealthy if it fails to
+
+    Returns:
+        The loader thread
+    """
+    state = {'required': required, 'loading': True, 'loaded': False, 'error': None}
+    components[name] = state
+
+    def run():
+        try:
+            load()
+            state['loaded'] = True
+        except Exception as e:
+            state['error'] = str(e)
+            if required:
+                logger.error(f"Loading {name} failed: {str(e)}", exc_info=True)
+            else:
+                logger.warning(f"Loading {name} failed, serving without it: {str(e)}")
+        finally:
+            state['loading'] = False
+
+    loader = threading.Thread(target=run, name=f"{name}-loader", daemon=True)
+    loader.start()
+    return loader
+
+
+def _load_registry():
+    """Load every model of the registry config"""
+    global registry
+    registry = ModelRegistry.from_config(MODEL_REGISTRY_CONFIG)
+
+
+def _registry_loading():
+    """Whether a configured model registry has not finished loading"""
+    state = components.get('registry')
+    return state is not None and state['loading']
+
+
+def _shadow_stat(name):
+    """Read a shadow evaluation statistic, 0 when shadow scoring is disabled"""
+    if shadow is None:
+        return 0
+    return shadow.stats()[name]
+
+
+SHADOW_DROPPED.set_function(lambda: _shadow_stat('dropped'))
+SHADOW_ERRORS.set_function(lambda: _shadow_stat('errors'))
+SHADOW_AGREEMENT_RATE.set_function(lambda: _shadow_stat('agreement_rate'))
+
+
+def _record_shadow(agreements, disagreements, seconds):
+    """Count shadow agreement and observe shadow scoring latency"""
+    SHADOW_COMPARISONS.labels(outcome='agree').inc(agreements)
+    SHADOW_COMPARISONS.labels(outcome='disagree').inc(disagreements)
+    SHADOW_LATENCY.observe(seconds)
+
+
+def _record_startup(load_seconds, warm_up_seconds):
+    """Report startup phase timings once the model is ready to serve"""
+    STARTUP_SECONDS.labels(phase='load').set(load_seconds)
+    STARTUP_SECONDS.labels(phase='warm_up').set(warm_up_seconds)
+    STARTUP_SECONDS.labels(phase='total').set(time.perf_counter() - _import_started)
+    MODEL_INFO.clear()
+    MODEL_INFO.labels(model_version=classifier.model_version).set(1)
+
+
+def _load_shadow():
+    """Load the shadow model and start scoring traffic with it once the primary vectorizer is known"""
+    global shadow
+    candidate = ShadowEvaluator.from_path(
+        SHADOW_MODEL_PATH,
+        model_version=SHADOW_MODEL_VERSION,
+        max_workers=SHADOW_WORKERS,
+        max_pending=SHADOW_MAX_PENDING,
+        on_result=_record_shadow
+    )
+    try:
+        if not classifier.wait_until_ready():
+            raise ModelNotReadyError("Primary model failed to load")
+        candidate.check_features(classifier.vectorizer)
+    except Exception:
+        candidate.shutdown(wait=False)
+        raise
+    shadow = candidate
+    classifier.add_score_listener(shadow.submit)
+
+
+def _check_shadow(previous_version, model_version, error):
+    """Disable shadow scoring if a reloaded primary vectorizer no longer fits the shadow model"""
+    global shadow
+    candidate = shadow
+    if error is not None or candidate is None:
+        return
+    try:
+        candidate.check_features(classifier.vectorizer)
+    except ValueError as e:
+        logger.warning(f"Shadow scoring disabled after reload to {model_version}: {str(e)}")
+        classifier.remove_score_listener(candidate.submit)
+        candidate.shutdown(wait=False)
+        shadow = None
+        if 'shadow' in components:
+            components['shadow'].update(loaded=False, error=str(e))
+
+
+classifier.add_reload_listener(_record_reload)
+classifier.add_reload_listener(_check_shadow)
+classifier.add_stage_listener(_record_stage)
+
+
+def _record_micro_batch(batch_size, queue_depth):
+    """Observe the size of a dispatched micro-batch and the queue behind it"""
+    MICRO_BATCH_SIZE.observe(batch_size)
+    MICRO_BATCH_QUEUE_DEPTH.observe(queue_depth)
+
 
-# Initialize classifier
-classifier = SpamClassifier()
+STARTUP_SECONDS.labels(phase='import').set(time.perf_counter() - _import_started)
+classifier.load_in_background(on_complete=_record_startup)
+# Watch even if the first load fails, so artifacts that appear later are picked up
+if MODEL_WATCH_INTERVAL > 0:
+    classifier.start_watching(MODEL_WATCH_INTERVAL)
+if MODEL_REGISTRY_CONFIG:
+    _start_loading('registry', _load_registry, required=True)
+if SHADOW_MODEL_PATH:
+    _start_loading('shadow', _load_shadow, required=False)
+
+
+def _registry_routes_traffic():
+    """Whether requests that name no model are routed by registry weights"""
+    return registry is not None and registry.routes_by_weight
+
+
+def _record_shed(lane, reason):
+    """Count a request rejected by admission control"""
+    REQUESTS_SHED.labels(lane=lane, reason=reason).inc()
+
+
+# Bound concurrent prediction work, shedding excess load with 429s
+admission = None
+if ADMISSION_MAX_CONCURRENCY > 0:
+    admission = AdmissionController(
+        max_limit=ADMISSION_MAX_CONCURRENCY,
+        min_limit=ADMISSION_MIN_CONCURRENCY,
+        latency_target_ms=ADMISSION_LATENCY_TARGET_MS,
+        queue_size=ADMISSION_QUEUE_SIZE,
+        queue_timeout_ms=ADMISSION_QUEUE_TIMEOUT_MS,
+        on_shed=_record_shed
+    )
+
+
+def _admission_stat(read):
+    """Read an admission statistic, 0 when admission control is disabled"""
+    return read(admission.stats()) if admission is not None else 0
+
+
+ADMISSION_LIMIT.set_function(lambda: _admission_stat(lambda stats: stats['limit']))
+ADMISSION_IN_FLIGHT.set_function(lambda: _admission_stat(lambda stats: stats['in_flight']))
+for _lane in ('interactive', 'batch'):
+    ADMISSION_QUEUED.labels(lane=_lane).set_function(
+        lambda lane=_lane: _admission_stat(lambda stats: stats['queued'][lane])
+    )
+
+
+@app.before_request
+def _admit():
+    """Hold prediction requests until admission control grants them a slot"""
+    lane = ADMISSION_LANES.get(request.path)
+    if admission is None or lane is None:
+        return None
+    try:
+        waited = admission.acquire(lane, timeout_ms=request.headers.get('X-Request-Timeout-Ms', type=float))
+    except RequestShedError as e:
+        REQUEST_COUNT.labels(method=request.method, endpoint=request.path, status=429).inc()
+        response = jsonify({'error': 'Server is overloaded, retry later', 'reason': e.reason})
+        response.headers['Retry-After'] = str(e.retry_after)
+        return response, 429
+    ADMISSION_QUEUE_WAIT.observe(waited)
+    g.admitted_at = time.perf_counter()
+    return None
+
+
+@app.teardown_request
+def _release_admission(exc):
+    """Free the request's admission slot, feeding its latency to the adaptive limit"""
+    admitted_at = g.pop('admitted_at', None)
+    if admitted_at is not None:
+        admission.release(time.perf_counter() - admitted_at)
+
+
+# Coalesce concurrent /predict requests when run with a threaded server
+batcher = None
+if MICRO_BATCH_MAX_SIZE > 1:
+    batcher = MicroBatcher(
+        classifier.predict_batch_with_version,
+        max_batch_size=MICRO_BATCH_MAX_SIZE,
+        max_wait_ms=MICRO_BATCH_MAX_WAIT_MS,
+        on_batch=_record_micro_batch
+    )
+
+# Registry models are micro-batched separately, one batcher per model name,
+# so every coalesced batch is scored by a single model
+registry_batchers = {}
+_registry_batchers_lock = threading.Lock()
+
+
+def _registry_batcher(name):
+    """Micro-batcher coalescing /predict requests routed to one registry model"""
+    with _registry_batchers_lock:
+        model_batcher = registry_batchers.get(name)
+        if model_batcher is None:
+            model_batcher = MicroBatcher(
+                lambda texts: classifier.predict_batch_with_version(texts, loaded=registry.get(name)),
+                max_batch_size=batcher.max_batch_size,
+                max_wait_ms=batcher.max_wait_seconds * 1000,
+                on_batch=_record_micro_batch
+            )
+            registry_batchers[name] = model_batcher
+        return model_batcher
 
 @app.route('/health', methods=['GET'])
 def health():
     """Health check endpoint for Kubernetes liveness probe"""
     start_time = time.time()
-    status = get_health_status()
+    status = get_health_status(classifier, components)
     REQUEST_LATENCY.labels(endpoint='/health').observe(time.time() - start_time)
     REQUEST_COUNT.labels(method='GET', endpoint='/health', status=200).inc()
     return jsonify(status), 200 if status['status'] == 'healthy' else 503
@@ -30,7 +406,7 @@ def health():
 def ready():
     """Readiness check endpoint for Kubernetes readiness probe"""
     start_time = time.time()
-    status = get_readiness_status()
+    status = get_readiness_status(classifier, components)
     REQUEST_LATENCY.labels(endpoint='/ready').observe(time.time() - start_time)
     REQUEST_COUNT.labels(method='GET', endpoint='/ready', status=200).inc()
     return jsonify(status), 200 if status['ready'] else 503
@@ -47,25 +423,182 @@ def predict():
             return jsonify({'error': 'Missing text field'}), 400
         
         text = data['text']
-        prediction, confidence, request_id = classifier.predict(text)
+        model_name = data.get('model')
+        if model_name is not None and registry is None and _registry_loading():
+            raise ModelNotReadyError("Model registry is still loading")
+        loaded = None
+        if model_name is not None or _registry_routes_traffic():
+            # Requested or weight-routed model from the registry, scored
+            # through the same cache, near-duplicate and logging path
+            if model_name is not None and (registry is None or model_name not in registry):
+                REQUEST_COUNT.labels(method='POST', endpoint='/predict', status=404).inc()
+                return jsonify({'error': f'Unknown model: {model_name}'}), 404
+            model_name, loaded = registry.route(model_name, routing_key=request.headers.get('X-Routing-Key'))
+
+        profiler = None
+        if PROFILING_ENABLED and request.headers.get('X-Profile'):
+            # Profile on the request thread, bypassing the micro-batcher
+            with SamplingProfiler(interval=PROFILER_INTERVAL_MS / 1000) as profiler:
+                prediction, confidence, request_id, model_version = classifier.predict_with_version(text, loaded)
+        elif batcher is not None:
+            model_batcher = batcher if loaded is None else _registry_batcher(model_name)
+            prediction, confidence, request_id, model_version = model_batcher.predict(text)
+        else:
+            prediction, confidence, request_id, model_version = classifier.predict_with_version(text, loaded)
         
         # Update Prometheus metrics
-        PREDICTION_COUNT.labels(prediction=prediction).inc()
+        PREDICTION_COUNT.labels(prediction=prediction, model_version=model_version).inc()
         REQUEST_LATENCY.labels(endpoint='/predict').observe(time.time() - start_time)
         REQUEST_COUNT.labels(method='POST', endpoint='/predict', status=200).inc()
         
-        return jsonify({
+        response = {
             'prediction': prediction,
             'confidence': confidence,
             'request_id': request_id,
-            'model_version': classifier.model_version
-        }), 200
-        
+            'model_version': model_version
+        }
+        if loaded is not None:
+            response['model'] = model_name
+        if profiler is not None:
+            response['profile'] = profiler.folded()
+        return jsonify(response), 200
+
+    except ModelNotReadyError as e:
+        REQUEST_COUNT.labels(method='POST', endpoint='/predict', status=503).inc()
+        return jsonify({'error': str(e)}), 503
     except Exception as e:
         logger.error(f"Prediction API error: {str(e)}", exc_info=True)
         REQUEST_COUNT.labels(method='POST', endpoint='/predict', status=500).inc()
         return jsonify({'error': str(e)}), 500
 
+@app.route('/predict/batch', methods=['POST'])
+def predict_batch():
+    """Batch prediction endpoint"""
+    start_time = time.time()
+
+    try:
+        data = request.get_json(silent=True)
+        texts = data.get('texts') if isinstance(data, dict) else None
+        if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+            REQUEST_COUNT.labels(method='POST', endpoint='/predict/batch', status=400).inc()
+            return jsonify({'error': 'Missing texts field or texts is not a list of strings'}), 400
+        if len(texts) > MAX_BATCH_SIZE:
+            REQUEST_COUNT.labels(method='POST', endpoint='/predict/batch', status=413).inc()
+            return jsonify({'error': f'Batch size exceeds limit of {MAX_BATCH_SIZE}'}), 413
+
+        model_name = data.get('model')
+        if model_name is not None and registry is None and _registry_loading():
+            raise ModelNotReadyError("Model registry is still loading")
+        if model_name is not None and (registry is None or model_name not in registry):
+            REQUEST_COUNT.labels(method='POST', endpoint='/predict/batch', status=404).inc()
+            return jsonify({'error': f'Unknown model: {model_name}'}), 404
+        loaded = None
+        if model_name is not None or _registry_routes_traffic():
+            model_name, loaded = registry.route(model_name, routing_key=request.headers.get('X-Routing-Key'))
+        results, model_version = classifier.predict_batch_with_version(texts, loaded)
+
+        # Update Prometheus metrics
+        for prediction, _, _ in results:
+            PREDICTION_COUNT.labels(prediction=prediction, model_version=model_version).inc()
+        latency = time.time() - start_time
+        BATCH_SIZE.observe(len(texts))
+        BATCH_LATENCY.observe(latency)
+        REQUEST_LATENCY.labels(endpoint='/predict/batch').observe(latency)
+        REQUEST_COUNT.labels(method='POST', endpoint='/predict/batch', status=200).inc()
+
+        return jsonify({
+            'predictions': [
+                {
+                    'prediction': prediction,
+                    'confidence': confidence,
+                    'request_id': request_id
+                }
+                for prediction, confidence, request_id in results
+            ],
+            'batch_size': len(results),
+            'latency_ms': latency * 1000,
+            'model': model_name,
+            'model_version': model_version
+        }), 200
+
+    except ModelNotReadyError as e:
+        REQUEST_COUNT.labels(method='POST', endpoint='/predict/batch', status=503).inc()
+        return jsonify({'error': str(e)}), 503
+    except Exception as e:
+        logger.error(f"Batch prediction API error: {str(e)}", exc_info=True)
+        REQUEST_COUNT.labels(method='POST', endpoint='/predict/batch', status=500).inc()
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/predict/compare', methods=['POST'])
+def predict_compare():
+    """Score one text with several registry models, preprocessing and vectorizing it once"""
+    start_time = time.time()
+
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not isinstance(data.get('text'), str):
+        REQUEST_COUNT.labels(method='POST', endpoint='/predict/compare', status=400).inc()
+        return jsonify({'error': 'Missing text field'}), 400
+    models = data.get('models')
+    if models is not None and (not isinstance(models, list) or not models
+                               or not all(isinstance(name, str) for name in models)):
+        REQUEST_COUNT.labels(method='POST', endpoint='/predict/compare', status=400).inc()
+        return jsonify({'error': 'models must be a non-empty list of model names'}), 400
+    if registry is None and _registry_loading():
+        REQUEST_COUNT.labels(method='POST', endpoint='/predict/compare', status=503).inc()
+        return jsonify({'error': 'Model registry is still loading'}), 503
+    if registry is None:
+        REQUEST_COUNT.labels(method='POST', endpoint='/predict/compare', status=404).inc()
+        return jsonify({'error': 'No model registry configured'}), 404
+
+    try:
+        request_id, results = registry.compare(data['text'], models)
+    except KeyError as e:
+        REQUEST_COUNT.labels(method='POST', endpoint='/predict/compare', status=404).inc()
+        return jsonify({'error': f'Unknown model: {e.args[0]}'}), 404
+    except Exception as e:
+        logger.error(f"Compare API error: {str(e)}", exc_info=True)
+        REQUEST_COUNT.labels(method='POST', endpoint='/predict/compare', status=500).inc()
+        return jsonify({'error': str(e)}), 500
+
+    for prediction, _, model_version in results.values():
+        PREDICTION_COUNT.labels(prediction=prediction, model_version=model_version).inc()
+    REQUEST_LATENCY.labels(endpoint='/predict/compare').observe(time.time() - start_time)
+    REQUEST_COUNT.labels(method='POST', endpoint='/predict/compare', status=200).inc()
+    return jsonify({
+        'request_id': request_id,
+        'predictions': {
+            name: {'prediction': prediction, 'confidence': confidence, 'model_version': model_version}
+            for name, (prediction, confidence, model_version) in results.items()
+        }
+    }), 200
+
+@app.route('/admin/reload', methods=['POST'])
+def admin_reload():
+    """Reload the model and vectorizer from disk without restarting"""
+    if not ADMIN_TOKEN:
+        REQUEST_COUNT.labels(method='POST', endpoint='/admin/reload', status=403).inc()
+        return jsonify({'error': 'Admin endpoint is disabled, set ADMIN_TOKEN to enable it'}), 403
+    if request.headers.get('X-Admin-Token') != ADMIN_TOKEN:
+        REQUEST_COUNT.labels(method='POST', endpoint='/admin/reload', status=403).inc()
+        return jsonify({'error': 'Invalid admin token'}), 403
+
+    data = request.get_json(silent=True)
+    model_version = data.get('model_version') if isinstance(data, dict) else None
+    previous_version = classifier.model_version
+
+    try:
+        model_version = classifier.reload(model_version=model_version)
+    except Exception as e:
+        logger.error(f"Model reload failed: {str(e)}", exc_info=True)
+        REQUEST_COUNT.labels(method='POST', endpoint='/admin/reload', status=500).inc()
+        return jsonify({'error': str(e), 'model_version': previous_version}), 500
+
+    REQUEST_COUNT.labels(method='POST', endpoint='/admin/reload', status=200).inc()
+    return jsonify({
+        'previous_version': previous_version,
+        'model_version': model_version
+    }), 200
+
 @app.route('/metrics', methods=['GET'])
 def metrics():
     """Prometheus metrics endpoint"""
@@ -77,6 +610,37 @@ def info():
     REQUEST_COUNT.labels(method='GET', endpoint='/info', status=200).inc()
     return jsonify(classifier.get_model_info()), 200
 
+@app.route('/shadow', methods=['GET'])
+def shadow_stats():
+    """Get agreement and latency statistics of the shadow model"""
+    if shadow is None:
+        REQUEST_COUNT.labels(method='GET', endpoint='/shadow', status=404).inc()
+        response = {'error': 'Shadow scoring is not enabled'}
+        if components.get('shadow', {}).get('error'):
+            response['reason'] = components['shadow']['error']
+        return jsonify(response), 404
+    REQUEST_COUNT.labels(method='GET', endpoint='/shadow', status=200).inc()
+    return jsonify(shadow.stats()), 200
+
+@app.route('/clusters', methods=['GET'])
+def clusters():
+    """Get near-duplicate index statistics and the most matched spam clusters"""
+    if classifier.near_duplicates is None:
+        REQUEST_COUNT.labels(method='GET', endpoint='/clusters', status=404).inc()
+        return jsonify({'error': 'Near-duplicate index is not enabled'}), 404
+    limit = request.args.get('limit', 20, type=int)
+    REQUEST_COUNT.labels(method='GET', endpoint='/clusters', status=200).inc()
+    return jsonify({
+        **classifier.near_duplicates.stats(),
+        'clusters': classifier.near_duplicates.top_clusters(limit)
+    }), 200
+
+@app.route('/models', methods=['GET'])
+def models():
+    """List the models in the registry and their traffic weights"""
+    REQUEST_COUNT.labels(method='GET', endpoint='/models', status=200).inc()
+    return jsonify({'models': registry.get_models_info() if registry is not None else []}), 200
+
 if __name__ == '__main__':
     port = int(os.getenv('PORT', 5000))
     app.run(host='0.0.0.0', port=port, debug=False)
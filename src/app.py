@@ -47,7 +47,7 @@ try:
         st.metric("Model Type", model_info.get("model_type", "Unknown"))
         
         # Health status
-        health = get_health_status()
+        health = get_health_status(classifier)
         status_color = "🟢" if health["status"] == "healthy" else "🔴"
         st.metric("Health Status", f"{status_color} {health['status'].upper()}")
         
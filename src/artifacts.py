@@ -0,0 +1,259 @@
+import os
+import pickle
+from hashlib import blake2b
+from typing import Any, Dict, Iterable, List, Tuple
+import joblib
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction.text import TfidfVectorizer
+from src.utils.logger import setup_logger
+
+logger = setup_logger("spam_classifier.artifacts")
+
+# TfidfVectorizer parameters that decide how a document is split into terms
+ANALYZER_PARAMS = (
+    'input', 'encoding', 'decode_error', 'strip_accents', 'lowercase',
+    'preprocessor', 'tokenizer', 'analyzer', 'stop_words', 'token_pattern', 'ngram_range'
+)
+
+
+def term_hashes(terms: Iterable[str]) -> np.ndarray:
+    """
+    Stable 64-bit keys for vocabulary terms
+
+    Args:
+        terms: Terms to hash
+
+    Returns:
+        Array of uint64 hashes, one per term
+    """
+    return np.frombuffer(
+        b''.join(blake2b(term.encode('utf-8'), digest_size=8).digest() for term in terms), dtype='<u8'
+    )
+
+
+class CompactTfidfVectorizer:
+    """
+    Fitted TF-IDF vectorizer whose state is held entirely in numpy arrays
+
+    The vocabulary dict of a TfidfVectorizer is replaced by a sorted array
+    of 64-bit term hashes searched with np.searchsorted, so the whole
+    vectorizer can be memory-mapped from a joblib file and shared by every
+    worker on a host, and the terms themselves are never stored. Pruned
+    terms (stop_words_) are dropped. transform produces the same matrix as
+    the original; an unseen term would need to collide with one of the
+    vocabulary's hashes to be counted, which at 64 bits does not happen in
+    practice.
+
+    Hashing is done once per distinct term rather than per occurrence: the
+    column of every term seen is kept in an in-process cache of at most
+    column_cache_size terms, which is rebuilt from scratch when it fills.
+    """
+
+    column_cache_size = 50000
+
+    def __init__(self, vectorizer: TfidfVectorizer):
+        """
+        Build a compact copy of a fitted TfidfVectorizer
+
+        Args:
+            vectorizer: Fitted TfidfVectorizer
+
+        Raises:
+            ValueError: If two vocabulary terms hash to the same key
+        """
+        params = vectorizer.get_params()
+        self.analyzer_params = {name: params[name] for name in ANALYZER_PARAMS}
+        self.binary = vectorizer.binary
+        self.norm = vectorizer.norm
+        self.sublinear_tf = vectorizer.sublinear_tf
+        self.dtype = vectorizer.dtype
+        self._set_vocabulary(vectorizer.vocabulary_)
+        self.idf_ = np.asarray(vectorizer.idf_) if vectorizer.use_idf else None
+        self._analyzer = None
+        self._column_cache: Dict[str, int] = {}
+
+    def _set_vocabulary(self, vocabulary: Dict[str, int]) -> None:
+        """Store a term to column mapping as sorted hashes and their columns"""
+        hashes = term_hashes(vocabulary)
+        order = np.argsort(hashes)
+        self.term_hashes = hashes[order]
+        self.columns = np.fromiter(vocabulary.values(), dtype=np.int32, count=len(vocabulary))[order]
+        if np.any(self.term_hashes[1:] == self.term_hashes[:-1]):
+            raise ValueError("Vocabulary terms collide under the 64-bit term hash")
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_analyzer'] = None
+        state['_column_cache'] = {}
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._column_cache = {}
+        # Artifacts exported before vocabularies were hashed hold the sorted terms
+        if 'terms' in state:
+            terms = self.__dict__.pop('terms')
+            self._set_vocabulary({term.decode('utf-8'): int(column) for term, column in zip(terms, self.columns)})
+
+    @property
+    def analyzer(self):
+        """Document analyzer equivalent to the original vectorizer's"""
+        if self._analyzer is None:
+            self._analyzer = TfidfVectorizer(**self.analyzer_params).build_analyzer()
+        return self._analyzer
+
+    def _term_columns(self, terms: List[str]) -> np.ndarray:
+        """Column of every term, -1 for terms outside the vocabulary"""
+        cache = self._column_cache
+        missing = [term for term in dict.fromkeys(terms) if term not in cache]
+        if len(cache) + len(missing) > self.column_cache_size:
+            # Start a new cache rather than clearing one other threads may be reading
+            cache = {}
+            missing = list(dict.fromkeys(terms))
+        if missing:
+            query = term_hashes(missing)
+            n_columns = len(self.term_hashes)
+            columns = np.full(len(missing), -1, dtype=np.int64)
+            if n_columns:
+                positions = np.searchsorted(self.term_hashes, query)
+                positions[positions == n_columns] = 0
+                found = self.term_hashes[positions] == query
+                columns[found] = self.columns[positions[found]]
+            cache.update(zip(missing, columns.tolist()))
+            self._column_cache = cache
+        return np.fromiter(map(cache.__getitem__, terms), dtype=np.int64, count=len(terms))
+
+    def transform(self, raw_documents: Iterable[str]) -> csr_matrix:
+        """
+        Transform documents to a TF-IDF weighted document-term matrix
+
+        Args:
+            raw_documents: Iterable of documents
+
+        Returns:
+            Sparse matrix of shape (n_documents, n_terms)
+        """
+        analyze = self.analyzer
+        terms = []
+        indptr = [0]
+        for document in raw_documents:
+            terms.extend(analyze(document))
+            indptr.append(len(terms))
+
+        n_documents = len(indptr) - 1
+        n_columns = len(self.term_hashes)
+        columns = self._term_columns(terms)
+        found = columns >= 0
+
+        # Count each (document, column) pair; sorted keys give CSR order
+        rows = np.repeat(np.arange(n_documents, dtype=np.int64), np.diff(indptr))[found]
+        keys, counts = np.unique(rows * n_columns + columns[found], return_counts=True)
+        row_of_key = keys // n_columns
+        indices = (keys - row_of_key * n_columns).astype(np.int32)
+        data = counts.astype(self.dtype)
+        indptr = np.searchsorted(row_of_key, np.arange(n_documents + 1))
+
+        if self.binary:
+            data.fill(1)
+        if self.sublinear_tf:
+            np.log(data, data)
+            data += 1
+        if self.idf_ is not None:
+            data *= self.idf_[indices]
+        if self.norm is not None:
+            row_lengths = np.diff(indptr)
+            values = data * data if self.norm == 'l2' else np.abs(data)
+            norms = np.bincount(row_of_key, weights=values, minlength=n_documents).astype(np.float64)
+            if self.norm == 'l2':
+                np.sqrt(norms, norms)
+            norms[norms == 0] = 1
+            data /= np.repeat(norms, row_lengths)
+
+        return csr_matrix((data, indices, indptr), shape=(n_documents, n_columns))
+
+
+def compact_vectorizer(vectorizer: Any) -> Any:
+    """Convert a fitted TfidfVectorizer to its compact form, leaving other vectorizers as is"""
+    if isinstance(vectorizer, TfidfVectorizer):
+        return CompactTfidfVectorizer(vectorizer)
+    return vectorizer
+
+
+def export_artifacts(model: Any, vectorizer: Any, output_dir: str = "models") -> Tuple[str, str]:
+    """
+    Write model and vectorizer in the memory-mappable joblib format
+
+    Args:
+        model: Trained model
+        vectorizer: Fitted vectorizer
+        output_dir: Directory receiving model.joblib and vectorizer.joblib
+
+    Returns:
+        Tuple of (model_path, vectorizer_path)
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    model_path = os.path.join(output_dir, "model.joblib")
+    vectorizer_path = os.path.join(output_dir, "vectorizer.joblib")
+
+    # Uncompressed dumps keep numpy arrays page-aligned for mmap loading
+    joblib.dump(model, model_path)
+    joblib.dump(compact_vectorizer(vectorizer), vectorizer_path)
+    return model_path, vectorizer_path
+
+
+def resolve_artifact_path(path: str) -> str:
+    """
+    Path of the file load_artifact actually reads for an artifact
+
+    Args:
+        path: Path to a .joblib or pickle artifact
+
+    Returns:
+        The path itself, or the sibling .pkl file of a missing .joblib artifact
+    """
+    if path.endswith(".joblib") and not os.path.exists(path):
+        return path[:-len(".joblib")] + ".pkl"
+    return path
+
+
+def load_artifact(path: str) -> Any:
+    """
+    Load a model or vectorizer artifact
+
+    .joblib artifacts are loaded with their numpy arrays memory-mapped
+    read-only, so processes on one host share the same pages. A missing
+    .joblib artifact falls back to the .pkl file next to it, and any other
+    path is unpickled.
+
+    Args:
+        path: Path to a .joblib or pickle artifact
+
+    Returns:
+        Loaded artifact
+    """
+    resolved = resolve_artifact_path(path)
+    if resolved != path:
+        logger.warning(f"Artifact {path} not found, falling back to {resolved}")
+    elif path.endswith(".joblib"):
+        return joblib.load(path, mmap_mode='r')
+
+    with open(resolved, 'rb') as f:
+        return pickle.load(f)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert pickled artifacts to the memory-mappable format")
+    parser.add_argument("--model", default="models/model.pkl", help="Pickled model")
+    parser.add_argument("--vectorizer", default="models/vectorizer.pkl", help="Pickled vectorizer")
+    parser.add_argument("--output-dir", default="models", help="Output directory")
+
+    args = parser.parse_args()
+
+    # Import through the package so pickled classes resolve to src.artifacts
+    from src.artifacts import export_artifacts, load_artifact
+
+    paths = export_artifacts(load_artifact(args.model), load_artifact(args.vectorizer), args.output_dir)
+    logger.info(f"Exported artifacts to {paths[0]} and {paths[1]}")
@@ -0,0 +1,145 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple
+from src.utils.logger import setup_logger
+
+logger = setup_logger("spam_classifier.batching")
+
+# Scores a list of texts, returning one result per text plus the model version
+BatchScorer = Callable[[List[str]], Tuple[List[Tuple[Any, ...]], str]]
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent single-text predictions into micro-batches
+
+    Request threads submit texts to a shared queue and wait on a future.
+    One background thread drains the queue into batches of at most
+    max_batch_size texts, waiting at most max_wait_ms after the first text
+    for more to arrive, scores each batch with one call and fans the
+    results back out to the waiting requests.
+    """
+
+    def __init__(self, score_batch: BatchScorer, max_batch_size: int = 32,
+                 max_wait_ms: float = 5.0,
+                 on_batch: Optional[Callable[[int, int], None]] = None):
+        """
+        Initialize micro-batcher
+
+        Args:
+            score_batch: Function scoring a list of texts, such as
+                SpamClassifier.predict_batch_with_version
+            max_batch_size: Maximum texts scored in one call
+            max_wait_ms: Maximum milliseconds to hold the first text of a
+                batch while waiting for more
+            on_batch: Optional callback receiving (batch_size, queue_depth)
+                for every batch dispatched
+        """
+        self.score_batch = score_batch
+        self.max_batch_size = max(max_batch_size, 1)
+        self.max_wait_seconds = max_wait_ms / 1000
+        self.on_batch = on_batch
+        self._queue: "queue.Queue[Optional[Tuple[str, Future]]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Start the batching thread if it is not running"""
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+                self._worker.start()
+
+    def stop(self) -> None:
+        """Stop the batching thread once queued texts have been scored"""
+        with self._lock:
+            worker, self._worker = self._worker, None
+        if worker is not None:
+            self._queue.put(None)
+            worker.join()
+
+    def queue_depth(self) -> int:
+        """Number of texts waiting to be batched"""
+        return self._queue.qsize()
+
+    def submit(self, text: str) -> Future:
+        """
+        Queue a text for scoring
+
+        The batching thread is started on first use, so a batcher created
+        before a server forks its workers runs in each worker.
+
+        Args:
+            text: Input text to classify
+
+        Returns:
+            Future resolving to the text's result tuple with the model
+            version appended
+        """
+        self.start()
+        future: Future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def predict(self, text: str, timeout: Optional[float] = None) -> Tuple[Any, ...]:
+        """
+        Score a text as part of a micro-batch and wait for the result
+
+        Args:
+            text: Input text to classify
+            timeout: Seconds to wait for the result (None waits forever)
+
+        Returns:
+            The text's result tuple with the model version appended
+        """
+        return self.submit(text).result(timeout)
+
+    def _collect(self, first: Tuple[str, Future]) -> Tuple[List[Tuple[str, Future]], bool]:
+        """Gather a batch starting with first, returning it and whether to stop"""
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait_seconds
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        """Batching thread loop"""
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch, stopping = self._collect(item)
+
+            if self.on_batch is not None:
+                self.on_batch(len(batch), self._queue.qsize())
+
+            try:
+                self._dispatch(batch)
+            except Exception as e:
+                if len(batch) == 1:
+                    batch[0][1].set_exception(e)
+                    continue
+
+                # Score texts one at a time so a bad input only fails its own request
+                logger.warning(f"Micro-batch scoring failed, retrying individually: {str(e)}")
+                for item in batch:
+                    try:
+                        self._dispatch([item])
+                    except Exception as item_error:
+                        item[1].set_exception(item_error)
+
+    def _dispatch(self, batch: List[Tuple[str, Future]]) -> None:
+        """Score a batch with one call and resolve its futures"""
+        results, model_version = self.score_batch([text for text, _ in batch])
+        for (_, future), result in zip(batch, results):
+            future.set_result(tuple(result) + (model_version,))
@@ -0,0 +1,304 @@
+import csv
+import io
+import itertools
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import pandas as pd
+from src.predict import SpamClassifier
+from src.utils.files import detect_format
+from src.utils.logger import setup_logger
+
+logger = setup_logger("spam_classifier.bulk_score")
+
+OUTPUT_FIELDS = ('id', 'prediction', 'confidence', 'model_version')
+
+# Classifier owned by each worker process
+_classifier: Optional[SpamClassifier] = None
+
+
+def read_chunks(path: str, input_format: str, text_field: str = 'text', id_field: Optional[str] = None,
+                chunk_size: int = 1000, encoding: str = 'utf-8') -> Iterator[Tuple[List[Any], List[str]]]:
+    """
+    Stream (ids, texts) chunks from a CSV or JSONL file, or stdin
+
+    Only one chunk is held in memory at a time. Rows without an id field
+    are identified by their 0-based position in the input.
+
+    Args:
+        path: Input path, or '-' for stdin
+        input_format: 'csv' or 'jsonl'
+        text_field: Column or key holding the message text
+        id_field: Column or key holding a message id, if any
+        chunk_size: Rows per chunk
+        encoding: Input text encoding
+
+    Yields:
+        Tuple of (ids, texts) for each chunk
+    """
+    source = io.TextIOWrapper(sys.stdin.buffer, encoding=encoding) if path == '-' else path
+    row = 0
+
+    if input_format == 'csv':
+        columns = [text_field] + ([id_field] if id_field else [])
+        reader = pd.read_csv(source, encoding=encoding, usecols=columns, dtype=str,
+                             keep_default_na=False, chunksize=chunk_size)
+        for chunk in reader:
+            ids = chunk[id_field].tolist() if id_field else list(range(row, row + len(chunk)))
+            row += len(chunk)
+            yield ids, chunk[text_field].tolist()
+        return
+
+    handle = source if path == '-' else open(source, encoding=encoding)
+    try:
+        records = (json.loads(line) for line in handle if line.strip())
+        while True:
+            chunk = list(itertools.islice(records, chunk_size))
+            if not chunk:
+                return
+            ids = [record.get(id_field, row + index) if id_field else row + index
+                   for index, record in enumerate(chunk)]
+            row += len(chunk)
+            yield ids, [str(record.get(text_field, '')) for record in chunk]
+    finally:
+        if handle is not source:
+            handle.close()
+
+
+def load_checkpoint(path: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Read a bulk scoring checkpoint
+
+    Args:
+        path: Checkpoint path, None when checkpointing is off
+
+    Returns:
+        Checkpoint state, or None if there is none
+    """
+    if not path or not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_checkpoint(path: str, state: Dict[str, Any]) -> None:
+    """
+    Write a checkpoint atomically, so an interruption never leaves a torn file
+
+    Args:
+        path: Checkpoint path
+        state: Checkpoint state
+    """
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w') as f:
+        json.dump(state, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+def _init_worker(model_path: str, vectorizer_path: str) -> None:
+    """Load the classifier once in each worker process"""
+    global _classifier
+    _classifier = SpamClassifier(model_path=model_path, vectorizer_path=vectorizer_path, cache_size=0)
+
+
+def _score_chunk(texts: List[str]) -> Tuple[List[str], List[float], str]:
+    """Score one chunk with the worker's classifier"""
+    return _classifier.score_texts(texts)
+
+
+class _SerialExecutor:
+    """Stand-in for a process pool that scores chunks in the calling process"""
+
+    class _Done:
+        def __init__(self, value):
+            self._value = value
+
+        def result(self):
+            return self._value
+
+    def submit(self, func, *args):
+        return self._Done(func(*args))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return None
+
+
+def bulk_score(input_path: str, output_path: str, input_format: Optional[str] = None,
+               output_format: Optional[str] = None, text_field: str = 'text', id_field: Optional[str] = None,
+               chunk_size: int = 1000, workers: Optional[int] = 1, checkpoint_path: Optional[str] = None,
+               model_path: str = "models/model.pkl", vectorizer_path: str = "models/vectorizer.pkl",
+               encoding: str = 'utf-8', report_interval: float = 10.0) -> Dict[str, Any]:
+    """
+    Score a large input file in streamed chunks and write results as they complete
+
+    Chunks are scored with one vectorized call each, on a process pool
+    when more than one worker is used. At most two chunks per worker are
+    in flight and results are written in input order as soon as they are
+    ready, so memory stays bounded by the chunk size whatever the input
+    size. After every written chunk the checkpoint records how many chunks
+    are done and how long the output is; a rerun with the same checkpoint
+    truncates any partly written output and skips the finished chunks. If
+    the output is missing or shorter than the checkpoint records, the rerun
+    starts again from the first row.
+
+    Args:
+        input_path: CSV or JSONL input, or '-' for stdin
+        output_path: CSV or JSONL output file
+        input_format: 'csv' or 'jsonl' (inferred from the extension)
+        output_format: 'csv' or 'jsonl' (inferred from the extension)
+        text_field: Column or key holding the message text
+        id_field: Column or key copied to the output id (defaults to row number)
+        chunk_size: Rows scored per call
+        workers: Worker processes (1 scores in this process, 0 or None uses every CPU)
+        checkpoint_path: Checkpoint file for resuming, None to disable
+        model_path: Path to trained model file
+        vectorizer_path: Path to vectorizer file
+        encoding: Input text encoding
+        report_interval: Seconds between throughput log lines
+
+    Returns:
+        Dictionary with rows, resumed_rows, seconds, rows_per_second and
+        model_version
+    """
+    input_format = input_format or detect_format(input_path)
+    output_format = output_format or detect_format(output_path)
+    if not workers:
+        workers = os.cpu_count() or 1
+
+    checkpoint = load_checkpoint(checkpoint_path)
+    if checkpoint is not None:
+        if (checkpoint['input'], checkpoint['output'], checkpoint['chunk_size']) != (input_path, output_path, chunk_size):
+            raise ValueError(f"Checkpoint {checkpoint_path} belongs to a different input, output or chunk size")
+        if checkpoint.get('complete'):
+            logger.info(f"Checkpoint {checkpoint_path} is already complete, nothing to score")
+            return {"rows": 0, "resumed_rows": checkpoint['rows_done'], "seconds": 0.0,
+                    "rows_per_second": 0.0, "model_version": checkpoint.get('model_version')}
+        output_bytes = os.path.getsize(output_path) if os.path.exists(output_path) else -1
+        if output_bytes < checkpoint['output_bytes']:
+            # The rows the checkpoint counts as done are not in the output
+            logger.warning(f"Output {output_path} is missing or shorter than checkpoint {checkpoint_path} "
+                           f"records, scoring again from row 0")
+            checkpoint = None
+        else:
+            logger.info(f"Resuming after {checkpoint['rows_done']} rows ({checkpoint['chunks_done']} chunks)")
+    state = checkpoint or {"input": input_path, "output": output_path, "chunk_size": chunk_size,
+                           "chunks_done": 0, "rows_done": 0, "output_bytes": 0}
+    resumed_rows = state['rows_done']
+
+    # On resume, drop anything written after the last checkpoint
+    output = open(output_path, 'r+' if checkpoint else 'w', newline='', encoding='utf-8')
+    output.seek(state['output_bytes'])
+    output.truncate()
+    csv_writer = csv.writer(output) if output_format == 'csv' else None
+    if csv_writer is not None and state['output_bytes'] == 0:
+        csv_writer.writerow(OUTPUT_FIELDS)
+
+    chunks = itertools.islice(
+        read_chunks(input_path, input_format, text_field, id_field, chunk_size, encoding),
+        state['chunks_done'], None
+    )
+    if workers == 1:
+        _init_worker(model_path, vectorizer_path)
+        executor = _SerialExecutor()
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                       initargs=(model_path, vectorizer_path))
+
+    rows = 0
+    model_version = None
+    start_time = last_report = time.perf_counter()
+    pending: deque = deque()
+
+    def write_oldest():
+        nonlocal rows, model_version, last_report
+        ids, future = pending.popleft()
+        labels, confidences, model_version = future.result()
+        for row_id, label, confidence in zip(ids, labels, confidences):
+            if csv_writer is not None:
+                csv_writer.writerow((row_id, label, confidence, model_version))
+            else:
+                output.write(json.dumps({'id': row_id, 'prediction': label, 'confidence': confidence,
+                                         'model_version': model_version}) + '\n')
+        output.flush()
+        rows += len(ids)
+
+        state['chunks_done'] += 1
+        state['rows_done'] += len(ids)
+        state['model_version'] = model_version
+        if checkpoint_path:
+            state['output_bytes'] = output.tell()
+            save_checkpoint(checkpoint_path, state)
+
+        now = time.perf_counter()
+        if now - last_report >= report_interval:
+            last_report = now
+            logger.info(f"Scored {state['rows_done']} rows, {rows / (now - start_time):.0f} rows/s")
+
+    try:
+        with executor:
+            for ids, texts in chunks:
+                pending.append((ids, executor.submit(_score_chunk, texts)))
+                if len(pending) >= 2 * workers:
+                    write_oldest()
+            while pending:
+                write_oldest()
+    finally:
+        output.close()
+
+    if checkpoint_path:
+        state['complete'] = True
+        save_checkpoint(checkpoint_path, state)
+
+    seconds = time.perf_counter() - start_time
+    summary = {
+        "rows": rows,
+        "resumed_rows": resumed_rows,
+        "seconds": seconds,
+        "rows_per_second": rows / seconds if seconds else 0.0,
+        "model_version": model_version
+    }
+    logger.info(f"Bulk scoring finished: {rows} rows in {seconds:.1f}s ({summary['rows_per_second']:.0f} rows/s)")
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Score a CSV or JSONL file of messages in bulk")
+    parser.add_argument("input", help="CSV or JSONL input file, or - for stdin")
+    parser.add_argument("--output", "-o", required=True, help="CSV or JSONL output file")
+    parser.add_argument("--input-format", choices=["csv", "jsonl"], help="Input format (default from extension)")
+    parser.add_argument("--output-format", choices=["csv", "jsonl"], help="Output format (default from extension)")
+    parser.add_argument("--text-field", default="text", help="Column or key holding the message text")
+    parser.add_argument("--id-field", default=None, help="Column or key copied to the output id")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Rows scored per call")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (1 = serial, 0 = all CPUs)")
+    parser.add_argument("--checkpoint", default=None, help="Checkpoint file for resuming an interrupted run")
+    parser.add_argument("--model-path", default=os.getenv("MODEL_PATH", "models/model.pkl"))
+    parser.add_argument("--vectorizer-path", default=os.getenv("VECTORIZER_PATH", "models/vectorizer.pkl"))
+    parser.add_argument("--encoding", default="utf-8", help="Input text encoding")
+    args = parser.parse_args(argv)
+
+    summary = bulk_score(
+        args.input, args.output,
+        input_format=args.input_format, output_format=args.output_format,
+        text_field=args.text_field, id_field=args.id_field, chunk_size=args.chunk_size,
+        workers=args.workers, checkpoint_path=args.checkpoint,
+        model_path=args.model_path, vectorizer_path=args.vectorizer_path, encoding=args.encoding
+    )
+    print(json.dumps(summary), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
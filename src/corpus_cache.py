@@ -0,0 +1,107 @@
+import hashlib
+import os
+from pathlib import Path
+from typing import Iterable, List, Optional
+import nltk
+import numpy as np
+from src import preprocess
+from src.preprocess import transform_corpus
+from src.utils.files import file_fingerprint
+from src.utils.logger import setup_logger
+
+logger = setup_logger("spam_classifier.corpus_cache")
+
+DEFAULT_CACHE_DIR = os.getenv("CORPUS_CACHE_DIR", ".cache/corpus")
+
+
+def preprocessor_version() -> str:
+    """
+    Identify the preprocessing logic that produced a cached corpus
+
+    The version changes whenever src/preprocess.py, its vendored NLTK data
+    or the NLTK release changes, so stale caches are never reused.
+
+    Returns:
+        Hex digest identifying the preprocessor
+    """
+    digest = hashlib.sha256(nltk.__version__.encode('utf-8'))
+    data_files = sorted(str(path) for path in Path(preprocess.NLTK_DATA_DIR).rglob('*') if path.is_file())
+    for path in [preprocess.__file__] + data_files:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def cache_path(data_path: str, cache_dir: str = DEFAULT_CACHE_DIR) -> Path:
+    """Path of the cached corpus for a dataset and the current preprocessor"""
+    name = f"corpus-{file_fingerprint(data_path)[:16]}-{preprocessor_version()[:16]}.npz"
+    return Path(cache_dir) / name
+
+
+def save_corpus(path: Path, texts: List[str]) -> None:
+    """
+    Persist transformed texts as one UTF-8 buffer plus an offsets column
+
+    Args:
+        path: Destination .npz file
+        texts: Transformed texts in row order
+    """
+    encoded = [text.encode('utf-8') for text in texts]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(item) for item in encoded], out=offsets[1:])
+    data = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, data=data, offsets=offsets)
+    os.replace(tmp_path, path)
+
+
+def load_corpus(path: Path) -> List[str]:
+    """
+    Load transformed texts saved by save_corpus
+
+    Args:
+        path: Cached .npz file
+
+    Returns:
+        Transformed texts in row order
+    """
+    with np.load(path) as archive:
+        buffer = archive['data'].tobytes()
+        offsets = archive['offsets'].tolist()
+    return [buffer[start:end].decode('utf-8') for start, end in zip(offsets, offsets[1:])]
+
+
+def load_or_transform_corpus(texts: Iterable[str], data_path: str,
+                             cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+                             workers: Optional[int] = 1) -> List[str]:
+    """
+    Load the transformed corpus from the cache, or transform and cache it
+
+    Args:
+        texts: Raw texts read from data_path, in row order
+        data_path: Dataset the texts were read from, used as the cache key
+        cache_dir: Cache directory, None disables caching
+        workers: Worker processes used on a cache miss
+
+    Returns:
+        Transformed texts in row order
+    """
+    texts = list(texts)
+    if cache_dir is None:
+        return transform_corpus(texts, workers=workers)
+
+    path = cache_path(data_path, cache_dir)
+    if path.exists():
+        logger.info(f"Loading preprocessed corpus from {path}")
+        cached = load_corpus(path)
+        if len(cached) == len(texts):
+            return cached
+        logger.warning(f"Cached corpus has {len(cached)} rows, expected {len(texts)}; rebuilding")
+
+    transformed = transform_corpus(texts, workers=workers)
+    logger.info(f"Caching preprocessed corpus at {path}")
+    save_corpus(path, transformed)
+    return transformed
@@ -0,0 +1,277 @@
+import threading
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+
+# Templated spam varies its numbers, so every digit shingles as 0
+_DIGITS = str.maketrans('123456789', '000000000')
+
+
+class _Cluster:
+    """A recent spam message standing in for its near-duplicates"""
+
+    __slots__ = ('cluster_id', 'signature', 'band_keys', 'label', 'confidence', 'model_version',
+                 'created_at', 'expires_at', 'hits')
+
+    def __init__(self, cluster_id: str, signature: np.ndarray, band_keys: List[bytes], label: str,
+                 confidence: float, model_version: str, now: float, ttl_seconds: float):
+        self.cluster_id = cluster_id
+        self.signature = signature
+        self.band_keys = band_keys
+        self.label = label
+        self.confidence = confidence
+        self.model_version = model_version
+        self.created_at = now
+        self.expires_at = now + ttl_seconds
+        self.hits = 0
+
+
+class NearDuplicateIndex:
+    """
+    MinHash/LSH index of recent spam clusters with time-based expiry
+
+    Spam floods are mostly templated variants of one message, so an exact
+    cache misses them. Each confidently scored spam message is indexed by
+    the MinHash signature of its character shingles; a later message whose
+    estimated Jaccard similarity to it reaches the threshold is answered
+    with its label and cluster id instead of calling the model. Signatures
+    are split into bands, and only messages sharing a band are compared.
+
+    The index holds at most max_size clusters, dropping the least recently
+    matched first, and a cluster expires ttl_seconds after it last matched.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 600.0, threshold: float = 0.7,
+                 min_confidence: float = 0.9, num_perm: int = 64, bands: int = 16, shingle_size: int = 5,
+                 seed: int = 1):
+        """
+        Initialize near-duplicate index
+
+        Args:
+            max_size: Maximum number of clusters held
+            ttl_seconds: Seconds a cluster lives after it was created or last matched
+            threshold: Estimated Jaccard similarity needed to match a cluster
+            min_confidence: Minimum spam confidence for a message to start a cluster
+            num_perm: MinHash permutations per signature
+            bands: LSH bands the signature is split into
+            shingle_size: Characters per shingle of the transformed text
+            seed: Seed of the MinHash permutations
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.threshold = threshold
+        self.min_confidence = min_confidence
+        self.bands = bands
+        self.shingle_size = shingle_size
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self.expired = 0
+
+        # Multiply-shift hash functions (a * x + b mod 2^64) >> 32 with odd a
+        # stand in for random permutations of the 32-bit shingle hashes
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(0, 1 << 62, size=(num_perm, 1), dtype=np.uint64) << np.uint64(1) | np.uint64(1)
+        self._b = rng.randint(0, 1 << 62, size=(num_perm, 1), dtype=np.uint64)
+        # Ordered by expiry: new and matched clusters move to the end
+        self._clusters: "OrderedDict[str, _Cluster]" = OrderedDict()
+        self._buckets: List[Dict[bytes, List[str]]] = [{} for _ in range(bands)]
+        self._lock = threading.Lock()
+
+    def signature(self, transformed_text: str) -> Optional[np.ndarray]:
+        """
+        MinHash signature of a transformed text's character shingles
+
+        Args:
+            transformed_text: Preprocessed text
+
+        Returns:
+            Array of num_perm minimum hashes, or None for an empty text
+        """
+        if not transformed_text:
+            return None
+        text = transformed_text.translate(_DIGITS)
+        size = self.shingle_size
+        shingles = {text[i:i + size] for i in range(max(len(text) - size + 1, 1))}
+        hashes = np.fromiter((zlib.crc32(shingle.encode('utf-8')) for shingle in shingles),
+                             dtype=np.uint64, count=len(shingles))
+        return ((self._a * hashes + self._b) >> np.uint64(32)).min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        """Bucket key of each band of a signature"""
+        return [band.tobytes() for band in signature.reshape(self.bands, -1)]
+
+    def _remove(self, cluster: _Cluster) -> None:
+        """Drop a cluster and its bucket entries; caller holds the lock"""
+        del self._clusters[cluster.cluster_id]
+        for buckets, key in zip(self._buckets, cluster.band_keys):
+            members = buckets[key]
+            members.remove(cluster.cluster_id)
+            if not members:
+                del buckets[key]
+
+    def _expire(self, now: float) -> None:
+        """Drop clusters past their expiry; caller holds the lock"""
+        while self._clusters:
+            cluster = next(iter(self._clusters.values()))
+            if cluster.expires_at > now:
+                return
+            self._remove(cluster)
+            self.expired += 1
+
+    def lookup(self, signature: Optional[np.ndarray], model_version: str) -> Optional[Tuple[str, float, str]]:
+        """
+        Find the cluster a message is a near-duplicate of
+
+        Args:
+            signature: Signature from signature(), None for an empty text
+            model_version: Version of the model that would score the message;
+                clusters scored by another version are ignored
+
+        Returns:
+            Tuple of (prediction, confidence, cluster_id), or None on a miss
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            best = None
+            best_similarity = self.threshold
+            if signature is not None:
+                candidates = set()
+                for buckets, key in zip(self._buckets, self._band_keys(signature)):
+                    candidates.update(buckets.get(key, ()))
+                for cluster_id in candidates:
+                    cluster = self._clusters[cluster_id]
+                    if cluster.model_version != model_version:
+                        continue
+                    similarity = np.count_nonzero(cluster.signature == signature) / len(signature)
+                    if similarity >= best_similarity:
+                        best, best_similarity = cluster, similarity
+
+            if best is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            best.hits += 1
+            best.expires_at = now + self.ttl_seconds
+            self._clusters.move_to_end(best.cluster_id)
+            return best.label, best.confidence, best.cluster_id
+
+    def group(self, signatures: List[Optional[np.ndarray]]) -> List[int]:
+        """
+        Group near-duplicate signatures within one batch
+
+        Each signature joins the most similar earlier group leader it
+        reaches the threshold with, or leads a new group. The index itself
+        is neither read nor changed.
+
+        Args:
+            signatures: Signatures from signature(), None for empty texts
+
+        Returns:
+            Position of each signature's group leader in signatures, which
+            is its own position for a leader
+        """
+        leaders: List[int] = []
+        buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(self.bands)]
+        for position, signature in enumerate(signatures):
+            if signature is None:
+                leaders.append(position)
+                continue
+            band_keys = self._band_keys(signature)
+            candidates = set()
+            for band_buckets, key in zip(buckets, band_keys):
+                candidates.update(band_buckets.get(key, ()))
+            best = position
+            best_similarity = self.threshold
+            for candidate in sorted(candidates):
+                similarity = np.count_nonzero(signatures[candidate] == signature) / len(signature)
+                if similarity >= best_similarity:
+                    best, best_similarity = candidate, similarity
+            leaders.append(best)
+            if best == position:
+                for band_buckets, key in zip(buckets, band_keys):
+                    band_buckets.setdefault(key, []).append(position)
+        return leaders
+
+    def add(self, signature: Optional[np.ndarray], prediction: str, confidence: float,
+            model_version: str) -> Optional[str]:
+        """
+        Start a cluster from a scored message if it is confidently spam
+
+        Args:
+            signature: Signature from signature(), None for an empty text
+            prediction: Label the model gave the message
+            confidence: Model confidence in the label
+            model_version: Version of the model that scored the message
+
+        Returns:
+            New cluster id, or None if the message was not indexed
+        """
+        if signature is None or prediction != 'spam' or confidence < self.min_confidence:
+            return None
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            cluster = _Cluster(uuid.uuid4().hex[:12], signature, self._band_keys(signature), prediction,
+                               confidence, model_version, now, self.ttl_seconds)
+            self._clusters[cluster.cluster_id] = cluster
+            for buckets, key in zip(self._buckets, cluster.band_keys):
+                buckets.setdefault(key, []).append(cluster.cluster_id)
+            while len(self._clusters) > self.max_size:
+                self._remove(next(iter(self._clusters.values())))
+                self.evicted += 1
+            return cluster.cluster_id
+
+    def clear(self) -> None:
+        """Drop all clusters"""
+        with self._lock:
+            self._clusters.clear()
+            for buckets in self._buckets:
+                buckets.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get index statistics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "size": len(self._clusters),
+                "max_size": self.max_size,
+                "evicted": self.evicted,
+                "expired": self.expired
+            }
+
+    def top_clusters(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Most matched live clusters
+
+        Args:
+            limit: Maximum clusters returned
+
+        Returns:
+            List of dictionaries with cluster_id, hits, confidence,
+            model_version, age_seconds and expires_in_seconds
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            clusters = sorted(self._clusters.values(), key=lambda cluster: -cluster.hits)[:limit]
+            return [
+                {
+                    "cluster_id": cluster.cluster_id,
+                    "hits": cluster.hits,
+                    "confidence": cluster.confidence,
+                    "model_version": cluster.model_version,
+                    "age_seconds": now - cluster.created_at,
+                    "expires_in_seconds": cluster.expires_at - now
+                }
+                for cluster in clusters
+            ]
@@ -0,0 +1,124 @@
+import pickle
+import time
+import tracemalloc
+from typing import Any, Dict, Optional, Sequence
+import numpy as np
+from src.artifacts import compact_vectorizer
+from src.scoring import build_scorer
+
+
+class LatencyBudgetExceededError(RuntimeError):
+    """Raised when a trained model is too slow to serve within the latency budget"""
+
+
+def _tree_bytes(obj: Any) -> int:
+    """Bytes of decision tree node and value arrays, which sklearn allocates outside tracemalloc's view"""
+    tree = getattr(obj, 'tree_', None)
+    if tree is not None:
+        state = tree.__getstate__()
+        return int(state['nodes'].nbytes + state['values'].nbytes)
+    estimators = getattr(obj, 'estimators_', None)
+    if estimators is None:
+        return 0
+    return sum(_tree_bytes(estimator) for estimator in np.ravel(np.asarray(estimators, dtype=object)))
+
+
+def in_memory_size(obj: Any) -> int:
+    """
+    Bytes allocated to hold an object once loaded, measured by unpickling it
+
+    numpy reports its array buffers to tracemalloc, so the figure includes
+    model coefficients, not just Python object headers. Tree ensembles
+    keep their nodes in buffers tracemalloc cannot see, so those are
+    added from the trees' own arrays.
+
+    Args:
+        obj: Picklable object such as a fitted model or vectorizer
+
+    Returns:
+        Bytes still allocated after unpickling a copy of the object
+    """
+    data = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        copy = pickle.loads(data)
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        if not already_tracing:
+            tracemalloc.stop()
+    del copy
+    return max(after - before, 0) + _tree_bytes(obj)
+
+
+def benchmark_inference(model: Any, vectorizer: Any, texts: Sequence[str],
+                        single_samples: int = 200, batch_size: int = 256) -> Dict[str, float]:
+    """
+    Measure what a trained model costs to serve
+
+    Texts are scored the way the API scores them: vectorized by the
+    compact form export_artifacts serves, then passed to the scorer
+    build_scorer picks for the model. Single-item latency times one text
+    per call; batch latency times the whole set in batches.
+
+    Args:
+        model: Fitted classifier
+        vectorizer: Fitted vectorizer
+        texts: Preprocessed held-out texts
+        single_samples: Texts timed one at a time
+        batch_size: Texts per call when timing batches
+
+    Returns:
+        Dictionary with single_p50_ms, single_p95_ms,
+        batch_ms_per_message, batch_messages_per_second, model_bytes,
+        model_memory_bytes, vectorizer_bytes and vectorizer_memory_bytes
+
+    Raises:
+        ValueError: If there are no texts to time
+    """
+    texts = list(texts)
+    if not texts:
+        raise ValueError("benchmark_inference needs at least one text to time")
+    scorer = build_scorer(model)
+    vectorizer = compact_vectorizer(vectorizer)
+
+    # Warm up caches and lazily built state before timing
+    scorer.score(vectorizer.transform(texts[:1]))
+
+    latencies = []
+    for text in texts[:single_samples]:
+        start_time = time.perf_counter()
+        scorer.score(vectorizer.transform([text]))
+        latencies.append(time.perf_counter() - start_time)
+
+    start_time = time.perf_counter()
+    for start in range(0, len(texts), batch_size):
+        scorer.score(vectorizer.transform(texts[start:start + batch_size]))
+    batch_seconds = time.perf_counter() - start_time
+
+    return {
+        "single_p50_ms": float(np.percentile(latencies, 50)) * 1000,
+        "single_p95_ms": float(np.percentile(latencies, 95)) * 1000,
+        "batch_ms_per_message": batch_seconds / len(texts) * 1000,
+        "batch_messages_per_second": len(texts) / batch_seconds if batch_seconds else 0.0,
+        "model_bytes": len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)),
+        "model_memory_bytes": in_memory_size(model),
+        "vectorizer_bytes": len(pickle.dumps(vectorizer, protocol=pickle.HIGHEST_PROTOCOL)),
+        "vectorizer_memory_bytes": in_memory_size(vectorizer)
+    }
+
+
+def over_latency_budget(cost: Dict[str, float], budget_ms: Optional[float]) -> bool:
+    """
+    Whether a model's p95 single-item latency exceeds the budget
+
+    Args:
+        cost: Result of benchmark_inference
+        budget_ms: Latency budget in milliseconds, None for no budget
+
+    Returns:
+        True if the model should be rejected
+    """
+    return budget_ms is not None and cost["single_p95_ms"] > budget_ms
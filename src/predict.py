@@ -1,51 +1,511 @@
+import hashlib
 import os
-import pickle
+import threading
 import time
 import uuid
-from typing import Tuple, Dict, Any
-from src.preprocess import transform_text
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Tuple, Dict, Any, Callable, List, NamedTuple, Optional
+from src.artifacts import compact_vectorizer, load_artifact, resolve_artifact_path
+from src.dedup import NearDuplicateIndex
+from src.preprocess import TextPreprocessor, transform_text
+from src.scoring import build_scorer, label_names
+from src.utils.files import file_fingerprint
 from src.utils.logger import setup_logger
 
 logger = setup_logger("spam_classifier.predict")
 
 
+class PredictionCache:
+    """Bounded LRU cache of prediction results with time-based expiry"""
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 300.0):
+        """
+        Initialize prediction cache
+
+        Args:
+            max_size: Maximum number of cached predictions
+            ttl_seconds: Seconds before a cached prediction expires (0 disables expiry)
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(transformed_text: str, model_version: str) -> str:
+        """Build a cache key from the transformed text and model version"""
+        payload = f"{model_version}\x00{transformed_text}".encode("utf-8")
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        """
+        Look up a cached prediction
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            Tuple of (prediction, confidence), or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl_seconds > 0 and entry[0] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1], entry[2]
+
+    def put(self, key: str, prediction: str, confidence: float) -> None:
+        """Store a prediction, evicting the least recently used entry when full"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, prediction, confidence)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached predictions"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hit_ratio": self.hits / lookups if lookups else 0.0
+            }
+
+
+class StageTimings:
+    """Wall-clock seconds spent in each stage of one prediction call"""
+
+    def __init__(self):
+        self.seconds: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a block of code and add it to the named stage"""
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] = self.seconds.get(name, 0.0) + time.perf_counter() - start_time
+
+
+class ModelNotReadyError(RuntimeError):
+    """Raised when a prediction is requested before the model has loaded"""
+
+
+class LoadedModel(NamedTuple):
+    """Model and vectorizer pair that is served and swapped as one unit"""
+    model: Any
+    vectorizer: Any
+    version: str
+    scorer: Any
+
+
 class SpamClassifier:
     """Spam Classifier with MLflow integration and logging"""
     
     def __init__(self, model_path: str = "models/model.pkl", 
-                 vectorizer_path: str = "models/vectorizer.pkl"):
+                 vectorizer_path: str = "models/vectorizer.pkl",
+                 cache_size: Optional[int] = None,
+                 cache_ttl: Optional[float] = None,
+                 near_duplicate_size: Optional[int] = None,
+                 near_duplicate_ttl: Optional[float] = None,
+                 load: bool = True):
         """
         Initialize spam classifier
         
         Args:
-            model_path: Path to trained model pickle file
-            vectorizer_path: Path to vectorizer pickle file
+            model_path: Path to trained model file (.joblib or pickle)
+            vectorizer_path: Path to vectorizer file (.joblib or pickle)
+            cache_size: Maximum cached predictions, 0 disables the cache
+                (defaults to PREDICTION_CACHE_SIZE env var)
+            cache_ttl: Seconds a cached prediction stays valid
+                (defaults to PREDICTION_CACHE_TTL env var)
+            near_duplicate_size: Maximum spam clusters in the near-duplicate
+                index, 0 disables it (defaults to NEAR_DUPLICATE_INDEX_SIZE env var)
+            near_duplicate_ttl: Seconds a spam cluster lives after it last
+                matched (defaults to NEAR_DUPLICATE_TTL env var)
+            load: Load the model now; pass False and call
+                load_in_background to start serving probes first
         """
         self.model_path = model_path
         self.vectorizer_path = vectorizer_path
-        self.model = None
-        self.vectorizer = None
-        self.model_version = os.getenv("MODEL_VERSION", "v1.0.0")
+        self.base_version = os.getenv("MODEL_VERSION", "v1.0.0")
         self.pod_name = os.getenv("HOSTNAME", "local")
+        self.reload_count = 0
+        self.loaded_at: Optional[float] = None
+        self.warmed_up = False
+        self.last_prediction_at: Optional[float] = None
+        self.load_error: Optional[Exception] = None
+        self._bulk_preprocessor: Optional[TextPreprocessor] = None
+        self._startup_done = threading.Event()
+        self._reload_listeners: List[Callable[[str, str, Optional[Exception]], None]] = []
+        self._stage_listeners: List[Callable[[str, float, int], None]] = []
+        self._score_listeners: List[Callable[[Any, List[str], List[float], str], None]] = []
+        self._loaded: Optional[LoadedModel] = None
+        self._reload_lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_watching = threading.Event()
+
+        if cache_size is None:
+            cache_size = int(os.getenv("PREDICTION_CACHE_SIZE", 0))
+        if cache_ttl is None:
+            cache_ttl = float(os.getenv("PREDICTION_CACHE_TTL", 300))
+        self.prediction_cache = PredictionCache(cache_size, cache_ttl) if cache_size > 0 else None
+
+        if near_duplicate_size is None:
+            near_duplicate_size = int(os.getenv("NEAR_DUPLICATE_INDEX_SIZE", 0))
+        if near_duplicate_ttl is None:
+            near_duplicate_ttl = float(os.getenv("NEAR_DUPLICATE_TTL", 600))
+        self.near_duplicates = NearDuplicateIndex(
+            near_duplicate_size, near_duplicate_ttl,
+            threshold=float(os.getenv("NEAR_DUPLICATE_THRESHOLD", 0.7)),
+            min_confidence=float(os.getenv("NEAR_DUPLICATE_MIN_CONFIDENCE", 0.9))
+        ) if near_duplicate_size > 0 else None
         
-        logger.info(f"Initializing SpamClassifier with model_version={self.model_version}")
-        self.load_model()
+        logger.info(f"Initializing SpamClassifier with model_version={self.base_version}")
+        if load:
+            self.load_model()
+            self._startup_done.set()
+
+    @property
+    def model(self) -> Any:
+        """Currently served model"""
+        return self._loaded.model if self._loaded else None
+
+    @property
+    def vectorizer(self) -> Any:
+        """Currently served vectorizer"""
+        return self._loaded.vectorizer if self._loaded else None
+
+    @property
+    def model_version(self) -> str:
+        """Version of the currently served model"""
+        return self._loaded.version if self._loaded else self.base_version
     
     def load_model(self):
-        """Load model and vectorizer from pickle files"""
+        """Load model and vectorizer from memory-mapped joblib or pickle files"""
+        with self._reload_lock:
+            self._swap(self._load(self.model_path, self.vectorizer_path, self.base_version))
+
+    def load_in_background(self, on_complete: Optional[Callable[[float, float], None]] = None) -> threading.Thread:
+        """
+        Load and warm up the model on a background thread
+
+        Predictions raise ModelNotReadyError until the load finishes, while
+        health probes can answer straight away. A failed load is kept in
+        load_error so the liveness probe can report it.
+
+        Args:
+            on_complete: Called with (load_seconds, warm_up_seconds) once the
+                model is loaded and warmed up
+
+        Returns:
+            The loader thread
+        """
+        def run():
+            try:
+                start_time = time.perf_counter()
+                self.load_model()
+                load_seconds = time.perf_counter() - start_time
+                warm_up_seconds = self.warm_up()
+                logger.info(
+                    f"Model ready in {load_seconds + warm_up_seconds:.3f}s "
+                    f"(load {load_seconds:.3f}s, warm-up {warm_up_seconds:.3f}s)",
+                    extra={'model_version': self.model_version, 'pod_name': self.pod_name}
+                )
+                if on_complete is not None:
+                    on_complete(load_seconds, warm_up_seconds)
+            except Exception as e:
+                self.load_error = e
+                logger.error(f"Background model load failed: {str(e)}", exc_info=True)
+            finally:
+                self._startup_done.set()
+
+        loader = threading.Thread(target=run, name="model-loader", daemon=True)
+        loader.start()
+        return loader
+
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the initial model load has finished
+
+        Args:
+            timeout: Maximum seconds to wait (None waits forever)
+
+        Returns:
+            True if a model is loaded, False on timeout or load failure
+        """
+        self._startup_done.wait(timeout)
+        return self._loaded is not None
+
+    def reload(self, model_path: Optional[str] = None, vectorizer_path: Optional[str] = None,
+               model_version: Optional[str] = None) -> str:
+        """
+        Load a new model and vectorizer pair and swap it in without downtime
+
+        The new pair is loaded and warmed up while requests keep being served
+        by the current one. The swap is a single reference assignment, so a
+        request in flight finishes on the pair it started with. If loading or
+        warm-up fails, the current pair stays in service.
+
+        Args:
+            model_path: New model path (defaults to the current path)
+            vectorizer_path: New vectorizer path (defaults to the current path)
+            model_version: Version to report for the new pair (defaults to
+                MODEL_VERSION suffixed with a hash of the artifact files)
+
+        Returns:
+            Version of the model now being served
+        """
+        with self._reload_lock:
+            model_path = model_path or self.model_path
+            vectorizer_path = vectorizer_path or self.vectorizer_path
+            previous_version = self.model_version
+
+            try:
+                if model_version is None:
+                    fingerprint = file_fingerprint(resolve_artifact_path(model_path), resolve_artifact_path(vectorizer_path))
+                    model_version = f"{self.base_version}+{fingerprint[:8]}"
+                loaded = self._load(model_path, vectorizer_path, model_version)
+                self._warm_up(loaded)
+            except Exception as e:
+                self._notify_reload(previous_version, model_version or previous_version, e)
+                raise
+
+            self.model_path = model_path
+            self.vectorizer_path = vectorizer_path
+            self._swap(loaded)
+            self.warmed_up = True
+            self.reload_count += 1
+            logger.info(
+                f"Model reloaded: {previous_version} -> {model_version}",
+                extra={'model_version': model_version, 'pod_name': self.pod_name}
+            )
+            self._notify_reload(previous_version, model_version, None)
+            return model_version
+
+    def add_reload_listener(self, listener: Callable[[str, str, Optional[Exception]], None]) -> None:
+        """
+        Register a callback run after every reload attempt
+
+        Args:
+            listener: Called with (previous_version, model_version, error),
+                where error is None when the new model was swapped in
+        """
+        self._reload_listeners.append(listener)
+
+    def add_stage_listener(self, listener: Callable[[str, float, int], None]) -> None:
+        """
+        Register a callback receiving the time spent in each prediction stage
+
+        Stages are preprocess, cache, vectorize, model and logging. Stages
+        that did not run for a call, such as cache lookups with the cache
+        disabled, are not reported.
+
+        Args:
+            listener: Called with (stage, seconds, batch_size) after every
+                predict_with_version and predict_batch_with_version call
+        """
+        self._stage_listeners.append(listener)
+
+    def remove_stage_listener(self, listener: Callable[[str, float, int], None]) -> None:
+        """
+        Stop reporting stage timings to a callback registered with add_stage_listener
+
+        Args:
+            listener: Previously registered callback
+        """
+        self._stage_listeners = [registered for registered in self._stage_listeners if registered != listener]
+
+    def add_score_listener(self, listener: Callable[[Any, List[str], List[float], str], None]) -> None:
+        """
+        Register a callback receiving every vectorized input the model scores
+
+        Runs on the request thread right after scoring, so listeners must
+        hand any real work off to another thread. Predictions served from
+        the prediction cache are not vectorized and are not reported, and
+        neither are inputs scored with a pair passed in by the caller, such
+        as a registry model, whose vectorizer listeners do not expect.
+
+        Args:
+            listener: Called with (vector_input, labels, confidences,
+                model_version) for each scored text or batch
+        """
+        self._score_listeners.append(listener)
+
+    def remove_score_listener(self, listener: Callable[[Any, List[str], List[float], str], None]) -> None:
+        """
+        Stop passing scored inputs to a callback registered with add_score_listener
+
+        Args:
+            listener: Previously registered callback
+        """
+        self._score_listeners = [registered for registered in self._score_listeners if registered != listener]
+
+    def _notify_scored(self, vector_input: Any, labels: List[str], confidences: List[float],
+                       model_version: str) -> None:
+        """Pass a scored input to score listeners, never letting one break the prediction"""
+        for listener in self._score_listeners:
+            try:
+                listener(vector_input, labels, confidences, model_version)
+            except Exception:
+                logger.error("Score listener failed", exc_info=True)
+
+    def _notify_stages(self, timings: StageTimings, batch_size: int) -> None:
+        """Report stage timings to stage listeners"""
+        for listener in self._stage_listeners:
+            for stage, seconds in timings.seconds.items():
+                listener(stage, seconds, batch_size)
+
+    def _notify_reload(self, previous_version: str, model_version: str, error: Optional[Exception]) -> None:
+        """Run reload listeners, never letting one break the reload"""
+        for listener in self._reload_listeners:
+            try:
+                listener(previous_version, model_version, error)
+            except Exception:
+                logger.error("Reload listener failed", exc_info=True)
+
+    def _load(self, model_path: str, vectorizer_path: str, model_version: str) -> LoadedModel:
+        """Load a model and vectorizer pair from disk"""
         try:
-            logger.info(f"Loading model from {self.model_path}")
-            with open(self.model_path, 'rb') as f:
-                self.model = pickle.load(f)
+            logger.info(f"Loading model from {model_path}")
+            model = load_artifact(model_path)
             
-            logger.info(f"Loading vectorizer from {self.vectorizer_path}")
-            with open(self.vectorizer_path, 'rb') as f:
-                self.vectorizer = pickle.load(f)
+            logger.info(f"Loading vectorizer from {vectorizer_path}")
+            # Pickled TF-IDF vectorizers are served in the same compact form as joblib ones
+            vectorizer = compact_vectorizer(load_artifact(vectorizer_path))
             
             logger.info("Model and vectorizer loaded successfully")
+            return LoadedModel(model, vectorizer, model_version, build_scorer(model))
         except Exception as e:
             logger.error(f"Failed to load model: {str(e)}", exc_info=True)
             raise
+
+    def warm_up(self) -> float:
+        """
+        Run inference through the served model so its pages are resident
+
+        Marks the classifier as warmed up, which is the readiness gate.
+
+        Returns:
+            Seconds the warm-up took
+        """
+        start_time = time.perf_counter()
+        self._warm_up(self._require_loaded())
+        self.warmed_up = True
+        return time.perf_counter() - start_time
+
+    def get_state(self) -> Dict[str, Any]:
+        """
+        In-memory serving state used by health and readiness probes
+
+        Returns:
+            Dictionary with loaded, loading, warmed_up, model_version, loaded_at,
+            last_prediction_at (Unix timestamps or None) and load_error
+        """
+        loaded = self._loaded
+        return {
+            "loaded": loaded is not None,
+            "loading": not self._startup_done.is_set(),
+            "warmed_up": self.warmed_up,
+            "model_version": loaded.version if loaded else self.base_version,
+            "loaded_at": self.loaded_at,
+            "last_prediction_at": self.last_prediction_at,
+            "load_error": str(self.load_error) if self.load_error else None
+        }
+
+    def _warm_up(self, loaded: LoadedModel) -> None:
+        """Run a prediction through a freshly loaded pair before it takes traffic"""
+        self._score(loaded, transform_text("Free entry to win a prize, reply now"))
+        self._score_batch(loaded, [transform_text("Are we still meeting for lunch today?")])
+
+    def _swap(self, loaded: LoadedModel) -> None:
+        """Atomically replace the served model and vectorizer pair"""
+        self._loaded = loaded
+        self.loaded_at = time.time()
+        # A pair is being served again, so an earlier load failure no longer applies
+        self.load_error = None
+
+        # Cached results and spam clusters belong to the previous model
+        if self.prediction_cache is not None:
+            self.prediction_cache.clear()
+        if self.near_duplicates is not None:
+            self.near_duplicates.clear()
+
+    def start_watching(self, interval: float = 30.0) -> None:
+        """
+        Reload automatically when the artifact files change on disk
+
+        Files are polled every interval seconds, and a change is only acted on
+        once the files have stayed unchanged for a further interval, so
+        artifacts still being copied are not loaded.
+
+        Args:
+            interval: Seconds between checks
+        """
+        if self._watcher is not None:
+            return
+        self._stop_watching.clear()
+        self._watcher = threading.Thread(
+            target=self._watch, args=(interval, self._artifact_signature()),
+            name="model-watcher", daemon=True
+        )
+        self._watcher.start()
+        logger.info(f"Watching {self.model_path} and {self.vectorizer_path} every {interval}s")
+
+    def stop_watching(self) -> None:
+        """Stop the artifact file watcher"""
+        if self._watcher is None:
+            return
+        self._stop_watching.set()
+        self._watcher.join()
+        self._watcher = None
+
+    def _artifact_signature(self) -> Optional[Tuple[Tuple[int, int], ...]]:
+        """Modification time and size of the artifact files, None if one is missing"""
+        try:
+            return tuple(
+                (stat.st_mtime_ns, stat.st_size)
+                for stat in (
+                    os.stat(resolve_artifact_path(self.model_path)),
+                    os.stat(resolve_artifact_path(self.vectorizer_path))
+                )
+            )
+        except OSError:
+            return None
+
+    def _watch(self, interval: float, seen: Optional[Tuple[Tuple[int, int], ...]]) -> None:
+        """Watcher thread loop, starting from the artifact signature already being served"""
+        while not self._stop_watching.wait(interval):
+            current = self._artifact_signature()
+            if current is None or current == seen:
+                continue
+            if self._stop_watching.wait(interval) or self._artifact_signature() != current:
+                continue
+
+            # Record the change even if the reload fails, so a broken
+            # artifact is not retried on every poll
+            seen = current
+            try:
+                self.reload()
+            except Exception as e:
+                logger.error(f"Automatic model reload failed: {str(e)}", exc_info=True)
     
     def predict(self, text: str) -> Tuple[str, float, str]:
         """
@@ -57,68 +517,316 @@ class SpamClassifier:
         Returns:
             Tuple of (prediction, confidence, request_id)
         """
+        return self.predict_with_version(text)[:3]
+
+    def predict_with_version(self, text: str, loaded: Optional[LoadedModel] = None) -> Tuple[str, float, str, str]:
+        """
+        Predict if text is spam or not, reporting the model that scored it
+
+        Args:
+            text: Input text to classify
+            loaded: Model and vectorizer pair to score with, such as a
+                registry model (defaults to the served pair)
+
+        Returns:
+            Tuple of (prediction, confidence, request_id, model_version)
+        """
         request_id = str(uuid.uuid4())
         start_time = time.time()
+        on_scored = None
+        if loaded is None:
+            loaded = self._require_loaded()
+            on_scored = self._notify_scored if self._score_listeners else None
+        timings = StageTimings()
         
         try:
             # Preprocess text
-            transformed_text = transform_text(text)
-            
-            # Vectorize
-            vector_input = self.vectorizer.transform([transformed_text])
-            
-            # Predict
-            prediction = self.model.predict(vector_input)[0]
-            
-            # Get prediction probability for confidence score
-            if hasattr(self.model, 'predict_proba'):
-                proba = self.model.predict_proba(vector_input)[0]
-                confidence = float(max(proba))
+            with timings.stage("preprocess"):
+                transformed_text = transform_text(text)
+
+            # Serve repeated messages from the prediction cache
+            cache_key = None
+            cached = None
+            if self.prediction_cache is not None:
+                with timings.stage("cache"):
+                    cache_key = PredictionCache.make_key(transformed_text, loaded.version)
+                    cached = self.prediction_cache.get(cache_key)
+
+            cluster_id = None
+            if cached is not None:
+                prediction_label, confidence = cached
             else:
-                # If model doesn't support predict_proba, use decision function or default
-                if hasattr(self.model, 'decision_function'):
-                    decision = self.model.decision_function(vector_input)[0]
-                    confidence = float(abs(decision))
+                # Answer variants of a recent spam message from its cluster
+                near_duplicate = None
+                if self.near_duplicates is not None:
+                    with timings.stage("near_duplicate"):
+                        signature = self.near_duplicates.signature(transformed_text)
+                        near_duplicate = self.near_duplicates.lookup(signature, loaded.version)
+
+                if near_duplicate is not None:
+                    prediction_label, confidence, cluster_id = near_duplicate
                 else:
-                    confidence = 1.0
-            
-            prediction_label = "spam" if prediction == 1 else "not_spam"
+                    prediction_label, confidence = self._score(loaded, transformed_text, timings, on_scored)
+                    if self.near_duplicates is not None:
+                        cluster_id = self.near_duplicates.add(signature, prediction_label, confidence, loaded.version)
+                if cache_key is not None:
+                    self.prediction_cache.put(cache_key, prediction_label, confidence)
             
             # Calculate latency
             latency_ms = (time.time() - start_time) * 1000
             
             # Log prediction with extra fields
-            logger.info(
-                f"Prediction made: {prediction_label}",
-                extra={
-                    'prediction': prediction_label,
-                    'confidence': confidence,
-                    'model_version': self.model_version,
-                    'request_id': request_id,
-                    'pod_name': self.pod_name,
-                    'latency_ms': latency_ms
-                }
-            )
-            
-            return prediction_label, confidence, request_id
+            with timings.stage("logging"):
+                logger.info(
+                    f"Prediction made: {prediction_label}",
+                    extra={
+                        'prediction': prediction_label,
+                        'confidence': confidence,
+                        'model_version': loaded.version,
+                        'request_id': request_id,
+                        'pod_name': self.pod_name,
+                        'latency_ms': latency_ms,
+                        'cluster_id': cluster_id
+                    }
+                )
+
+            self._notify_stages(timings, 1)
+            self._record_success()
+            return prediction_label, confidence, request_id, loaded.version
             
         except Exception as e:
             logger.error(
                 f"Prediction failed: {str(e)}",
                 extra={
                     'request_id': request_id,
-                    'model_version': self.model_version,
+                    'model_version': loaded.version,
                     'pod_name': self.pod_name
                 },
                 exc_info=True
             )
             raise
-    
+
+    def _require_loaded(self) -> LoadedModel:
+        """Snapshot of the served pair, raising if the initial load has not finished"""
+        loaded = self._loaded
+        if loaded is None:
+            raise ModelNotReadyError("Model is still loading")
+        return loaded
+
+    def _record_success(self) -> None:
+        """Note a successful prediction, which also proves the model is warm"""
+        self.last_prediction_at = time.time()
+        self.warmed_up = True
+
+    @staticmethod
+    def _score(loaded: LoadedModel, transformed_text: str,
+               timings: Optional[StageTimings] = None,
+               on_scored: Optional[Callable[[Any, List[str], List[float], str], None]] = None) -> Tuple[str, float]:
+        """Vectorize a preprocessed text and score it with the model"""
+        labels, confidences = SpamClassifier._score_batch(loaded, [transformed_text], timings, on_scored)
+        return labels[0], confidences[0]
+
+    @staticmethod
+    def _score_batch(loaded: LoadedModel, transformed_texts: List[str],
+                     timings: Optional[StageTimings] = None,
+                     on_scored: Optional[Callable[[Any, List[str], List[float], str], None]] = None
+                     ) -> Tuple[List[str], List[float]]:
+        """Vectorize preprocessed texts into one sparse matrix and score them in one pass"""
+        timings = timings or StageTimings()
+        with timings.stage("vectorize"):
+            vector_input = loaded.vectorizer.transform(transformed_texts)
+        with timings.stage("model"):
+            predictions, confidences = loaded.scorer.score(vector_input)
+
+        labels = label_names(predictions)
+        confidences = [float(confidence) for confidence in confidences]
+        if on_scored is not None:
+            on_scored(vector_input, labels, confidences, loaded.version)
+        return labels, confidences
+
+    def predict_batch(self, texts: List[str]) -> List[Tuple[str, float, str]]:
+        """
+        Predict a batch of texts, scoring them together in as few model calls as possible
+
+        Args:
+            texts: Input texts to classify
+
+        Returns:
+            List of (prediction, confidence, request_id) tuples in input order
+        """
+        return self.predict_batch_with_version(texts)[0]
+
+    def predict_batch_with_version(self, texts: List[str],
+                                   loaded: Optional[LoadedModel] = None) -> Tuple[List[Tuple[str, float, str]], str]:
+        """
+        Predict a batch of texts, reporting the model that scored them
+
+        Every text in the batch is scored by the same model, even if a
+        reload completes while the batch is being processed.
+
+        Args:
+            texts: Input texts to classify
+            loaded: Model and vectorizer pair to score with, such as a
+                registry model (defaults to the served pair)
+
+        Returns:
+            Tuple of (list of (prediction, confidence, request_id) tuples in
+            input order, model_version)
+        """
+        on_scored = None
+        if loaded is None:
+            loaded = self._require_loaded()
+            on_scored = self._notify_scored if self._score_listeners else None
+        if not texts:
+            return [], loaded.version
+
+        batch_id = str(uuid.uuid4())
+        request_ids = [str(uuid.uuid4()) for _ in texts]
+        start_time = time.time()
+        timings = StageTimings()
+
+        try:
+            with timings.stage("preprocess"):
+                transformed_texts = [transform_text(text) for text in texts]
+            labels: List[Optional[str]] = [None] * len(texts)
+            confidences: List[Optional[float]] = [None] * len(texts)
+
+            # Serve repeated messages from the prediction cache
+            cache_keys: List[Optional[str]] = [None] * len(texts)
+            if self.prediction_cache is not None:
+                with timings.stage("cache"):
+                    for index, transformed_text in enumerate(transformed_texts):
+                        cache_keys[index] = PredictionCache.make_key(transformed_text, loaded.version)
+                        cached = self.prediction_cache.get(cache_keys[index])
+                        if cached is not None:
+                            labels[index], confidences[index] = cached
+
+            # Answer variants of recent spam messages from their clusters. Variants
+            # of one campaign within the batch are grouped, and only the first of
+            # each group is scored in the first round, so the rest can match the
+            # cluster it starts instead of each starting their own
+            pending = [index for index, label in enumerate(labels) if label is None]
+            cluster_ids: List[Optional[str]] = [None] * len(texts)
+            signatures: Dict[int, Any] = {}
+            rounds = [pending]
+            if self.near_duplicates is not None and pending:
+                with timings.stage("near_duplicate"):
+                    for index in pending:
+                        signatures[index] = self.near_duplicates.signature(transformed_texts[index])
+                    leaders = self.near_duplicates.group([signatures[index] for index in pending])
+                rounds = [
+                    [index for position, index in enumerate(pending) if leaders[position] == position],
+                    [index for position, index in enumerate(pending) if leaders[position] != position]
+                ]
+
+            for round_indexes in rounds:
+                if self.near_duplicates is not None and round_indexes:
+                    with timings.stage("near_duplicate"):
+                        for index in round_indexes:
+                            near_duplicate = self.near_duplicates.lookup(signatures[index], loaded.version)
+                            if near_duplicate is not None:
+                                labels[index], confidences[index], cluster_ids[index] = near_duplicate
+                                if cache_keys[index] is not None:
+                                    self.prediction_cache.put(cache_keys[index], labels[index], confidences[index])
+                    round_indexes = [index for index in round_indexes if labels[index] is None]
+
+                # Score the remaining texts with one vectorizer and model call
+                if not round_indexes:
+                    continue
+                scored_labels, scored_confidences = self._score_batch(
+                    loaded, [transformed_texts[index] for index in round_indexes], timings, on_scored
+                )
+                for index, label, confidence in zip(round_indexes, scored_labels, scored_confidences):
+                    labels[index] = label
+                    confidences[index] = confidence
+                    if cache_keys[index] is not None:
+                        self.prediction_cache.put(cache_keys[index], label, confidence)
+                    if self.near_duplicates is not None:
+                        cluster_ids[index] = self.near_duplicates.add(
+                            signatures[index], label, confidence, loaded.version
+                        )
+
+            latency_ms = (time.time() - start_time) * 1000
+
+            with timings.stage("logging"):
+                for label, confidence, request_id, cluster_id in zip(labels, confidences, request_ids, cluster_ids):
+                    logger.info(
+                        f"Prediction made: {label}",
+                        extra={
+                            'prediction': label,
+                            'confidence': confidence,
+                            'model_version': loaded.version,
+                            'request_id': request_id,
+                            'batch_id': batch_id,
+                            'pod_name': self.pod_name,
+                            'cluster_id': cluster_id
+                        }
+                    )
+                logger.info(
+                    f"Batch prediction made: {len(texts)} texts",
+                    extra={
+                        'model_version': loaded.version,
+                        'batch_id': batch_id,
+                        'batch_size': len(texts),
+                        'pod_name': self.pod_name,
+                        'latency_ms': latency_ms
+                    }
+                )
+
+            self._notify_stages(timings, len(texts))
+            self._record_success()
+
+            results = [
+                (label, confidence, request_id)
+                for label, confidence, request_id in zip(labels, confidences, request_ids)
+            ]
+            return results, loaded.version
+
+        except Exception as e:
+            logger.error(
+                f"Batch prediction failed: {str(e)}",
+                extra={
+                    'batch_id': batch_id,
+                    'batch_size': len(texts),
+                    'model_version': loaded.version,
+                    'pod_name': self.pod_name
+                },
+                exc_info=True
+            )
+            raise
+
+    def score_texts(self, texts: List[str]) -> Tuple[List[str], List[float], str]:
+        """
+        Score texts in one vectorized call without per-prediction logging or caching
+
+        Meant for offline bulk scoring, where a log record and a cache entry
+        per message would cost more than the prediction itself. Texts are
+        preprocessed with TextPreprocessor, which matches transform_text
+        exactly at a fraction of the cost per message.
+
+        Args:
+            texts: Input texts to classify
+
+        Returns:
+            Tuple of (labels, confidences, model_version)
+        """
+        loaded = self._require_loaded()
+        if not texts:
+            return [], [], loaded.version
+        if self._bulk_preprocessor is None:
+            self._bulk_preprocessor = TextPreprocessor()
+        labels, confidences = self._score_batch(loaded, [self._bulk_preprocessor(text) for text in texts])
+        return labels, confidences, loaded.version
+
     def get_model_info(self) -> Dict[str, Any]:
         """Get model information"""
+        loaded = self._loaded
         return {
-            "model_version": self.model_version,
-            "model_type": type(self.model).__name__ if self.model else "Unknown",
-            "vectorizer_type": type(self.vectorizer).__name__ if self.vectorizer else "Unknown",
+            "model_version": loaded.version if loaded else self.base_version,
+            "model_type": type(loaded.model).__name__ if loaded else "Unknown",
+            "vectorizer_type": type(loaded.vectorizer).__name__ if loaded else "Unknown",
+            "model_path": self.model_path,
+            "vectorizer_path": self.vectorizer_path,
+            "reload_count": self.reload_count,
             "pod_name": self.pod_name
         }
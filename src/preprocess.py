@@ -1,23 +1,80 @@
+import functools
+import os
+import re
 import string
+from concurrent.futures import ProcessPoolExecutor
 import nltk
 from nltk.corpus import stopwords
 from nltk.stem.porter import PorterStemmer
-from typing import List
+from nltk.tokenize import NLTKWordTokenizer
+from nltk.tokenize.punkt import PunktTokenizer
+from typing import List, Dict, Iterable, Optional
 
-# Download required NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt', quiet=True)
-    nltk.download('punkt_tab', quiet=True)
-
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords', quiet=True)
+# English stopwords and Punkt tables are vendored with the package, so
+# preprocessing never needs network access
+NLTK_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "nltk_data")
+if NLTK_DATA_DIR not in nltk.data.path:
+    nltk.data.path.insert(0, NLTK_DATA_DIR)
 
 ps = PorterStemmer()
 
+# Bounded LRU cache of Porter stems, sized per pod via STEM_CACHE_SIZE
+STEM_CACHE_SIZE = int(os.getenv("STEM_CACHE_SIZE", 50000))
+_cached_stem = functools.lru_cache(maxsize=max(STEM_CACHE_SIZE, 0))(ps.stem)
+
+# Characters that may trail a sentence-final period in NLTKWordTokenizer
+_CLOSING_CHARS = frozenset(']})>"\'»”’')
+
+# Treebank contractions that split an otherwise alphanumeric token
+_CONTRACTIONS = {
+    'cannot': ('can', 'not'),
+    'gimme': ('gim', 'me'),
+    'gonna': ('gon', 'na'),
+    'gotta': ('got', 'ta'),
+    'lemme': ('lem', 'me'),
+    'wanna': ('wan', 'na'),
+}
+
+# Whitespace-delimited chunk of text
+_CHUNK_RE = re.compile(r"\S+")
+
+# A period that Punkt could treat as a sentence boundary
+_SENTENCE_PERIOD_RE = re.compile(r"\.(?=[)\";}\]*:@'({\[?!]|\s+\S)")
+
+
+def stem_token(token: str) -> str:
+    """
+    Stem a token with the Porter stemmer, memoized in a bounded LRU cache
+
+    Args:
+        token: Token to stem
+
+    Returns:
+        Stemmed token
+    """
+    return _cached_stem(token)
+
+
+def get_stem_cache_info() -> Dict[str, int]:
+    """
+    Get stem cache statistics
+
+    Returns:
+        Dictionary with cache hits, misses, current size and maximum size
+    """
+    info = _cached_stem.cache_info()
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "max_size": info.maxsize
+    }
+
+
+def clear_stem_cache() -> None:
+    """Clear the stem cache and reset its counters"""
+    _cached_stem.cache_clear()
+
 
 def transform_text(text: str) -> str:
     """
@@ -55,12 +112,133 @@ def transform_text(text: str) -> str:
     text_tokens = [token for token in text_tokens if token not in string.punctuation]
     
     # Apply stemming
-    text_tokens = [ps.stem(token) for token in text_tokens]
+    text_tokens = [stem_token(token) for token in text_tokens]
     
     # Join tokens
     return ' '.join(text_tokens)
 
 
+class TextPreprocessor:
+    """
+    Reusable text preprocessor producing the same output as transform_text
+
+    The stopword set and tokenizers are built once and stems come from the
+    shared LRU stem cache. Tokenization
+    splits on whitespace in a single pass and keeps plain alphanumeric
+    words as they are; only chunks containing punctuation go through
+    NLTK's Treebank rules, and Punkt sentence splitting only runs when a
+    period could end a sentence, since that is the only case where
+    sentence boundaries change which tokens survive.
+    """
+
+    def __init__(self, language: str = 'english'):
+        """
+        Initialize text preprocessor
+
+        Args:
+            language: Language for stopwords and sentence splitting
+        """
+        self.stop_words = frozenset(stopwords.words(language))
+        self._sentence_tokenizer = PunktTokenizer(language)
+        self._word_tokenizer = NLTKWordTokenizer()
+
+    def tokenize(self, text: str) -> List[str]:
+        """
+        Split lowercased text into the alphanumeric tokens word_tokenize keeps
+
+        Args:
+            text: Lowercased input text
+
+        Returns:
+            List of alphanumeric tokens
+        """
+        if _SENTENCE_PERIOD_RE.search(text):
+            sentences = self._sentence_tokenizer.tokenize(text)
+        else:
+            sentences = [text]
+
+        tokens: List[str] = []
+        for sentence in sentences:
+            chunks = [(match.start(), match.group()) for match in _CHUNK_RE.finditer(sentence)]
+
+            # The final-period rule applies to the last chunk that is not
+            # made up entirely of closing quotes and brackets; a leading
+            # double quote is rewritten as an opening quote instead
+            last = len(chunks) - 1
+            while (last >= 0 and _CLOSING_CHARS.issuperset(chunks[last][1])
+                   and not chunks[last][1].startswith(('"', "''"))):
+                last -= 1
+
+            for index, (start, chunk) in enumerate(chunks[:last + 1]):
+                if chunk.isalnum():
+                    tokens.extend(_CONTRACTIONS.get(chunk, (chunk,)))
+                    continue
+                if index == last:
+                    # Keep the trailing brackets and exact whitespace, both
+                    # of which decide whether the final period is split off
+                    chunk_tokens = self._word_tokenizer.tokenize(sentence[start:])
+                else:
+                    # A trailing sentinel word keeps the final-period rule
+                    # from firing on chunks in the middle of a sentence
+                    chunk_tokens = self._word_tokenizer.tokenize(chunk + ' x')[:-1]
+                tokens.extend(token for token in chunk_tokens if token.isalnum())
+
+        return tokens
+
+    def transform(self, text: str) -> str:
+        """
+        Transform and preprocess text for spam classification
+
+        Args:
+            text: Input text to transform
+
+        Returns:
+            Preprocessed text string
+        """
+        stop_words = self.stop_words
+        return ' '.join(
+            _cached_stem(token) for token in self.tokenize(text.lower())
+            if token not in stop_words
+        )
+
+    __call__ = transform
+
+
+def _transform_chunk(texts: List[str]) -> List[str]:
+    """Transform one chunk of a corpus inside a worker process"""
+    return [transform_text(text) for text in texts]
+
+
+def transform_corpus(texts: Iterable[str], workers: Optional[int] = 1,
+                     chunk_size: int = 1000) -> List[str]:
+    """
+    Transform a corpus of texts, optionally across a process pool
+
+    The corpus is split into chunks that are spread over the pool, and
+    results are returned in the original row order.
+
+    Args:
+        texts: Input texts to transform
+        workers: Number of worker processes; 1 transforms in-process and
+            None or 0 uses every available CPU
+        chunk_size: Number of texts sent to a worker at a time
+
+    Returns:
+        List of preprocessed text strings in input order
+    """
+    texts = list(texts)
+    if not workers:
+        workers = os.cpu_count() or 1
+
+    if workers == 1 or len(texts) <= chunk_size:
+        return _transform_chunk(texts)
+
+    chunks = [texts[start:start + chunk_size] for start in range(0, len(texts), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        transformed_chunks = executor.map(_transform_chunk, chunks)
+        return [text for chunk in transformed_chunks for text in chunk]
+
+
 def get_text_stats(text: str) -> dict:
     """
     Get statistics about the input text
@@ -0,0 +1,317 @@
+import hashlib
+import json
+import os
+import random
+import threading
+import uuid
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from src.artifacts import compact_vectorizer, load_artifact, resolve_artifact_path
+from src.predict import LoadedModel, ModelNotReadyError
+from src.preprocess import transform_text
+from src.scoring import build_scorer, label_names
+from src.utils.files import file_fingerprint
+from src.utils.logger import setup_logger
+
+logger = setup_logger("spam_classifier.registry")
+
+
+class RegisteredModel(NamedTuple):
+    """Model served by the registry, with the key of the vectorizer it shares"""
+    name: str
+    loaded: LoadedModel
+    vectorizer_key: str
+    weight: float
+
+
+class ModelRegistry:
+    """
+    Keep several trained models in memory and route requests between them
+
+    A request either names the model it wants or is routed by traffic
+    weight. Vectorizers are keyed by a hash of their file contents, so
+    models trained on the same vectorizer share one in-memory copy, and a
+    request scored by several of them runs the TF-IDF transform once.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry"""
+        self.pod_name = os.getenv("HOSTNAME", "local")
+        self._models: Dict[str, RegisteredModel] = {}
+        self._vectorizers: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config_path: str) -> "ModelRegistry":
+        """
+        Build a registry from a JSON file
+
+        The file holds {"models": [{"name", "model_path", "vectorizer_path",
+        "weight", "model_version"}, ...]}; weight and model_version are
+        optional.
+
+        Args:
+            config_path: Path to the registry config
+
+        Returns:
+            Registry with every configured model loaded
+        """
+        with open(config_path) as f:
+            config = json.load(f)
+
+        registry = cls()
+        for entry in config.get("models", []):
+            registry.register(
+                entry["name"],
+                entry["model_path"],
+                entry["vectorizer_path"],
+                weight=float(entry.get("weight", 0.0)),
+                model_version=entry.get("model_version")
+            )
+        return registry
+
+    def register(self, name: str, model_path: str, vectorizer_path: str,
+                 weight: float = 0.0, model_version: Optional[str] = None) -> str:
+        """
+        Load a model and add it to the registry, replacing one of the same name
+
+        Args:
+            name: Name requests use to select the model
+            model_path: Path to the model artifact
+            vectorizer_path: Path to the vectorizer artifact
+            weight: Relative share of unrouted traffic (0 serves the model
+                only to requests that name it)
+            model_version: Version to report (defaults to the name suffixed
+                with a hash of the artifact files)
+
+        Returns:
+            Version of the registered model
+        """
+        if weight < 0:
+            raise ValueError(f"Model weight must not be negative: {weight}")
+
+        model_file = resolve_artifact_path(model_path)
+        vectorizer_file = resolve_artifact_path(vectorizer_path)
+        vectorizer_key = file_fingerprint(vectorizer_file)
+        if model_version is None:
+            model_version = f"{name}+{file_fingerprint(model_file, vectorizer_file)[:8]}"
+
+        logger.info(f"Registering model {name} from {model_path}")
+        model = load_artifact(model_path)
+        with self._lock:
+            vectorizer = self._vectorizers.get(vectorizer_key)
+            if vectorizer is None:
+                logger.info(f"Loading vectorizer from {vectorizer_file}")
+                vectorizer = compact_vectorizer(load_artifact(vectorizer_path))
+                self._vectorizers[vectorizer_key] = vectorizer
+
+            # Warm up before taking traffic, which also fails fast on a
+            # model that does not fit its vectorizer
+            loaded = LoadedModel(model, vectorizer, model_version, build_scorer(model))
+            try:
+                loaded.scorer.score(vectorizer.transform([transform_text("Free entry to win a prize, reply now")]))
+            except Exception:
+                self._drop_unused_vectorizers()
+                raise
+
+            models = dict(self._models)
+            models[name] = RegisteredModel(name, loaded, vectorizer_key, weight)
+            self._models = models
+            self._drop_unused_vectorizers()
+
+        logger.info(f"Model {name} registered", extra={'model_version': model_version, 'pod_name': self.pod_name})
+        return model_version
+
+    def unregister(self, name: str) -> None:
+        """
+        Remove a model from the registry
+
+        Args:
+            name: Registered model name
+        """
+        with self._lock:
+            models = dict(self._models)
+            del models[name]
+            self._models = models
+            self._drop_unused_vectorizers()
+
+    def _drop_unused_vectorizers(self) -> None:
+        """Forget vectorizers no registered model uses; call with the lock held"""
+        in_use = {entry.vectorizer_key for entry in self._models.values()}
+        for key in list(self._vectorizers):
+            if key not in in_use:
+                del self._vectorizers[key]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._models
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+    @property
+    def routes_by_weight(self) -> bool:
+        """Whether any model takes a share of requests that name no model"""
+        return any(entry.weight > 0 for entry in self._models.values())
+
+    def get_models_info(self) -> List[Dict[str, Any]]:
+        """
+        Describe the registered models
+
+        Returns:
+            List of dictionaries with name, model_version, model_type,
+            weight and the vectorizer key each model shares
+        """
+        return [
+            {
+                "name": entry.name,
+                "model_version": entry.loaded.version,
+                "model_type": type(entry.loaded.model).__name__,
+                "weight": entry.weight,
+                "vectorizer": entry.vectorizer_key[:8]
+            }
+            for entry in self._models.values()
+        ]
+
+    def select(self, model: Optional[str] = None, routing_key: Optional[str] = None) -> str:
+        """
+        Choose the model that serves a request
+
+        Args:
+            model: Model the request asked for, if any
+            routing_key: Key hashed to pick a model by weight, so the same
+                key always reaches the same model (random when None)
+
+        Returns:
+            Name of the selected model
+
+        Raises:
+            KeyError: If the requested model is not registered
+            ModelNotReadyError: If no model can take unrouted traffic
+        """
+        return self._select(self._models, model, routing_key)
+
+    def route(self, model: Optional[str] = None, routing_key: Optional[str] = None) -> Tuple[str, LoadedModel]:
+        """
+        Choose the model that serves a request and return it for scoring
+
+        The returned pair is scored through SpamClassifier.predict_with_version
+        or predict_batch_with_version, so registry traffic gets the same
+        caching, near-duplicate lookups, stage timings and logging as the
+        default model.
+
+        Args:
+            model: Model the request asked for, if any
+            routing_key: Key for sticky weighted routing
+
+        Returns:
+            Tuple of (model name, loaded model and vectorizer pair)
+
+        Raises:
+            KeyError: If the requested model is not registered
+            ModelNotReadyError: If no model can take unrouted traffic
+        """
+        models = self._models
+        name = self._select(models, model, routing_key)
+        return name, models[name].loaded
+
+    def get(self, name: str) -> LoadedModel:
+        """
+        Loaded model and vectorizer pair of a registered model
+
+        Args:
+            name: Registered model name
+
+        Returns:
+            The model's LoadedModel
+
+        Raises:
+            KeyError: If the model is not registered
+        """
+        return self._models[name].loaded
+
+    @staticmethod
+    def _select(models: Dict[str, RegisteredModel], model: Optional[str],
+                routing_key: Optional[str]) -> str:
+        """Pick a model from one snapshot of the registered models"""
+        if model is not None:
+            if model not in models:
+                raise KeyError(model)
+            return model
+
+        weighted = [entry for entry in models.values() if entry.weight > 0]
+        if not weighted:
+            raise ModelNotReadyError("No model in the registry has a traffic weight")
+
+        if routing_key is None:
+            point = random.random()
+        else:
+            digest = hashlib.sha256(routing_key.encode('utf-8')).digest()
+            point = int.from_bytes(digest[:8], 'big') / 2 ** 64
+
+        total = sum(entry.weight for entry in weighted)
+        cumulative = 0.0
+        for entry in weighted:
+            cumulative += entry.weight / total
+            if point < cumulative:
+                return entry.name
+        return weighted[-1].name
+
+    def _score_models(self, transformed_texts: List[str],
+                      names: List[str]) -> Dict[str, Tuple[List[str], List[float], str]]:
+        """
+        Score preprocessed texts with several models, vectorizing once per shared vectorizer
+
+        Args:
+            transformed_texts: Preprocessed texts
+            names: Registered model names
+
+        Returns:
+            Dictionary of name -> (labels, confidences, model_version)
+        """
+        models = self._models
+        entries = [models[name] for name in names]
+
+        vectors: Dict[str, Any] = {}
+        results = {}
+        for entry in entries:
+            vector_input = vectors.get(entry.vectorizer_key)
+            if vector_input is None:
+                vector_input = entry.loaded.vectorizer.transform(transformed_texts)
+                vectors[entry.vectorizer_key] = vector_input
+            predictions, confidences = entry.loaded.scorer.score(vector_input)
+            results[entry.name] = (label_names(predictions), [float(confidence) for confidence in confidences], entry.loaded.version)
+        return results
+
+    def compare(self, text: str, models: Optional[List[str]] = None) -> Tuple[str, Dict[str, Tuple[str, float, str]]]:
+        """
+        Score one text with several models, sharing preprocessing and vectorization
+
+        Args:
+            text: Input text to classify
+            models: Registered model names (defaults to every model)
+
+        Returns:
+            Tuple of (request_id, dictionary of name -> (prediction,
+            confidence, model_version))
+
+        Raises:
+            KeyError: If a requested model is not registered
+        """
+        registered = self._models
+        names = list(registered) if models is None else list(models)
+        for name in names:
+            if name not in registered:
+                raise KeyError(name)
+        if not names:
+            raise ModelNotReadyError("No models registered")
+
+        request_id = str(uuid.uuid4())
+        scored = self._score_models([transform_text(text)], names)
+        results = {
+            name: (labels[0], confidences[0], model_version)
+            for name, (labels, confidences, model_version) in scored.items()
+        }
+        logger.info(
+            f"Compared {len(names)} models",
+            extra={'request_id': request_id, 'pod_name': self.pod_name}
+        )
+        return request_id, results
@@ -0,0 +1,221 @@
+from typing import Any, Iterable, List, Optional, Tuple
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.svm import SVC, LinearSVC
+
+# SGDClassifier losses whose predict_proba is the logistic of the decision value
+_LOGISTIC_LOSSES = ('log_loss',)
+
+
+def label_names(predictions: Iterable[Any]) -> List[str]:
+    """
+    Map predicted classes to the labels the API reports
+
+    Args:
+        predictions: Predicted classes, 1 for spam
+
+    Returns:
+        'spam' or 'not_spam' for every prediction
+    """
+    return ["spam" if prediction == 1 else "not_spam" for prediction in predictions]
+
+
+def _sigmoid(values: np.ndarray) -> np.ndarray:
+    """Numerically stable logistic function"""
+    return np.exp(-np.logaddexp(0, -values))
+
+
+def _libsvm_binary_probability(decision: np.ndarray, a: float, b: float) -> np.ndarray:
+    """
+    Probability of the first class, as libsvm computes it for a binary SVC
+
+    libsvm applies Platt scaling to its decision value, clips the result to
+    [1e-7, 1 - 1e-7] and then runs its iterative pairwise-coupling solver,
+    which stops at a tolerance rather than at the exact Platt probability.
+    The same iteration is replayed here on all rows at once.
+
+    Args:
+        decision: sklearn decision values, the negation of libsvm's
+        a: Platt scale (probA_)
+        b: Platt offset (probB_)
+
+    Returns:
+        Probability of classes_[0] for every row
+    """
+    f_apb = -decision * a + b
+    r01 = np.clip(_sigmoid(-f_apb), 1e-7, 1 - 1e-7)
+    r10 = 1 - r01
+
+    q = np.array([[r10 * r10, -r10 * r01], [-r10 * r01, r01 * r01]])
+    p = np.full((2, len(decision)), 0.5)
+    active = np.ones(len(decision), dtype=bool)
+    for _ in range(100):
+        qp = np.einsum('ijn,jn->in', q, p)
+        pqp = (p * qp).sum(axis=0)
+        active &= np.abs(qp - pqp).max(axis=0) >= 0.0025
+        if not active.any():
+            break
+        for t in range(2):
+            diff = np.where(active, (-qp[t] + pqp) / q[t, t], 0.0)
+            p[t] += diff
+            pqp = (pqp + diff * (diff * q[t, t] + 2 * qp[t])) / (1 + diff) / (1 + diff)
+            qp = (qp + diff * q[t]) / (1 + diff)
+            p /= 1 + diff
+    return p[0]
+
+
+class ModelScorer:
+    """
+    Derive labels and confidences from a single call into a fitted model
+
+    Used for models without a specialised scorer. Labels are the class with
+    the highest predicted probability, so predict and predict_proba are
+    never both called. A probability-calibrated binary SVC is the exception:
+    its Platt probabilities can disagree with predict, which thresholds the
+    decision value, so its labels come from decision_function and its
+    confidence is libsvm's probability of that same decision value.
+    """
+
+    def __init__(self, model: Any):
+        """
+        Initialize scorer
+
+        Args:
+            model: Fitted sklearn classifier
+        """
+        self.model = model
+        self.platt = None
+        if isinstance(model, SVC) and model.probability and len(model.classes_) == 2:
+            self.platt = (float(model.probA_[0]), float(model.probB_[0]))
+
+    def score(self, vector_input: csr_matrix) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score vectorized texts
+
+        Args:
+            vector_input: Sparse matrix of shape (n_texts, n_features)
+
+        Returns:
+            Tuple of (predicted classes, confidences)
+        """
+        model = self.model
+        if self.platt is not None:
+            decision = model.decision_function(vector_input)
+            first = _libsvm_binary_probability(decision, *self.platt)
+            return model.classes_[(decision > 0).astype(int)], np.maximum(first, 1 - first)
+        if hasattr(model, 'predict_proba'):
+            proba = model.predict_proba(vector_input)
+            return model.classes_[proba.argmax(axis=1)], proba.max(axis=1)
+        if hasattr(model, 'decision_function'):
+            decision = model.decision_function(vector_input)
+            return model.classes_[(decision > 0).astype(int)], np.abs(decision)
+        predictions = model.predict(vector_input)
+        return predictions, np.ones(len(predictions))
+
+
+class LinearScorer:
+    """
+    Score binary linear models with a direct sparse dot product
+
+    The model is reduced to one weight vector and an intercept. The
+    decision value of a text is the dot product of its non-zero features
+    with the weights, computed straight from the CSR arrays without
+    sklearn's per-call input validation. Confidence is derived from the
+    decision value with the model's own probability link.
+    """
+
+    def __init__(self, weights: np.ndarray, intercept: float, classes: np.ndarray,
+                 link: str = 'logistic', platt: Optional[Tuple[float, float]] = None):
+        """
+        Initialize scorer
+
+        Args:
+            weights: Weight per feature; positive values favour classes[1]
+            intercept: Decision value of an empty text
+            classes: The model's two classes
+            link: How confidence is derived from the decision value:
+                'logistic', 'platt' or 'margin' (absolute decision value)
+            platt: (A, B) Platt scaling parameters for the 'platt' link
+        """
+        self.weights = np.ascontiguousarray(weights, dtype=np.float64)
+        self.intercept = float(intercept)
+        self.classes = np.asarray(classes)
+        self.link = link
+        self.platt = platt
+
+    def decision_function(self, vector_input: csr_matrix) -> np.ndarray:
+        """Decision value of every row of a CSR matrix"""
+        n_rows = vector_input.shape[0]
+        products = vector_input.data * self.weights[vector_input.indices]
+        if n_rows == 1:
+            return np.array([products.sum() + self.intercept])
+        row_ids = np.repeat(np.arange(n_rows), np.diff(vector_input.indptr))
+        return np.bincount(row_ids, weights=products, minlength=n_rows) + self.intercept
+
+    def score(self, vector_input: csr_matrix) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score vectorized texts
+
+        Args:
+            vector_input: Sparse matrix of shape (n_texts, n_features)
+
+        Returns:
+            Tuple of (predicted classes, confidences)
+        """
+        decision = self.decision_function(vector_input)
+        predictions = self.classes[(decision > 0).astype(int)]
+
+        if self.link == 'logistic':
+            confidences = _sigmoid(np.abs(decision))
+        elif self.link == 'platt':
+            first = _libsvm_binary_probability(decision, *self.platt)
+            confidences = np.maximum(first, 1 - first)
+        else:
+            confidences = np.abs(decision)
+        return predictions, confidences
+
+
+def build_scorer(model: Any) -> Any:
+    """
+    Pick the fastest exact scorer for a fitted model
+
+    Binary MultinomialNB, logistic SGDClassifier, LogisticRegression and
+    linear-kernel SVC/LinearSVC models are scored by LinearScorer; any
+    other model falls back to ModelScorer.
+
+    Args:
+        model: Fitted sklearn classifier
+
+    Returns:
+        Object with a score(vector_input) -> (predictions, confidences) method
+    """
+    classes = getattr(model, 'classes_', None)
+    if classes is None or len(classes) != 2:
+        return ModelScorer(model)
+
+    if isinstance(model, MultinomialNB):
+        # The log-odds of a binary multinomial NB is linear in the counts
+        log_prob = np.asarray(model.feature_log_prob_)
+        log_prior = np.asarray(model.class_log_prior_)
+        return LinearScorer(log_prob[1] - log_prob[0], log_prior[1] - log_prior[0], classes)
+
+    if isinstance(model, SVC):
+        if model.kernel != 'linear':
+            return ModelScorer(model)
+        weights = model.coef_.toarray()[0] if hasattr(model.coef_, 'toarray') else model.coef_[0]
+        if model.probability:
+            platt = (float(model.probA_[0]), float(model.probB_[0]))
+            return LinearScorer(weights, model.intercept_[0], classes, link='platt', platt=platt)
+        return LinearScorer(weights, model.intercept_[0], classes, link='margin')
+
+    if isinstance(model, LogisticRegression) and model.multi_class == 'multinomial':
+        return ModelScorer(model)
+
+    if isinstance(model, (LogisticRegression, SGDClassifier, LinearSVC)):
+        logistic = isinstance(model, LogisticRegression) or getattr(model, 'loss', None) in _LOGISTIC_LOSSES
+        return LinearScorer(model.coef_[0], model.intercept_[0], classes,
+                            link='logistic' if logistic else 'margin')
+
+    return ModelScorer(model)
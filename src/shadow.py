@@ -0,0 +1,176 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+from src.artifacts import load_artifact
+from src.scoring import build_scorer, label_names
+from src.utils.logger import setup_logger
+
+logger = setup_logger("spam_classifier.shadow")
+
+
+class ShadowEvaluator:
+    """
+    Score live traffic with a candidate model off the request path
+
+    Registered as a SpamClassifier score listener, it receives the input
+    the primary model already vectorized along with the primary's labels.
+    The candidate scores that input on a bounded thread pool, and agreement
+    and latency are aggregated in memory. When max_pending inputs are
+    already waiting, new ones are dropped and counted instead of queued, so
+    a slow candidate never holds up primary traffic.
+    """
+
+    def __init__(self, model: Any, model_version: str = "shadow",
+                 max_workers: int = 1, max_pending: int = 100,
+                 on_result: Optional[Callable[[int, int, float], None]] = None):
+        """
+        Initialize shadow evaluator
+
+        Args:
+            model: Fitted candidate classifier using the primary's vectorizer
+            model_version: Version reported for the candidate
+            max_workers: Threads scoring shadow inputs
+            max_pending: Inputs queued or in flight before new ones are dropped
+            on_result: Optional callback receiving (agreements,
+                disagreements, seconds) for every scored input
+        """
+        self.model = model
+        self.model_version = model_version
+        self.scorer = build_scorer(model)
+        self.max_pending = max(max_pending, 1)
+        self.on_result = on_result
+        self._executor = ThreadPoolExecutor(max_workers=max(max_workers, 1), thread_name_prefix="shadow")
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._dropped = 0
+        self._errors = 0
+        self._scored = 0
+        self._agreements = 0
+        self._disagreements = 0
+        self._seconds = 0.0
+        self._max_seconds = 0.0
+
+    @classmethod
+    def from_path(cls, model_path: str, **kwargs) -> "ShadowEvaluator":
+        """
+        Load a candidate model artifact and build an evaluator for it
+
+        Args:
+            model_path: Path to the candidate model (.joblib or pickle)
+            kwargs: Passed on to ShadowEvaluator
+
+        Returns:
+            Shadow evaluator for the loaded model
+        """
+        logger.info(f"Loading shadow model from {model_path}")
+        return cls(load_artifact(model_path), **kwargs)
+
+    def check_features(self, vectorizer: Any) -> None:
+        """
+        Check that the candidate takes the features the primary vectorizer produces
+
+        Args:
+            vectorizer: Vectorizer of the primary model
+
+        Raises:
+            ValueError: If the candidate was fitted on a different number of features
+        """
+        expected = getattr(self.model, 'n_features_in_', None)
+        produced = vectorizer.transform([""]).shape[1]
+        if expected is not None and expected != produced:
+            raise ValueError(
+                f"Shadow model {self.model_version} expects {expected} features, "
+                f"the primary vectorizer produces {produced}"
+            )
+
+    def submit(self, vector_input: Any, labels: List[str], confidences: List[float],
+               model_version: str) -> bool:
+        """
+        Queue an input the primary model scored for candidate scoring
+
+        Matches the SpamClassifier score listener signature.
+
+        Args:
+            vector_input: Sparse matrix the primary model scored
+            labels: Primary model labels, one per row
+            confidences: Primary model confidences (unused)
+            model_version: Primary model version (unused)
+
+        Returns:
+            True if queued, False if dropped because the pool is saturated
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._dropped += 1
+            return False
+
+        with self._lock:
+            self._submitted += 1
+        try:
+            self._executor.submit(self._evaluate, vector_input, labels)
+        except RuntimeError:
+            # Executor already shut down
+            self._slots.release()
+            return False
+        return True
+
+    def _evaluate(self, vector_input: Any, labels: List[str]) -> None:
+        """Score one input with the candidate and record how it compares"""
+        try:
+            start_time = time.perf_counter()
+            predictions, _ = self.scorer.score(vector_input)
+            seconds = time.perf_counter() - start_time
+
+            agreements = sum(
+                shadow_label == label for shadow_label, label in zip(label_names(predictions), labels)
+            )
+            disagreements = len(labels) - agreements
+            with self._lock:
+                self._scored += 1
+                self._agreements += agreements
+                self._disagreements += disagreements
+                self._seconds += seconds
+                self._max_seconds = max(self._max_seconds, seconds)
+            if self.on_result is not None:
+                self.on_result(agreements, disagreements, seconds)
+        except Exception:
+            with self._lock:
+                self._errors += 1
+            logger.error("Shadow scoring failed", exc_info=True)
+        finally:
+            self._slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Aggregated shadow statistics
+
+        Returns:
+            Dictionary with model_version, submitted, dropped, errors,
+            scored, agreements, disagreements, agreement_rate, mean_latency_ms and
+            max_latency_ms
+        """
+        with self._lock:
+            compared = self._agreements + self._disagreements
+            return {
+                "model_version": self.model_version,
+                "submitted": self._submitted,
+                "dropped": self._dropped,
+                "errors": self._errors,
+                "scored": self._scored,
+                "agreements": self._agreements,
+                "disagreements": self._disagreements,
+                "agreement_rate": self._agreements / compared if compared else 0.0,
+                "mean_latency_ms": self._seconds / self._scored * 1000 if self._scored else 0.0,
+                "max_latency_ms": self._max_seconds * 1000
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop the worker pool
+
+        Args:
+            wait: Wait for queued inputs to be scored
+        """
+        self._executor.shutdown(wait=wait)
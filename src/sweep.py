@@ -0,0 +1,285 @@
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
+from sklearn.model_selection import train_test_split
+from src.corpus_cache import DEFAULT_CACHE_DIR, load_or_transform_corpus
+from src.inference_cost import benchmark_inference, over_latency_budget
+from src.train import build_model, configure_mlflow, save_artifacts
+from src.utils.logger import setup_logger
+
+logger = setup_logger("spam_classifier.sweep")
+
+ALGORITHMS = ('naive_bayes', 'random_forest', 'svm', 'sgd')
+METRICS = ('accuracy', 'precision', 'recall', 'f1_score')
+
+# Vectorized train/test splits shared with worker processes, keyed by
+# (max_features, ngram_range)
+_features: Dict[Tuple[int, Tuple[int, int]], Tuple[Any, Any]] = {}
+_labels: Tuple[Any, Any] = (None, None)
+
+
+def parse_ngram_range(value: str) -> Tuple[int, int]:
+    """
+    Parse an n-gram range written as 'min-max'
+
+    Args:
+        value: Range such as '1-2'
+
+    Returns:
+        Tuple of (min_n, max_n)
+    """
+    low, high = value.split('-')
+    return int(low), int(high)
+
+
+def build_grid(algorithms: Sequence[str], max_features: Sequence[int],
+               ngram_ranges: Sequence[Tuple[int, int]]) -> List[Dict[str, Any]]:
+    """
+    Expand the sweep grid into one trial per configuration
+
+    Args:
+        algorithms: Algorithm names
+        max_features: TF-IDF vocabulary sizes
+        ngram_ranges: TF-IDF n-gram ranges
+
+    Returns:
+        List of trial dictionaries with algorithm, max_features and ngram_range
+    """
+    for algorithm in algorithms:
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+    return [
+        {"algorithm": algorithm, "max_features": features, "ngram_range": tuple(ngram_range)}
+        for features, ngram_range, algorithm in itertools.product(max_features, ngram_ranges, algorithms)
+    ]
+
+
+def _init_worker(features: Dict[Tuple[int, Tuple[int, int]], Tuple[Any, Any]], labels: Tuple[Any, Any]) -> None:
+    """Receive the vectorized splits once per worker process instead of once per trial"""
+    global _features, _labels
+    _features = features
+    _labels = labels
+
+
+def _run_trial(trial: Dict[str, Any]) -> Dict[str, Any]:
+    """Fit and evaluate one trial on the shared vectorized splits"""
+    X_train_vec, X_test_vec = _features[(trial["max_features"], trial["ngram_range"])]
+    y_train, y_test = _labels
+
+    model, model_params = build_model(trial["algorithm"])
+    start_time = time.perf_counter()
+    model.fit(X_train_vec, y_train)
+    fit_seconds = time.perf_counter() - start_time
+    y_pred = model.predict(X_test_vec)
+
+    return {
+        **trial,
+        "model": model,
+        "model_params": model_params,
+        "fit_seconds": fit_seconds,
+        "accuracy": float(accuracy_score(y_test, y_pred)),
+        "precision": float(precision_score(y_test, y_pred, zero_division=0)),
+        "recall": float(recall_score(y_test, y_pred, zero_division=0)),
+        "f1_score": float(f1_score(y_test, y_pred, zero_division=0))
+    }
+
+
+def run_trials(trials: List[Dict[str, Any]], features: Dict[Tuple[int, Tuple[int, int]], Tuple[Any, Any]],
+               labels: Tuple[Any, Any], workers: Optional[int] = 1) -> Iterator[Dict[str, Any]]:
+    """
+    Fit and evaluate trials, on a process pool when more than one worker is used
+
+    Args:
+        trials: Trials from build_grid
+        features: (X_train_vec, X_test_vec) per (max_features, ngram_range)
+        labels: Tuple of (y_train, y_test)
+        workers: Worker processes (1 runs in this process, 0 or None uses every CPU)
+
+    Returns:
+        Iterator over trial results in completion order
+    """
+    if not workers:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(trials))
+
+    if workers <= 1:
+        _init_worker(features, labels)
+        for trial in trials:
+            yield _run_trial(trial)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(features, labels)) as executor:
+        futures = [executor.submit(_run_trial, trial) for trial in trials]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def tradeoff_score(result: Dict[str, Any], metric: str = 'f1_score', latency_weight: float = 0.0) -> float:
+    """
+    Score a trial by its metric less a penalty per millisecond of latency
+
+    Args:
+        result: Trial result with the metric and latency_ms
+        metric: Quality metric to maximise
+        latency_weight: Metric units given up per millisecond of latency
+
+    Returns:
+        Tradeoff score, higher is better
+    """
+    return result[metric] - latency_weight * result["latency_ms"]
+
+
+def select_best(results: List[Dict[str, Any]], metric: str = 'f1_score', latency_weight: float = 0.0,
+                latency_budget_ms: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Pick the trial with the best metric-versus-latency tradeoff
+
+    Args:
+        results: Trial results with metrics, latency_ms and single_p95_ms
+        metric: Quality metric to maximise
+        latency_weight: Metric units given up per millisecond of latency
+        latency_budget_ms: Discard trials whose p95 single-message latency
+            exceeds this, if set
+
+    Returns:
+        Best trial result
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric: {metric}")
+    candidates = [result for result in results if not over_latency_budget(result, latency_budget_ms)]
+    if not candidates:
+        raise ValueError(f"No trial is within the latency budget of {latency_budget_ms}ms")
+    return max(candidates, key=lambda result: tradeoff_score(result, metric, latency_weight))
+
+
+def trial_name(trial: Dict[str, Any]) -> str:
+    """Readable run name for a trial"""
+    low, high = trial["ngram_range"]
+    return f"{trial['algorithm']}-{trial['max_features']}-ngram{low}{high}"
+
+
+def run_sweep(algorithms: Sequence[str] = ALGORITHMS, max_features: Sequence[int] = (1000, 3000, 5000),
+              ngram_ranges: Sequence[Tuple[int, int]] = ((1, 1), (1, 2)), metric: str = 'f1_score',
+              latency_weight: float = 0.0, latency_budget_ms: Optional[float] = None, workers: int = 1,
+              preprocess_workers: int = 1, corpus_cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+              data_path: str = 'data/spam.csv', output_dir: str = 'models',
+              latency_samples: int = 200) -> Dict[str, Any]:
+    """
+    Train every algorithm x max_features x ngram_range combination and keep the best
+
+    The corpus is preprocessed once, and each vectorizer setting is fitted
+    once and shared by every algorithm using it. Trials are fitted
+    concurrently on a process pool; each is logged as a nested MLflow run
+    under one sweep run. Inference cost is benchmarked in this process
+    once all fits are done, one trial at a time, so trials do not slow
+    each other's measurement; latency_ms is the median single-message
+    latency.
+    The best trial's model and vectorizer are saved like train_model's.
+
+    Args:
+        algorithms: Algorithm names
+        max_features: TF-IDF vocabulary sizes
+        ngram_ranges: TF-IDF n-gram ranges
+        metric: Quality metric to maximise ('accuracy', 'precision',
+            'recall' or 'f1_score')
+        latency_weight: Metric units given up per millisecond of latency
+        latency_budget_ms: Discard trials whose p95 single-message latency
+            exceeds this, if set
+        workers: Worker processes fitting trials (1 runs serially, 0 uses every CPU)
+        preprocess_workers: Worker processes for text preprocessing
+        corpus_cache_dir: Directory caching the preprocessed corpus across
+            runs, None to always re-preprocess
+        data_path: Path to the CSV dataset
+        output_dir: Directory the best model, vectorizer and sweep_results.json are written to
+        latency_samples: Test texts timed one at a time per trial
+
+    Returns:
+        Best trial result, without the fitted model
+    """
+    import mlflow
+
+    trials = build_grid(algorithms, max_features, ngram_ranges)
+    configure_mlflow()
+    logger.info(f"Starting sweep over {len(trials)} trials with {workers} worker(s)")
+
+    df = pd.read_csv(data_path, encoding='latin-1')[['v1', 'v2']]
+    df.columns = ['label', 'text']
+    transformed = load_or_transform_corpus(
+        df['text'], data_path, cache_dir=corpus_cache_dir, workers=preprocess_workers
+    )
+    X_train, X_test, y_train, y_test = train_test_split(
+        pd.Series(transformed),
+        df['label'].map({'ham': 0, 'spam': 1}),
+        test_size=0.2,
+        random_state=42,
+        stratify=df['label']
+    )
+
+    # Fit each vectorizer setting once for every algorithm that uses it
+    vectorizers = {}
+    features = {}
+    for key in sorted({(trial["max_features"], trial["ngram_range"]) for trial in trials}):
+        vectorizer = TfidfVectorizer(max_features=key[0], ngram_range=key[1])
+        features[key] = (vectorizer.fit_transform(X_train), vectorizer.transform(X_test))
+        vectorizers[key] = vectorizer
+
+    results = []
+    with mlflow.start_run(run_name="sweep"):
+        mlflow.log_params({
+            "sweep_algorithms": ",".join(algorithms),
+            "sweep_max_features": ",".join(str(value) for value in max_features),
+            "sweep_ngram_ranges": ",".join(f"{low}-{high}" for low, high in ngram_ranges),
+            "sweep_metric": metric,
+            "latency_weight": latency_weight,
+            "latency_budget_ms": latency_budget_ms,
+            "workers": workers
+        })
+
+        # Benchmark only after every fit has finished, so pool workers do
+        # not compete with the latency measurements for CPU
+        for result in list(run_trials(trials, features, (y_train, y_test), workers)):
+            vectorizer = vectorizers[(result["max_features"], result["ngram_range"])]
+            result.update(benchmark_inference(result["model"], vectorizer, X_test, single_samples=latency_samples))
+            result["latency_ms"] = result["single_p50_ms"]
+            results.append(result)
+            logger.info(
+                f"Trial {trial_name(result)}: {metric}={result[metric]:.4f}, "
+                f"latency={result['latency_ms']:.3f}ms"
+            )
+
+            with mlflow.start_run(run_name=trial_name(result), nested=True):
+                mlflow.log_params({
+                    "algorithm": result["algorithm"],
+                    "max_features": result["max_features"],
+                    "ngram_range": str(result["ngram_range"]),
+                    **result["model_params"]
+                })
+                mlflow.log_metrics({
+                    **{name: value for name, value in result.items()
+                       if isinstance(value, (int, float)) and name not in ("max_features",)},
+                    "tradeoff_score": tradeoff_score(result, metric, latency_weight)
+                })
+
+        best = select_best(results, metric, latency_weight, latency_budget_ms)
+        logger.info(f"Best trial: {trial_name(best)}")
+        save_artifacts(best["model"], vectorizers[(best["max_features"], best["ngram_range"])], output_dir)
+
+        summary = [
+            {key: value for key, value in result.items() if key != "model"}
+            for result in sorted(results, key=lambda result: -tradeoff_score(result, metric, latency_weight))
+        ]
+        results_path = os.path.join(output_dir, 'sweep_results.json')
+        with open(results_path, 'w') as f:
+            json.dump({"best": trial_name(best), "trials": summary}, f, indent=2)
+        mlflow.log_artifact(results_path)
+        mlflow.log_param("best_trial", trial_name(best))
+        mlflow.log_metrics({f"best_{name}": best[name] for name in METRICS + ("latency_ms",)})
+
+    return {key: value for key, value in best.items() if key != "model"}
@@ -1,27 +1,41 @@
 # comment
 
+import itertools
+import json
 import os
-import mlflow
-import mlflow.sklearn
+import shutil
+import sys
+import tempfile
+import time
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timezone
 import pandas as pd
 import pickle
 from sklearn.model_selection import train_test_split
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import TfidfVectorizer, HashingVectorizer
+from sklearn.linear_model import SGDClassifier
 from sklearn.naive_bayes import MultinomialNB
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.svm import SVC
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, confusion_matrix
-from src.preprocess import transform_text
+from src.preprocess import transform_corpus
+from src.corpus_cache import DEFAULT_CACHE_DIR, load_or_transform_corpus
+from src.artifacts import export_artifacts
+from src.utils.files import detect_format, file_fingerprint
+from src.inference_cost import LatencyBudgetExceededError, benchmark_inference, over_latency_budget
 from src.utils.logger import setup_logger
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 
 logger = setup_logger("spam_classifier.train")
 
 
 def plot_confusion_matrix(cm, filename="confusion_matrix.png"):
     """Plot and save confusion matrix"""
+    # Plotting libraries are only needed here, keep them off the import path
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
     plt.figure(figsize=(8, 6))
     sns.heatmap(cm, annot=True, fmt='d', cmap='Blues', 
                 xticklabels=['Not Spam', 'Spam'],
@@ -34,19 +48,123 @@ def plot_confusion_matrix(cm, filename="confusion_matrix.png"):
     return filename
 
 
-def train_model(algorithm='naive_bayes', max_features=3000, ngram_range=(1, 2)):
+@contextmanager
+def stage_timer(stage, timings):
+    """Record the wall-clock seconds spent in a training stage"""
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = time.perf_counter() - start_time
+        logger.info(f"Stage {stage} took {timings[stage]:.3f}s")
+
+
+# Files written by save_artifacts
+ARTIFACT_FILES = ('model.pkl', 'vectorizer.pkl', 'model.joblib', 'vectorizer.joblib')
+
+
+def save_artifacts(model, vectorizer, output_dir='models'):
     """
-    Train spam classifier model with MLflow tracking
-    
+    Write a model and vectorizer pair as pickles and memory-mappable joblib files
+
     Args:
-        algorithm: Which algorithm to use ('naive_bayes', 'random_forest', 'svm')
-        max_features: Maximum features for TF-IDF vectorizer
-        ngram_range: N-gram range for TF-IDF
+        model: Fitted classifier
+        vectorizer: Fitted vectorizer
+        output_dir: Directory receiving the files in ARTIFACT_FILES
     """
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, 'model.pkl'), 'wb') as f:
+        pickle.dump(model, f)
+    with open(os.path.join(output_dir, 'vectorizer.pkl'), 'wb') as f:
+        pickle.dump(vectorizer, f)
+    export_artifacts(model, vectorizer, output_dir)
+
+
+def build_model(algorithm):
+    """
+    Create an unfitted classifier for an algorithm name
+
+    Args:
+        algorithm: 'naive_bayes', 'random_forest', 'svm' or 'sgd'
+
+    Returns:
+        Tuple of (classifier, parameters worth logging to MLflow)
+    """
+    if algorithm == 'naive_bayes':
+        return MultinomialNB(), {}
+    if algorithm == 'random_forest':
+        return RandomForestClassifier(n_estimators=100, random_state=42), {"n_estimators": 100}
+    if algorithm == 'svm':
+        return SVC(kernel='linear', probability=True, random_state=42), {"kernel": "linear"}
+    if algorithm == 'sgd':
+        return SGDClassifier(loss='log_loss', random_state=42), {"loss": "log_loss"}
+    raise ValueError(f"Unknown algorithm: {algorithm}")
+
+
+def build_hashing_vectorizer(algorithm, n_features=2 ** 18, ngram_range=(1, 2)):
+    """
+    Create a stateless hashing vectorizer, which has no vocabulary to fit or store
+
+    Args:
+        algorithm: Algorithm the features are for
+        n_features: Number of hashed features
+        ngram_range: N-gram range
+
+    Returns:
+        HashingVectorizer
+    """
+    # Non-negative features keep the hashed counts valid for MultinomialNB,
+    # which also works best on raw counts rather than normalized rows
+    return HashingVectorizer(n_features=n_features, ngram_range=ngram_range, alternate_sign=False,
+                             norm=None if algorithm == 'naive_bayes' else 'l2')
+
+
+def write_training_stats(stats, path='training_stats.json'):
+    """Write training statistics to JSON and log the file to the active MLflow run"""
+    import mlflow
+
+    with open(path, 'w') as f:
+        json.dump(stats, f, indent=2)
+    mlflow.log_artifact(path)
+
+
+def log_inference_cost(cost, latency_budget_ms):
+    """
+    Log a model's serving cost to MLflow and apply the latency budget
+
+    Args:
+        cost: Result of benchmark_inference
+        latency_budget_ms: Maximum p95 single-message latency, None for no budget
+
+    Returns:
+        True if the model exceeds the budget
+    """
+    import mlflow
+
+    logger.info(
+        f"Inference cost - p50: {cost['single_p50_ms']:.3f}ms, p95: {cost['single_p95_ms']:.3f}ms, "
+        f"batch: {cost['batch_ms_per_message']:.4f}ms/message, model: {cost['model_memory_bytes']} bytes in memory"
+    )
+    mlflow.log_metrics(cost)
+    rejected = over_latency_budget(cost, latency_budget_ms)
+    if latency_budget_ms is not None:
+        mlflow.log_param("latency_budget_ms", latency_budget_ms)
+    if rejected:
+        mlflow.set_tag("rejected", "latency_budget")
+        logger.warning(
+            f"Model rejected: p95 latency {cost['single_p95_ms']:.3f}ms exceeds the {latency_budget_ms}ms budget"
+        )
+    return rejected
+
+
+def configure_mlflow():
+    """Point MLflow at the tracking server and make sure the experiment exists"""
+    import mlflow
+
     # Set MLflow tracking URI
     mlflow_uri = os.getenv("MLFLOW_TRACKING_URI", "http://localhost:5000")
     mlflow.set_tracking_uri(mlflow_uri)
-    
+
     # Create or get experiment with proper the artifact location
     experiment_name = "spam-classifier-training"
     try:
@@ -61,20 +179,62 @@ def train_model(algorithm='naive_bayes', max_features=3000, ngram_range=(1, 2)):
     except Exception as e:
         logger.warning(f"Error managing experiment: {e}, using set_experiment instead")
         mlflow.set_experiment(experiment_name)
+
+
+def train_model(algorithm='naive_bayes', max_features=3000, ngram_range=(1, 2),
+                preprocess_workers=1, corpus_cache_dir=DEFAULT_CACHE_DIR, output_dir='models',
+                latency_budget_ms=None, vectorizer_type='tfidf', n_features=2 ** 18):
+    """
+    Train spam classifier model with MLflow tracking
+    
+    Args:
+        algorithm: Which algorithm to use ('naive_bayes', 'random_forest', 'svm', 'sgd')
+        max_features: Maximum features for TF-IDF vectorizer
+        ngram_range: N-gram range for TF-IDF
+        preprocess_workers: Worker processes for text preprocessing
+            (1 runs serially, 0 uses every CPU)
+        corpus_cache_dir: Directory caching the preprocessed corpus across
+            runs, None to always re-preprocess
+        output_dir: Directory the model and vectorizer are written to
+        latency_budget_ms: Reject the model, without saving it, if its p95
+            single-message latency exceeds this many milliseconds
+        vectorizer_type: 'tfidf' for a fitted TF-IDF vocabulary, or
+            'hashing' for the hashing trick with no vocabulary at all
+        n_features: Number of hashed features when vectorizer_type is 'hashing'
+
+    Raises:
+        LatencyBudgetExceededError: If the model exceeds the latency budget
+    """
+    import mlflow
+    import mlflow.sklearn
+
+    if vectorizer_type not in ('tfidf', 'hashing'):
+        raise ValueError(f"Unknown vectorizer type: {vectorizer_type}")
+
+    configure_mlflow()
     
     logger.info(f"Starting training with algorithm={algorithm}")
     
+    timings = {}
+    
     with mlflow.start_run():
         # Log parameters
         mlflow.log_param("algorithm", algorithm)
-        mlflow.log_param("max_features", max_features)
+        mlflow.log_param("vectorizer", vectorizer_type)
+        if vectorizer_type == 'hashing':
+            mlflow.log_param("n_features", n_features)
+        else:
+            mlflow.log_param("max_features", max_features)
         mlflow.log_param("ngram_range", str(ngram_range))
+        mlflow.log_param("preprocess_workers", preprocess_workers)
         
         # Load data
         logger.info("Loading dataset")
-        df = pd.read_csv('data/spam.csv', encoding='latin-1')
-        df = df[['v1', 'v2']]
-        df.columns = ['label', 'text']
+        data_path = 'data/spam.csv'
+        with stage_timer("load", timings):
+            df = pd.read_csv(data_path, encoding='latin-1')
+            df = df[['v1', 'v2']]
+            df.columns = ['label', 'text']
         
         # Log dataset stats
         mlflow.log_param("total_samples", len(df))
@@ -82,8 +242,11 @@ def train_model(algorithm='naive_bayes', max_features=3000, ngram_range=(1, 2)):
         mlflow.log_param("ham_count", (df['label'] == 'ham').sum())
         
         # Preprocess
-        logger.info("Preprocessing text")
-        df['transformed_text'] = df['text'].apply(transform_text)
+        logger.info(f"Preprocessing text with {preprocess_workers} worker(s)")
+        with stage_timer("preprocess", timings):
+            df['transformed_text'] = load_or_transform_corpus(
+                df['text'], data_path, cache_dir=corpus_cache_dir, workers=preprocess_workers
+            )
         
         # Encode labels
         df['label_encoded'] = df['label'].map({'ham': 0, 'spam': 1})
@@ -101,28 +264,27 @@ def train_model(algorithm='naive_bayes', max_features=3000, ngram_range=(1, 2)):
         mlflow.log_param("test_size", len(X_test))
         
         # Vectorize
-        logger.info("Creating TF-IDF vectorizer")
-        vectorizer = TfidfVectorizer(max_features=max_features, ngram_range=ngram_range)
-        X_train_vec = vectorizer.fit_transform(X_train)
-        X_test_vec = vectorizer.transform(X_test)
+        if vectorizer_type == 'hashing':
+            logger.info(f"Creating hashing vectorizer with {n_features} features")
+            vectorizer = build_hashing_vectorizer(algorithm, n_features, ngram_range)
+        else:
+            logger.info("Creating TF-IDF vectorizer")
+            vectorizer = TfidfVectorizer(max_features=max_features, ngram_range=ngram_range)
+        with stage_timer("vectorize", timings):
+            X_train_vec = vectorizer.fit_transform(X_train)
+            X_test_vec = vectorizer.transform(X_test)
         
         # Train model
         logger.info(f"Training {algorithm} model")
-        if algorithm == 'naive_bayes':
-            model = MultinomialNB()
-        elif algorithm == 'random_forest':
-            model = RandomForestClassifier(n_estimators=100, random_state=42)
-            mlflow.log_param("n_estimators", 100)
-        elif algorithm == 'svm':
-            model = SVC(kernel='linear', probability=True, random_state=42)
-            mlflow.log_param("kernel", "linear")
-        else:
-            raise ValueError(f"Unknown algorithm: {algorithm}")
+        model, model_params = build_model(algorithm)
+        mlflow.log_params(model_params)
         
-        model.fit(X_train_vec, y_train)
+        with stage_timer("fit", timings):
+            model.fit(X_train_vec, y_train)
         
         # Predict
-        y_pred = model.predict(X_test_vec)
+        with stage_timer("evaluate", timings):
+            y_pred = model.predict(X_test_vec)
         
         # Calculate metrics
         accuracy = accuracy_score(y_test, y_pred)
@@ -142,17 +304,11 @@ def train_model(algorithm='naive_bayes', max_features=3000, ngram_range=(1, 2)):
         cm_plot = plot_confusion_matrix(cm)
         mlflow.log_artifact(cm_plot)
         
-        # Save model and vectorizer
-        logger.info("Saving model and vectorizer")
-        with open('models/model.pkl', 'wb') as f:
-            pickle.dump(model, f)
-        with open('models/vectorizer.pkl', 'wb') as f:
-            pickle.dump(vectorizer, f)
-        
-        # Log model to MLflow
-        mlflow.sklearn.log_model(model, "model")
-        mlflow.log_artifact("models/model.pkl")
-        mlflow.log_artifact("models/vectorizer.pkl")
+        # Benchmark what the model costs to serve
+        logger.info("Benchmarking inference latency and model size")
+        with stage_timer("benchmark", timings):
+            cost = benchmark_inference(model, vectorizer, X_test)
+        rejected = log_inference_cost(cost, latency_budget_ms)
         
         # Log dataset statistics
         stats = {
@@ -162,29 +318,504 @@ def train_model(algorithm='naive_bayes', max_features=3000, ngram_range=(1, 2)):
             "accuracy": float(accuracy),
             "precision": float(precision),
             "recall": float(recall),
-            "f1_score": float(f1)
+            "f1_score": float(f1),
+            "inference": cost,
+            "latency_budget_ms": latency_budget_ms,
+            "rejected": rejected
         }
+        write_training_stats(stats)
+        if rejected:
+            raise LatencyBudgetExceededError(
+                f"{algorithm} p95 latency {cost['single_p95_ms']:.3f}ms exceeds the {latency_budget_ms}ms budget"
+            )
+        
+        # Save model and vectorizer
+        logger.info(f"Saving model and vectorizer to {output_dir}")
+        save_artifacts(model, vectorizer, output_dir)
+        
+        # Log model to MLflow
+        mlflow.sklearn.log_model(model, "model")
+        for name in ARTIFACT_FILES:
+            mlflow.log_artifact(os.path.join(output_dir, name))
         
-        import json
-        with open('training_stats.json', 'w') as f:
-            json.dump(stats, f, indent=2)
-        mlflow.log_artifact('training_stats.json')
+        # Log wall-clock time per stage
+        for stage, seconds in timings.items():
+            mlflow.log_metric(f"{stage}_seconds", seconds)
         
         logger.info(f"Training completed successfully. Run ID: {mlflow.active_run().info.run_id}")
         
         return accuracy, precision, recall, f1
 
 
+def is_holdout(text, test_fraction=0.2):
+    """Deterministically assign a message to the held-out set by hashing its text"""
+    return zlib.crc32(text.encode('utf-8')) % 10000 < test_fraction * 10000
+
+
+def iter_dataset_chunks(data_path='data/spam.csv', chunk_size=10000):
+    """
+    Stream the labelled dataset in chunks
+
+    Args:
+        data_path: Path to the CSV dataset
+        chunk_size: Rows per chunk
+
+    Yields:
+        DataFrame chunks with 'label' (0/1) and 'text' columns
+    """
+    reader = pd.read_csv(data_path, encoding='latin-1', usecols=['v1', 'v2'], chunksize=chunk_size)
+    for chunk in reader:
+        chunk.columns = ['label', 'text']
+        chunk['label'] = chunk['label'].map({'ham': 0, 'spam': 1})
+        yield chunk
+
+
+def train_model_streaming(algorithm='naive_bayes', n_features=2 ** 18, ngram_range=(1, 2),
+                          chunk_size=10000, data_path='data/spam.csv', test_fraction=0.2,
+                          preprocess_workers=1, output_dir='models', latency_budget_ms=None,
+                          benchmark_samples=1000):
+    """
+    Train spam classifier out-of-core on a dataset streamed in chunks
+
+    Each chunk is preprocessed, hashed into a fixed feature space with
+    HashingVectorizer and fed to a partial_fit-capable classifier, so peak
+    memory depends on the chunk size rather than the dataset size. The
+    held-out split is chosen by hashing each message and is scored in a
+    second streaming pass.
+
+    Args:
+        algorithm: Which algorithm to use ('naive_bayes', 'sgd')
+        n_features: Number of hashed features
+        ngram_range: N-gram range for the hashing vectorizer
+        chunk_size: Rows read and processed at a time
+        data_path: Path to the CSV dataset
+        test_fraction: Fraction of messages held out for evaluation
+        preprocess_workers: Worker processes for text preprocessing
+            (1 runs serially, 0 uses every CPU)
+        output_dir: Directory the model and vectorizer are written to
+        latency_budget_ms: Reject the model, without saving it, if its p95
+            single-message latency exceeds this many milliseconds
+        benchmark_samples: Held-out messages kept in memory to benchmark
+            inference latency
+
+    Raises:
+        LatencyBudgetExceededError: If the model exceeds the latency budget
+    """
+    import mlflow
+    import mlflow.sklearn
+
+    if algorithm == 'naive_bayes':
+        model = MultinomialNB()
+    elif algorithm == 'sgd':
+        model = SGDClassifier(loss='log_loss', random_state=42)
+    else:
+        raise ValueError(f"Algorithm {algorithm} does not support streaming training")
+
+    configure_mlflow()
+
+    logger.info(f"Starting streaming training with algorithm={algorithm}")
+
+    timings = {"preprocess": 0.0, "vectorize": 0.0, "fit": 0.0, "evaluate": 0.0}
+    classes = np.array([0, 1])
+    vectorizer = build_hashing_vectorizer(algorithm, n_features, ngram_range)
+
+    def timed(stage, func, *args, **kwargs):
+        start_time = time.perf_counter()
+        result = func(*args, **kwargs)
+        timings[stage] += time.perf_counter() - start_time
+        return result
+
+    with mlflow.start_run():
+        mlflow.log_param("algorithm", algorithm)
+        mlflow.log_param("training_mode", "streaming")
+        mlflow.log_param("n_features", n_features)
+        mlflow.log_param("ngram_range", str(ngram_range))
+        mlflow.log_param("chunk_size", chunk_size)
+        mlflow.log_param("preprocess_workers", preprocess_workers)
+
+        # Pass 1: fit on the training rows chunk by chunk
+        total_samples = spam_count = train_size = 0
+        for chunk in iter_dataset_chunks(data_path, chunk_size):
+            total_samples += len(chunk)
+            spam_count += int(chunk['label'].sum())
+
+            train_rows = chunk[~chunk['text'].map(lambda text: is_holdout(text, test_fraction))]
+            if train_rows.empty:
+                continue
+            train_size += len(train_rows)
+
+            transformed = timed("preprocess", transform_corpus, train_rows['text'], workers=preprocess_workers)
+            X_chunk = timed("vectorize", vectorizer.transform, transformed)
+            timed("fit", model.partial_fit, X_chunk, train_rows['label'].to_numpy(), classes=classes)
+            logger.info(f"Fitted chunk, {train_size} training rows so far")
+
+        # Pass 2: score the held-out rows, accumulating only confusion counts
+        cm = np.zeros((2, 2), dtype=np.int64)
+        benchmark_texts = []
+        for chunk in iter_dataset_chunks(data_path, chunk_size):
+            test_rows = chunk[chunk['text'].map(lambda text: is_holdout(text, test_fraction))]
+            if test_rows.empty:
+                continue
+            transformed = timed("preprocess", transform_corpus, test_rows['text'], workers=preprocess_workers)
+            benchmark_texts.extend(transformed[:benchmark_samples - len(benchmark_texts)])
+            X_chunk = timed("vectorize", vectorizer.transform, transformed)
+            y_pred = timed("evaluate", model.predict, X_chunk)
+            cm += confusion_matrix(test_rows['label'], y_pred, labels=[0, 1])
+
+        test_size = int(cm.sum())
+        mlflow.log_param("total_samples", total_samples)
+        mlflow.log_param("spam_count", spam_count)
+        mlflow.log_param("ham_count", total_samples - spam_count)
+        mlflow.log_param("train_size", train_size)
+        mlflow.log_param("test_size", test_size)
+
+        # Calculate metrics from the confusion counts
+        tn, fp, fn, tp = cm.ravel()
+        accuracy = (tp + tn) / test_size if test_size else 0.0
+        precision = tp / (tp + fp) if tp + fp else 0.0
+        recall = tp / (tp + fn) if tp + fn else 0.0
+        f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+
+        logger.info(f"Model metrics - Accuracy: {accuracy:.4f}, Precision: {precision:.4f}, Recall: {recall:.4f}, F1: {f1:.4f}")
+        mlflow.log_metric("accuracy", accuracy)
+        mlflow.log_metric("precision", precision)
+        mlflow.log_metric("recall", recall)
+        mlflow.log_metric("f1_score", f1)
+        for stage, seconds in timings.items():
+            mlflow.log_metric(f"{stage}_seconds", seconds)
+
+        cm_plot = plot_confusion_matrix(cm)
+        mlflow.log_artifact(cm_plot)
+
+        # Benchmark what the model costs to serve on a sample of held-out messages
+        if benchmark_texts:
+            logger.info("Benchmarking inference latency and model size")
+            cost = benchmark_inference(model, vectorizer, benchmark_texts)
+            rejected = log_inference_cost(cost, latency_budget_ms)
+        else:
+            logger.warning("No held-out messages to benchmark, skipping the inference cost check")
+            cost = None
+            rejected = False
+
+        stats = {
+            "total_samples": total_samples,
+            "spam_samples": spam_count,
+            "ham_samples": total_samples - spam_count,
+            "accuracy": float(accuracy),
+            "precision": float(precision),
+            "recall": float(recall),
+            "f1_score": float(f1),
+            "inference": cost,
+            "latency_budget_ms": latency_budget_ms,
+            "rejected": rejected
+        }
+        write_training_stats(stats)
+        if rejected:
+            raise LatencyBudgetExceededError(
+                f"{algorithm} p95 latency {cost['single_p95_ms']:.3f}ms exceeds the {latency_budget_ms}ms budget"
+            )
+
+        # Save model and vectorizer
+        logger.info(f"Saving model and vectorizer to {output_dir}")
+        save_artifacts(model, vectorizer, output_dir)
+
+        mlflow.sklearn.log_model(model, "model")
+        for name in ARTIFACT_FILES:
+            mlflow.log_artifact(os.path.join(output_dir, name))
+
+        logger.info(f"Streaming training completed successfully. Run ID: {mlflow.active_run().info.run_id}")
+
+        return accuracy, precision, recall, f1
+
+
+# Feedback labels accepted by encode_labels
+FEEDBACK_LABELS = {'ham': 0, 'spam': 1, '0': 0, '1': 1}
+
+
+def encode_labels(values):
+    """
+    Map feedback labels ('spam'/'ham' or 1/0) to 0/1
+
+    Args:
+        values: Label values
+
+    Returns:
+        Array of 0/1 labels
+
+    Raises:
+        ValueError: If a label is not recognised
+    """
+    try:
+        return np.array([FEEDBACK_LABELS[str(value).strip().lower()] for value in values], dtype=np.int64)
+    except KeyError as e:
+        raise ValueError(f"Unknown feedback label: {e.args[0]!r}") from None
+
+
+def iter_feedback_chunks(feedback_path, chunk_size=1000, text_field='text', label_field='label'):
+    """
+    Stream labelled feedback messages in chunks
+
+    Args:
+        feedback_path: CSV or JSONL file, or '-' for JSONL on stdin
+        chunk_size: Rows per chunk
+        text_field: Column or key holding the message text
+        label_field: Column or key holding 'spam'/'ham' or 1/0
+
+    Yields:
+        DataFrame chunks with 'label' (0/1) and 'text' columns
+    """
+    if detect_format(feedback_path) == 'csv':
+        reader = pd.read_csv(feedback_path, usecols=[text_field, label_field], dtype=str,
+                             keep_default_na=False, chunksize=chunk_size)
+        for chunk in reader:
+            yield pd.DataFrame({'label': encode_labels(chunk[label_field]), 'text': chunk[text_field].tolist()})
+        return
+
+    handle = sys.stdin if feedback_path == '-' else open(feedback_path, encoding='utf-8')
+    try:
+        records = (json.loads(line) for line in handle if line.strip())
+        while True:
+            chunk = list(itertools.islice(records, chunk_size))
+            if not chunk:
+                return
+            yield pd.DataFrame({
+                'label': encode_labels(record.get(label_field) for record in chunk),
+                'text': [str(record.get(text_field, '')) for record in chunk]
+            })
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+
+def publish_artifacts(model, vectorizer, output_dir='models', keep=5):
+    """
+    Publish a model and vectorizer pair as a new immutable version
+
+    The files are written to a staging directory, renamed into
+    versions/<timestamp>-<hash> and then made current by atomically
+    replacing the <output_dir>/current symlink, so a reader following
+    the pointer sees either the old pair or the new one, never a mix.
+    Serving picks a new version up when MODEL_PATH and VECTORIZER_PATH
+    point through current/ and the file watcher is on.
+
+    Args:
+        model: Fitted classifier
+        vectorizer: Fitted vectorizer
+        output_dir: Directory holding versions/ and the current pointer
+        keep: Published versions to keep, oldest are deleted first
+
+    Returns:
+        Path of the published version directory
+    """
+    versions_dir = os.path.join(output_dir, 'versions')
+    os.makedirs(versions_dir, exist_ok=True)
+    staging_dir = tempfile.mkdtemp(prefix='.staging-', dir=versions_dir)
+    try:
+        os.chmod(staging_dir, 0o755)
+        save_artifacts(model, vectorizer, staging_dir)
+        fingerprint = file_fingerprint(os.path.join(staging_dir, 'model.pkl'),
+                                       os.path.join(staging_dir, 'vectorizer.pkl'))
+        # Microsecond timestamps keep versions published within one second in order
+        version = f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%fZ')}-{fingerprint[:8]}"
+        version_dir = os.path.join(versions_dir, version)
+        os.rename(staging_dir, version_dir)
+    except BaseException:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+
+    # Swap the pointer with a rename, which replaces it atomically
+    pointer = os.path.join(output_dir, 'current')
+    temp_pointer = f"{pointer}.tmp"
+    if os.path.lexists(temp_pointer):
+        os.remove(temp_pointer)
+    os.symlink(os.path.join('versions', version), temp_pointer)
+    os.replace(temp_pointer, pointer)
+    logger.info(f"Published version {version} to {pointer}")
+
+    published = sorted(name for name in os.listdir(versions_dir) if not name.startswith('.'))
+    for name in published[:-keep] if keep else []:
+        if name != version:
+            shutil.rmtree(os.path.join(versions_dir, name), ignore_errors=True)
+    return version_dir
+
+
+def train_model_incremental(feedback_path, base_dir=None, output_dir='models', chunk_size=1000,
+                            text_field='text', label_field='label', sample_weight=1.0,
+                            preprocess_workers=1, keep_versions=5):
+    """
+    Update a served model from newly labelled messages and publish it
+
+    The base model is updated in place with partial_fit, one chunk of
+    feedback at a time, on the base vectorizer's unchanged feature space,
+    so nothing is re-preprocessed or refitted on the full dataset. A
+    TF-IDF vocabulary ignores terms it has never seen; train the base with
+    the hashing vectorizer to let updates learn from new campaign terms.
+    Each chunk is scored before it is learned from, which gives the
+    model's accuracy on the feedback it had not yet seen.
+
+    Args:
+        feedback_path: CSV or JSONL file of labelled messages, or '-' for stdin
+        base_dir: Directory holding the model.pkl and vectorizer.pkl to
+            update (defaults to the current published version, falling
+            back to output_dir)
+        output_dir: Directory the new version is published under
+        chunk_size: Feedback rows learned per partial_fit call
+        text_field: Column or key holding the message text
+        label_field: Column or key holding 'spam'/'ham' or 1/0
+        sample_weight: Weight of each feedback message relative to one
+            original training message
+        preprocess_workers: Worker processes for text preprocessing
+        keep_versions: Published versions to keep
+
+    Returns:
+        Path of the published version directory
+
+    Raises:
+        ValueError: If the base model cannot be updated incrementally, or
+            there is no feedback
+    """
+    import mlflow
+
+    if base_dir is None:
+        current = os.path.join(output_dir, 'current')
+        base_dir = current if os.path.exists(current) else output_dir
+
+    with open(os.path.join(base_dir, 'model.pkl'), 'rb') as f:
+        model = pickle.load(f)
+    with open(os.path.join(base_dir, 'vectorizer.pkl'), 'rb') as f:
+        vectorizer = pickle.load(f)
+    if not hasattr(model, 'partial_fit'):
+        raise ValueError(f"{type(model).__name__} does not support incremental updates")
+
+    configure_mlflow()
+    logger.info(f"Updating {type(model).__name__} from {base_dir} with feedback from {feedback_path}")
+
+    start_time = time.perf_counter()
+    classes = np.array([0, 1])
+    rows = correct = spam_count = 0
+
+    with mlflow.start_run():
+        mlflow.log_param("training_mode", "incremental")
+        mlflow.log_param("algorithm", type(model).__name__)
+        mlflow.log_param("base_dir", os.path.realpath(base_dir))
+        mlflow.log_param("sample_weight", sample_weight)
+
+        for chunk in iter_feedback_chunks(feedback_path, chunk_size, text_field, label_field):
+            transformed = transform_corpus(chunk['text'], workers=preprocess_workers)
+            X_chunk = vectorizer.transform(transformed)
+            y_chunk = chunk['label'].to_numpy()
+
+            correct += int((model.predict(X_chunk) == y_chunk).sum())
+            model.partial_fit(X_chunk, y_chunk, classes=classes,
+                              sample_weight=np.full(len(y_chunk), sample_weight))
+            rows += len(y_chunk)
+            spam_count += int(y_chunk.sum())
+            logger.info(f"Learned from {rows} feedback messages")
+
+        if not rows:
+            raise ValueError(f"No feedback messages in {feedback_path}")
+
+        version_dir = publish_artifacts(model, vectorizer, output_dir, keep=keep_versions)
+        update_seconds = time.perf_counter() - start_time
+
+        mlflow.log_param("feedback_samples", rows)
+        mlflow.log_param("feedback_spam", spam_count)
+        mlflow.log_param("version", os.path.basename(version_dir))
+        mlflow.log_metric("feedback_accuracy_before_update", correct / rows)
+        mlflow.log_metric("update_seconds", update_seconds)
+        for name in ARTIFACT_FILES:
+            mlflow.log_artifact(os.path.join(version_dir, name))
+
+        logger.info(
+            f"Incremental update from {rows} messages published in {update_seconds:.2f}s "
+            f"(accuracy on the feedback before the update: {correct / rows:.4f})"
+        )
+        return version_dir
+
+
 if __name__ == "__main__":
     import argparse
     
     parser = argparse.ArgumentParser(description="Train spam classifier")
     parser.add_argument("--algorithm", default="naive_bayes", 
-                       choices=["naive_bayes", "random_forest", "svm"],
+                       choices=["naive_bayes", "random_forest", "svm", "sgd"],
                        help="Algorithm to use")
     parser.add_argument("--max-features", type=int, default=3000,
                        help="Max features for TF-IDF")
+    parser.add_argument("--preprocess-workers", type=int, default=1,
+                       help="Worker processes for text preprocessing (1 = serial, 0 = all CPUs)")
+    parser.add_argument("--corpus-cache-dir", default=DEFAULT_CACHE_DIR,
+                       help="Directory caching the preprocessed corpus between runs")
+    parser.add_argument("--no-corpus-cache", action="store_true",
+                       help="Always re-preprocess the corpus")
+    parser.add_argument("--streaming", action="store_true",
+                       help="Stream the dataset in chunks into a hashing vectorizer and partial_fit model")
+    parser.add_argument("--chunk-size", type=int, default=10000,
+                       help="Rows per chunk in streaming or incremental mode")
+    parser.add_argument("--vectorizer", default="tfidf", choices=["tfidf", "hashing"],
+                       help="Fitted TF-IDF vocabulary, or the hashing trick with no vocabulary to store")
+    parser.add_argument("--n-features", type=int, default=2 ** 18,
+                       help="Hashed features in streaming or hashing mode")
+    parser.add_argument("--incremental", metavar="FEEDBACK",
+                       help="Update the current model from a CSV/JSONL file of labelled messages (- for stdin) "
+                            "and publish it as a new version")
+    parser.add_argument("--base-dir", default=None,
+                       help="Model to update incrementally (default: the current published version)")
+    parser.add_argument("--text-field", default="text", help="Feedback column or key holding the message text")
+    parser.add_argument("--label-field", default="label", help="Feedback column or key holding spam/ham or 1/0")
+    parser.add_argument("--feedback-weight", type=float, default=1.0,
+                       help="Weight of a feedback message relative to an original training message")
+    parser.add_argument("--keep-versions", type=int, default=5,
+                       help="Published versions kept by incremental updates")
+    parser.add_argument("--output-dir", default="models",
+                       help="Directory for the model and vectorizer, e.g. models/<algorithm> for the model registry")
+    parser.add_argument("--latency-budget-ms", type=float, default=None,
+                       help="Reject models whose p95 single-message latency exceeds this many milliseconds")
+    parser.add_argument("--sweep", action="store_true",
+                       help="Train the algorithm x max_features x ngram_range grid and keep the best model")
+    parser.add_argument("--sweep-algorithms", default="naive_bayes,random_forest,svm,sgd",
+                       help="Comma-separated algorithms in the sweep")
+    parser.add_argument("--sweep-max-features", default="1000,3000,5000",
+                       help="Comma-separated TF-IDF vocabulary sizes in the sweep")
+    parser.add_argument("--sweep-ngram-ranges", default="1-1,1-2",
+                       help="Comma-separated n-gram ranges (min-max) in the sweep")
+    parser.add_argument("--sweep-metric", default="f1_score",
+                       choices=["accuracy", "precision", "recall", "f1_score"],
+                       help="Metric the sweep maximises")
+    parser.add_argument("--latency-weight", type=float, default=0.0,
+                       help="Metric units the sweep gives up per millisecond of single-text latency")
+    parser.add_argument("--sweep-workers", type=int, default=1,
+                       help="Worker processes fitting sweep trials (1 = serial, 0 = all CPUs)")
     
     args = parser.parse_args()
     
-    train_model(algorithm=args.algorithm, max_features=args.max_features)
+    if args.sweep:
+        from src.sweep import parse_ngram_range, run_sweep
+
+        run_sweep(algorithms=args.sweep_algorithms.split(","),
+                  max_features=[int(value) for value in args.sweep_max_features.split(",")],
+                  ngram_ranges=[parse_ngram_range(value) for value in args.sweep_ngram_ranges.split(",")],
+                  metric=args.sweep_metric, latency_weight=args.latency_weight,
+                  latency_budget_ms=args.latency_budget_ms, workers=args.sweep_workers,
+                  preprocess_workers=args.preprocess_workers,
+                  corpus_cache_dir=None if args.no_corpus_cache else args.corpus_cache_dir,
+                  output_dir=args.output_dir)
+    elif args.incremental:
+        train_model_incremental(args.incremental, base_dir=args.base_dir, output_dir=args.output_dir,
+                                chunk_size=args.chunk_size, text_field=args.text_field,
+                                label_field=args.label_field, sample_weight=args.feedback_weight,
+                                preprocess_workers=args.preprocess_workers,
+                                keep_versions=args.keep_versions)
+    elif args.streaming:
+        train_model_streaming(algorithm=args.algorithm, n_features=args.n_features,
+                              chunk_size=args.chunk_size,
+                              preprocess_workers=args.preprocess_workers,
+                              output_dir=args.output_dir,
+                              latency_budget_ms=args.latency_budget_ms)
+    else:
+        train_model(algorithm=args.algorithm, max_features=args.max_features,
+                    preprocess_workers=args.preprocess_workers,
+                    corpus_cache_dir=None if args.no_corpus_cache else args.corpus_cache_dir,
+                    output_dir=args.output_dir,
+                    latency_budget_ms=args.latency_budget_ms,
+                    vectorizer_type=args.vectorizer, n_features=args.n_features)
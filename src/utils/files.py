@@ -0,0 +1,39 @@
+import hashlib
+import os
+
+
+def detect_format(path: str, default: str = 'jsonl') -> str:
+    """
+    Infer 'csv' or 'jsonl' from a file extension
+
+    Args:
+        path: File path, or '-' for stdin
+        default: Format used when the extension does not say
+
+    Returns:
+        'csv' or 'jsonl'
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        return 'csv'
+    if extension in ('.jsonl', '.ndjson', '.json'):
+        return 'jsonl'
+    return default
+
+
+def file_fingerprint(*paths: str) -> str:
+    """
+    Hash the contents of one or more files, such as a model and vectorizer pair
+
+    Args:
+        paths: File paths, hashed in order
+
+    Returns:
+        Hex SHA-256 digest of all files
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()
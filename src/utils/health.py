@@ -1,24 +1,83 @@
 import os
-import pickle
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from datetime import datetime
 
-def get_health_status() -> Dict[str, Any]:
+# Deployment details do not change while the process runs
+BUILD_INFO = {
+    "git_commit": os.getenv("GIT_COMMIT", "unknown"),
+    "build_number": os.getenv("BUILD_NUMBER", "unknown"),
+    "pod_name": os.getenv("HOSTNAME", "unknown")
+}
+
+
+def _isoformat(timestamp: Optional[float]) -> Optional[str]:
+    """Format a Unix timestamp as UTC ISO 8601, passing None through"""
+    if timestamp is None:
+        return None
+    return datetime.utcfromtimestamp(timestamp).isoformat() + "Z"
+
+
+def _component_error(components: Optional[Dict[str, Dict[str, Any]]]) -> Optional[str]:
+    """First load error of a required component, prefixed with its name"""
+    for name, state in (components or {}).items():
+        if state["required"] and state["error"] is not None:
+            return f"{name}: {state['error']}"
+    return None
+
+
+def get_health_status(classifier: Optional[Any] = None,
+                      components: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
     """
     Get application health status
     
+    With a classifier, health reflects the model it actually holds in
+    memory and no filesystem access is made. A process still loading its
+    model in the background is alive, so it reports healthy with loading
+    set; it turns unhealthy only if the load failed. Without a classifier,
+    the model files are checked on disk.
+    
+    Args:
+        classifier: Serving SpamClassifier, if one is running in this process
+        components: Load state of other serving components by name, each a
+            dictionary with required, loading, loaded and error; a failed
+            required component makes the process unhealthy
+    
     Returns:
         Dictionary containing health status information
     """
+    if classifier is not None:
+        state = classifier.get_state()
+        component_error = _component_error(components)
+        alive = (state["loaded"] or (state["loading"] and state["load_error"] is None)) and component_error is None
+        health = {
+            "status": "healthy" if alive else "unhealthy",
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "model_loaded": state["loaded"],
+            "vectorizer_loaded": state["loaded"],
+            "loading": state["loading"],
+            "warmed_up": state["warmed_up"],
+            "model_version": state["model_version"],
+            "model_loaded_at": _isoformat(state["loaded_at"]),
+            "last_prediction_at": _isoformat(state["last_prediction_at"]),
+            **BUILD_INFO
+        }
+        if components:
+            health["components"] = components
+        if state["load_error"] is not None:
+            health["error"] = state["load_error"]
+        elif component_error is not None:
+            health["error"] = component_error
+        elif not alive:
+            health["error"] = "Model or vectorizer not loaded"
+        return health
+
     health = {
         "status": "healthy",
         "timestamp": datetime.utcnow().isoformat() + "Z",
         "model_loaded": False,
         "vectorizer_loaded": False,
         "model_version": os.getenv("MODEL_VERSION", "v1.0.0"),
-        "git_commit": os.getenv("GIT_COMMIT", "unknown"),
-        "build_number": os.getenv("BUILD_NUMBER", "unknown"),
-        "pod_name": os.getenv("HOSTNAME", "unknown")
+        **BUILD_INFO
     }
     
     try:
@@ -44,13 +103,40 @@ def get_health_status() -> Dict[str, Any]:
     return health
 
 
-def get_readiness_status() -> Dict[str, bool]:
+def get_readiness_status(classifier: Optional[Any] = None,
+                         components: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
     """
     Get application readiness status for Kubernetes readiness probe
     
+    With a classifier, the pod is ready only once the model is loaded in
+    memory and has run its first inference (the warm-up gate), and every
+    required component has loaded. Without one, the model files are
+    checked on disk.
+    
+    Args:
+        classifier: Serving SpamClassifier, if one is running in this process
+        components: Load state of other serving components by name, as
+            passed to get_health_status
+    
     Returns:
         Dictionary with readiness status
     """
+    if classifier is not None:
+        state = classifier.get_state()
+        components = components or {}
+        readiness = {
+            "ready": state["loaded"] and state["warmed_up"] and all(
+                component["loaded"] for component in components.values() if component["required"]
+            ),
+            "loaded": state["loaded"],
+            "loading": state["loading"],
+            "warmed_up": state["warmed_up"],
+            "timestamp": datetime.utcnow().isoformat() + "Z"
+        }
+        if components:
+            readiness["components"] = {name: component["loaded"] for name, component in components.items()}
+        return readiness
+
     model_path = os.getenv("MODEL_PATH", "models/model.pkl")
     vectorizer_path = os.getenv("VECTORIZER_PATH", "models/vectorizer.pkl")
     
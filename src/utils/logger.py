@@ -1,15 +1,32 @@
+import atexit
+import copy
+import itertools
 import logging
+import logging.handlers
 import json
+import os
+import queue
 import sys
-from datetime import datetime
-from typing import Any, Dict
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+# Extra record attributes copied into the JSON document when present
+EXTRA_FIELDS = (
+    'prediction', 'confidence', 'model_version', 'request_id',
+    'pod_name', 'latency_ms', 'batch_id', 'batch_size', 'cluster_id'
+)
+
 
 class JSONFormatter(logging.Formatter):
     """Custom JSON formatter for structured logging"""
-    
+
     def format(self, record: logging.LogRecord) -> str:
+        # Use the time the record was created, not formatted, so queued
+        # records keep their original timestamp
+        created = datetime.fromtimestamp(record.created, timezone.utc).replace(tzinfo=None)
         log_data: Dict[str, Any] = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": created.isoformat() + "Z",
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -17,48 +34,155 @@ class JSONFormatter(logging.Formatter):
             "function": record.funcName,
             "line": record.lineno
         }
-        
+
         # Add extra fields if present
-        if hasattr(record, 'prediction'):
-            log_data['prediction'] = record.prediction
-        if hasattr(record, 'confidence'):
-            log_data['confidence'] = record.confidence
-        if hasattr(record, 'model_version'):
-            log_data['model_version'] = record.model_version
-        if hasattr(record, 'request_id'):
-            log_data['request_id'] = record.request_id
-        if hasattr(record, 'pod_name'):
-            log_data['pod_name'] = record.pod_name
-        if hasattr(record, 'latency_ms'):
-            log_data['latency_ms'] = record.latency_ms
-            
+        for field in EXTRA_FIELDS:
+            if hasattr(record, field):
+                log_data[field] = getattr(record, field)
+
         # Add exception info if present
         if record.exc_info:
             log_data['exception'] = self.formatException(record.exc_info)
-            
+        elif record.exc_text:
+            log_data['exception'] = record.exc_text
+
         return json.dumps(log_data)
 
 
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hand records to a bounded queue for a background thread to format and write
+
+    When the queue is full, records are either dropped and counted or the
+    logging thread blocks until there is room, depending on the policy.
+    """
+
+    def __init__(self, log_queue: queue.Queue, policy: str = "drop"):
+        """
+        Initialize queue handler
+
+        Args:
+            log_queue: Bounded queue drained by a QueueListener
+            policy: 'drop' to discard records when the queue is full, or
+                'block' to wait for room
+        """
+        super().__init__(log_queue)
+        if policy not in ("drop", "block"):
+            raise ValueError(f"Unknown log queue policy: {policy}")
+        self.policy = policy
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Make a record safe to format later on another thread"""
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = JSONFormatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.policy == "block":
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class DrainingQueueListener(logging.handlers.QueueListener):
+    """Queue listener that waits for room in a full queue when stopping, so queued records are flushed"""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+class PredictionSampler(logging.Filter):
+    """Pass only 1 in every N records with prediction 'not_spam'"""
+
+    def __init__(self, rate: int):
+        """
+        Initialize sampler
+
+        Args:
+            rate: Keep one in every rate not_spam prediction records
+        """
+        super().__init__()
+        self.rate = max(rate, 1)
+        self._counter = itertools.count()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, 'prediction', None) != 'not_spam':
+            return True
+        return next(self._counter) % self.rate == 0
+
+
+_queue_handler: Optional[BoundedQueueHandler] = None
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+_queue_lock = threading.Lock()
+
+
+def _get_queue_handler() -> BoundedQueueHandler:
+    """Shared queue handler, starting its background listener on first use"""
+    global _queue_handler, _queue_listener
+    with _queue_lock:
+        if _queue_handler is None:
+            log_queue: queue.Queue = queue.Queue(maxsize=int(os.getenv("LOG_QUEUE_SIZE", 10000)))
+            _queue_handler = BoundedQueueHandler(log_queue, os.getenv("LOG_QUEUE_POLICY", "drop").lower())
+
+            output = logging.StreamHandler(sys.stdout)
+            output.setFormatter(JSONFormatter())
+            _queue_listener = DrainingQueueListener(log_queue, output)
+            _queue_listener.start()
+
+            # Flush queued records on interpreter exit
+            atexit.register(_queue_listener.stop)
+        return _queue_handler
+
+
+def get_log_queue_stats() -> Dict[str, int]:
+    """Get asynchronous logging statistics, zeros when logging is synchronous"""
+    if _queue_handler is None:
+        return {"depth": 0, "dropped": 0}
+    return {"depth": _queue_handler.queue.qsize(), "dropped": _queue_handler.dropped}
+
+
 def setup_logger(name: str = "spam_classifier", level: str = "INFO") -> logging.Logger:
     """
     Setup structured JSON logger
-    
+
+    With LOG_ASYNC=true, records are formatted and written by a background
+    thread fed through a queue of LOG_QUEUE_SIZE records, and
+    LOG_QUEUE_POLICY chooses whether a full queue drops records ('drop')
+    or blocks the caller ('block'). LOG_SAMPLE_NOT_SPAM=N keeps only one in
+    N not_spam prediction records.
+
     Args:
         name: Logger name
         level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
-    
+
     Returns:
         Configured logger instance
     """
     logger = logging.getLogger(name)
     logger.setLevel(getattr(logging, level.upper()))
-    
-    # Remove existing handlers
+
+    # Remove existing handlers and filters
     logger.handlers = []
-    
-    # Create console handler with JSON formatter
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setFormatter(JSONFormatter())
-    logger.addHandler(handler)
-    
+    logger.filters = []
+
+    if os.getenv("LOG_ASYNC", "false").lower() == "true":
+        logger.addHandler(_get_queue_handler())
+    else:
+        # Create console handler with JSON formatter
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(JSONFormatter())
+        logger.addHandler(handler)
+
+    sample_rate = int(os.getenv("LOG_SAMPLE_NOT_SPAM", 1))
+    if sample_rate > 1:
+        logger.addFilter(PredictionSampler(sample_rate))
+
     return logger
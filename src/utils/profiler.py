@@ -0,0 +1,66 @@
+import os
+import sys
+import threading
+from collections import Counter
+from typing import Optional
+
+
+class SamplingProfiler:
+    """
+    Sample one thread's Python stack at a fixed interval
+
+    Used as a context manager around the code to profile. A background
+    thread records the profiled thread's call stack every interval, and
+    folded() renders the samples in the folded-stack format read by
+    flamegraph.pl and speedscope. Samples are taken whenever the sampler
+    thread gets the GIL, so calls shorter than the interpreter switch
+    interval may collect few samples; fold several requests together for
+    a representative picture.
+    """
+
+    def __init__(self, interval: float = 0.001, thread_id: Optional[int] = None):
+        """
+        Initialize profiler
+
+        Args:
+            interval: Seconds between samples
+            thread_id: Thread to sample (defaults to the thread entering the context)
+        """
+        self.interval = interval
+        self.thread_id = thread_id
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "SamplingProfiler":
+        if self.thread_id is None:
+            self.thread_id = threading.get_ident()
+        self._stop.clear()
+        self._sampler = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._sampler.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self._stop.set()
+        self._sampler.join()
+
+    @staticmethod
+    def fold(frame) -> str:
+        """Render a frame and its callers as a root-first, semicolon-separated stack"""
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+    def _run(self) -> None:
+        """Sampler thread loop"""
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.samples[self.fold(frame)] += 1
+
+    def folded(self) -> str:
+        """Samples in folded-stack format, one 'stack count' line per distinct stack"""
+        return "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common())
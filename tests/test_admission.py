@@ -0,0 +1,90 @@
+import pytest
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.admission import AdmissionController, RequestShedError
+
+
+def wait_for_queue(controller, lane, depth):
+    """Wait until a lane holds the given number of queued requests"""
+    deadline = time.monotonic() + 5
+    while controller.stats()['queued'][lane] != depth:
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def test_sheds_when_queue_is_full():
+    """Test that requests over the limit are shed once the queue is full"""
+    shed = []
+    controller = AdmissionController(max_limit=1, queue_size=0, on_shed=lambda lane, reason: shed.append(reason))
+    controller.acquire()
+
+    with pytest.raises(RequestShedError) as excinfo:
+        controller.acquire()
+
+    assert excinfo.value.reason == 'queue_full'
+    assert excinfo.value.retry_after >= 1
+    assert shed == ['queue_full']
+
+
+def test_sheds_by_deadline():
+    """Test that a request is shed up front if its expected wait exceeds its deadline, or when it times out"""
+    controller = AdmissionController(max_limit=1, latency_target_ms=1000, queue_timeout_ms=50)
+    controller.acquire()
+
+    with pytest.raises(RequestShedError) as excinfo:
+        controller.acquire(timeout_ms=10)
+    assert excinfo.value.reason == 'deadline'
+
+    controller._latency = 0.01
+    with pytest.raises(RequestShedError) as excinfo:
+        controller.acquire()
+    assert excinfo.value.reason == 'timeout'
+    assert controller.stats()['queued'] == {'interactive': 0, 'batch': 0}
+
+
+def test_interactive_lane_is_admitted_first():
+    """Test that a freed slot goes to a queued interactive request before an older batch one"""
+    controller = AdmissionController(max_limit=1, latency_target_ms=1000, queue_timeout_ms=5000)
+    controller._latency = 0.001
+    controller.acquire()
+    order = []
+
+    def run(lane):
+        controller.acquire(lane)
+        order.append(lane)
+        controller.release()
+
+    threads = [threading.Thread(target=run, args=('batch',))]
+    threads[0].start()
+    wait_for_queue(controller, 'batch', 1)
+    threads.append(threading.Thread(target=run, args=('interactive',)))
+    threads[1].start()
+    wait_for_queue(controller, 'interactive', 1)
+
+    controller.release()
+    for thread in threads:
+        thread.join()
+
+    assert order == ['interactive', 'batch']
+
+
+def test_limit_adapts_to_latency():
+    """Test that the limit shrinks when latency exceeds the target and grows back when saturated"""
+    controller = AdmissionController(max_limit=10, initial_limit=4, latency_target_ms=100)
+
+    controller.acquire()
+    controller.release(0.5)
+    assert controller.limit == 3
+
+    for _ in range(3):
+        controller.acquire()
+    for _ in range(3):
+        controller.release(0.01)
+    assert controller.stats()['limit'] == 3
+    assert controller._limit > 3
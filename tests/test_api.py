@@ -0,0 +1,340 @@
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.api import app, classifier
+
+
+@pytest.fixture
+def client():
+    """Fixture to create a Flask test client"""
+    classifier.wait_until_ready(60)
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+def test_predict_endpoint(client):
+    """Test single prediction endpoint"""
+    response = client.post('/predict', json={'text': 'Win a free prize now!'})
+    data = response.get_json()
+
+    assert response.status_code == 200
+    assert data['prediction'] in ['spam', 'not_spam']
+    assert 'request_id' in data
+
+
+def test_predict_batch_endpoint(client):
+    """Test batch prediction endpoint"""
+    texts = ['Win a free prize now!', 'See you at lunch tomorrow']
+    response = client.post('/predict/batch', json={'texts': texts})
+    data = response.get_json()
+
+    assert response.status_code == 200
+    assert data['batch_size'] == 2
+    assert len(data['predictions']) == 2
+    assert data['latency_ms'] >= 0
+    for item in data['predictions']:
+        assert item['prediction'] in ['spam', 'not_spam']
+        assert 0 <= item['confidence'] <= 1
+        assert len(item['request_id']) > 0
+
+
+def test_predict_batch_rejects_invalid_payload(client):
+    """Test that batch endpoint validates its payload"""
+    assert client.post('/predict/batch', json={'text': 'hello'}).status_code == 400
+    assert client.post('/predict/batch', json={'texts': ['ok', 42]}).status_code == 400
+
+
+def test_predict_batch_rejects_oversized_batch(client, monkeypatch):
+    """Test that batch endpoint enforces the batch size limit"""
+    monkeypatch.setattr('src.api.MAX_BATCH_SIZE', 2)
+    response = client.post('/predict/batch', json={'texts': ['a', 'b', 'c']})
+
+    assert response.status_code == 413
+
+
+def test_admin_reload_endpoint(client, monkeypatch):
+    """Test that the admin endpoint reloads the model under a new version"""
+    monkeypatch.setattr('src.api.ADMIN_TOKEN', 'secret')
+    response = client.post('/admin/reload', json={'model_version': 'v-reloaded'},
+                           headers={'X-Admin-Token': 'secret'})
+    data = response.get_json()
+
+    assert response.status_code == 200
+    assert data['model_version'] == 'v-reloaded'
+    assert client.post('/predict', json={'text': 'hello'}).get_json()['model_version'] == 'v-reloaded'
+
+
+def test_admin_reload_requires_token(client, monkeypatch):
+    """Test that the admin endpoint rejects requests without the admin token"""
+    monkeypatch.setattr('src.api.ADMIN_TOKEN', 'secret')
+
+    assert client.post('/admin/reload').status_code == 403
+    assert client.post('/admin/reload', headers={'X-Admin-Token': 'secret'}).status_code == 200
+
+
+def test_admin_reload_is_disabled_without_token(client, monkeypatch):
+    """Test that the admin endpoint refuses every request when no admin token is configured"""
+    monkeypatch.setattr('src.api.ADMIN_TOKEN', None)
+    version = classifier.model_version
+
+    assert client.post('/admin/reload').status_code == 403
+    assert client.post('/admin/reload', headers={'X-Admin-Token': ''}).status_code == 403
+    assert classifier.model_version == version
+
+
+def test_reload_after_failed_startup_exports_model_info(client):
+    """Test that a reload exports the new version even if the previous one was never exported"""
+    import src.api
+
+    src.api.MODEL_INFO.clear()
+    src.api._record_reload('never-exported', 'v-recovered', None)
+    metrics = client.get('/metrics').get_data(as_text=True)
+
+    assert 'spam_classifier_model_info{model_version="v-recovered"} 1.0' in metrics
+    assert 'never-exported' not in metrics
+
+
+def test_predict_endpoint_with_micro_batching(client, monkeypatch):
+    """Test that /predict answers through the micro-batcher when enabled"""
+    import src.api
+    from src.batching import MicroBatcher
+
+    batcher = MicroBatcher(src.api.classifier.predict_batch_with_version, max_batch_size=8, max_wait_ms=1)
+    monkeypatch.setattr('src.api.batcher', batcher)
+    response = client.post('/predict', json={'text': 'Win a free prize now!'})
+    batcher.stop()
+    data = response.get_json()
+
+    assert response.status_code == 200
+    assert data['prediction'] in ['spam', 'not_spam']
+    assert data['model_version'] == src.api.classifier.model_version
+
+
+def test_stage_latency_exported_to_metrics(client):
+    """Test that per-stage prediction latency appears in Prometheus metrics"""
+    client.post('/predict', json={'text': 'Win a free prize now!'})
+    metrics = client.get('/metrics').get_data(as_text=True)
+
+    assert 'spam_classifier_stage_latency_seconds_bucket{le="1e-05",mode="single",stage="vectorize"}' in metrics
+
+
+def test_predict_profile_header(client, monkeypatch):
+    """Test that a profiled request returns folded stacks only when profiling is enabled"""
+    assert 'profile' not in client.post('/predict', json={'text': 'hi'}, headers={'X-Profile': '1'}).get_json()
+
+    monkeypatch.setattr('src.api.PROFILING_ENABLED', True)
+    data = client.post('/predict', json={'text': 'hi'}, headers={'X-Profile': '1'}).get_json()
+
+    assert isinstance(data['profile'], str)
+
+
+def test_probes_report_in_memory_state(client):
+    """Test that liveness and readiness reflect the loaded, warmed-up classifier"""
+    health = client.get('/health')
+    ready = client.get('/ready')
+
+    assert health.status_code == 200
+    assert health.get_json()['warmed_up'] is True
+    assert ready.status_code == 200
+    assert ready.get_json()['ready'] is True
+
+
+def test_predict_returns_503_while_model_loads(client, monkeypatch):
+    """Test that predictions are refused, not failed, before the background load finishes"""
+    monkeypatch.setattr(classifier, '_loaded', None)
+
+    assert client.post('/predict', json={'text': 'hi'}).status_code == 503
+    assert client.post('/predict/batch', json={'texts': ['hi']}).status_code == 503
+
+
+def test_startup_phases_exported_to_metrics(client):
+    """Test that import, load, warm-up and total startup time are reported"""
+    metrics = client.get('/metrics').get_data(as_text=True)
+
+    for phase in ('import', 'load', 'warm_up', 'total'):
+        assert f'spam_classifier_startup_seconds{{phase="{phase}"}}' in metrics
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Fixture serving the shipped model from the registry under the name 'nb'"""
+    from src.registry import ModelRegistry
+
+    registry = ModelRegistry()
+    registry.register('nb', 'models/model.pkl', 'models/vectorizer.pkl', model_version='nb-v1')
+    monkeypatch.setattr('src.api.registry', registry)
+    return registry
+
+
+def test_predict_selects_registry_model(client, registry):
+    """Test that a request can pick a registry model, and unknown models are 404"""
+    data = client.post('/predict', json={'text': 'Win a free prize now!', 'model': 'nb'}).get_json()
+
+    assert (data['model'], data['model_version']) == ('nb', 'nb-v1')
+    assert client.post('/predict', json={'text': 'hi', 'model': 'missing'}).status_code == 404
+    assert 'model' not in client.post('/predict', json={'text': 'hi'}).get_json()
+
+
+def test_registry_predictions_share_the_serving_path(client, registry, monkeypatch):
+    """Test that named-model traffic is cached, micro-batched and tracked like default traffic, but not shadow scored"""
+    import src.api
+    from src.batching import MicroBatcher
+    from src.predict import PredictionCache
+
+    monkeypatch.setattr(classifier, 'prediction_cache', PredictionCache(100, 60))
+    monkeypatch.setattr(classifier, 'last_prediction_at', None)
+    monkeypatch.setattr(classifier, '_score_listeners', [lambda *scored: pytest.fail("shadow scored")])
+    monkeypatch.setattr('src.api.batcher', MicroBatcher(classifier.predict_batch_with_version, max_wait_ms=1))
+    monkeypatch.setattr('src.api.registry_batchers', {})
+
+    for _ in range(2):
+        data = client.post('/predict', json={'text': 'Win a free prize now!', 'model': 'nb'}).get_json()
+        assert (data['model'], data['model_version']) == ('nb', 'nb-v1')
+    src.api.registry_batchers['nb'].stop()
+
+    assert classifier.prediction_cache.stats()['hits'] == 1
+    assert classifier.last_prediction_at is not None
+    assert set(src.api.registry_batchers) == {'nb'}
+
+
+def test_predict_compare_scores_every_registry_model(client, registry):
+    """Test that the compare endpoint returns one prediction per registry model"""
+    response = client.post('/predict/compare', json={'text': 'Win a free prize now!'})
+
+    assert response.status_code == 200
+    assert set(response.get_json()['predictions']) == {'nb'}
+    assert client.get('/models').get_json()['models'][0]['name'] == 'nb'
+
+
+@pytest.mark.parametrize("models", [[], 'nb', ['nb', 1], {'nb': 1}])
+def test_predict_compare_rejects_invalid_models(client, registry, models):
+    """Test that models must be a non-empty list of names"""
+    response = client.post('/predict/compare', json={'text': 'Win a free prize now!', 'models': models})
+
+    assert response.status_code == 400
+
+
+def test_shadow_endpoint_reports_agreement(client, monkeypatch):
+    """Test that shadow scoring runs on /predict traffic and its statistics are served"""
+    import src.api
+    from src.shadow import ShadowEvaluator
+
+    assert client.get('/shadow').status_code == 404
+
+    shadow = ShadowEvaluator(classifier.model, on_result=src.api._record_shadow)
+    monkeypatch.setattr('src.api.shadow', shadow)
+    monkeypatch.setattr(classifier, '_score_listeners', [shadow.submit])
+    client.post('/predict', json={'text': 'A message never seen before by the cache'})
+    shadow.shutdown()
+
+    assert client.get('/shadow').get_json()['agreement_rate'] == 1.0
+    assert 'spam_classifier_shadow_comparisons_total{outcome="agree"}' in client.get('/metrics').get_data(as_text=True)
+
+
+def test_mismatched_shadow_model_is_disabled(client, monkeypatch, tmp_path):
+    """Test that a shadow model with the wrong feature count is turned off at load and after a reload"""
+    import pickle
+    import numpy as np
+    import src.api
+    from sklearn.naive_bayes import MultinomialNB
+    from src.shadow import ShadowEvaluator
+
+    mismatched = MultinomialNB().fit(np.eye(3), [0, 1, 1])
+    with open(tmp_path / 'shadow.pkl', 'wb') as f:
+        pickle.dump(mismatched, f)
+    monkeypatch.setattr('src.api.components', {})
+    monkeypatch.setattr('src.api.shadow', None)
+    monkeypatch.setattr('src.api.SHADOW_MODEL_PATH', str(tmp_path / 'shadow.pkl'))
+    src.api._start_loading('shadow', src.api._load_shadow, required=False).join()
+
+    assert src.api.shadow is None
+    assert 'features' in src.api.components['shadow']['error']
+    assert client.get('/health').status_code == 200
+    assert 'features' in client.get('/shadow').get_json()['reason']
+
+    # A hot reload to a vectorizer the running shadow does not fit
+    shadow = ShadowEvaluator(mismatched)
+    monkeypatch.setattr('src.api.shadow', shadow)
+    monkeypatch.setattr(classifier, '_score_listeners', [shadow.submit])
+    src.api._check_shadow(classifier.model_version, classifier.model_version, None)
+
+    assert src.api.shadow is None
+    assert classifier._score_listeners == []
+
+
+def test_clusters_endpoint_reports_near_duplicates(client, monkeypatch):
+    """Test that spam clusters and near-duplicate metrics are served once the index is enabled"""
+    from src.dedup import NearDuplicateIndex
+
+    assert client.get('/clusters').status_code == 404
+
+    monkeypatch.setattr(classifier, 'near_duplicates', NearDuplicateIndex(max_size=10))
+    template = "WINNER!! You have been selected to receive a {} prize reward! To claim call {}. Claim code {}."
+    client.post('/predict', json={'text': template.format("£900", "09061701461", "KL341")})
+    client.post('/predict', json={'text': template.format("£500", "09061709932", "QX117")})
+    response = client.get('/clusters')
+
+    assert response.status_code == 200
+    assert response.get_json()['hits'] == 1
+    assert response.get_json()['clusters'][0]['hits'] == 1
+    assert 'spam_classifier_near_duplicate_hits 1.0' in client.get('/metrics').get_data(as_text=True)
+
+
+def test_overload_sheds_predictions_but_not_probes(client, monkeypatch):
+    """Test that predictions over the admission limit get 429s while probes and metrics are still served"""
+    from src.admission import AdmissionController
+    import src.api
+
+    admission = AdmissionController(max_limit=1, queue_size=0, on_shed=src.api._record_shed)
+    monkeypatch.setattr('src.api.admission', admission)
+    admission.acquire()
+    try:
+        response = client.post('/predict', json={'text': 'Hello'})
+        assert response.status_code == 429
+        assert response.get_json()['reason'] == 'queue_full'
+        assert int(response.headers['Retry-After']) >= 1
+
+        assert client.get('/health').status_code == 200
+        metrics = client.get('/metrics')
+        assert metrics.status_code == 200
+        assert ('spam_classifier_requests_shed_total{lane="interactive",reason="queue_full"}'
+                in metrics.get_data(as_text=True))
+    finally:
+        admission.release()
+
+    assert client.post('/predict', json={'text': 'Hello'}).status_code == 200
+    assert admission.stats()['in_flight'] == 0
+
+
+def test_failed_registry_load_fails_probes_not_startup(client, monkeypatch):
+    """Test that a bad registry config is reported by the probes without touching the default model"""
+    import src.api
+
+    monkeypatch.setattr('src.api.components', {})
+    monkeypatch.setattr('src.api.MODEL_REGISTRY_CONFIG', '/nonexistent.json')
+    src.api._start_loading('registry', src.api._load_registry, required=True).join()
+
+    health = client.get('/health')
+    ready = client.get('/ready')
+    assert health.status_code == 503
+    assert health.get_json()['error'].startswith('registry:')
+    assert ready.status_code == 503
+    assert ready.get_json()['components'] == {'registry': False}
+    assert classifier.load_error is None
+    assert client.post('/predict', json={'text': 'hi'}).status_code == 200
+
+
+def test_named_model_waits_for_registry(client, monkeypatch):
+    """Test that requests naming a model get 503, not 404, while the registry loads"""
+    monkeypatch.setattr('src.api.components', {'registry': {
+        'required': True, 'loading': True, 'loaded': False, 'error': None
+    }})
+
+    assert client.post('/predict', json={'text': 'hi', 'model': 'nb'}).status_code == 503
+    assert client.post('/predict/batch', json={'texts': ['hi'], 'model': 'nb'}).status_code == 503
+    assert client.get('/ready').status_code == 503
@@ -0,0 +1,108 @@
+import pytest
+import pickle
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.artifacts import CompactTfidfVectorizer, export_artifacts, load_artifact
+from src.predict import SpamClassifier
+from src.preprocess import TextPreprocessor
+
+
+@pytest.fixture(scope="module")
+def vectorizer():
+    """Fixture loading the pickled TF-IDF vectorizer"""
+    with open("models/vectorizer.pkl", "rb") as f:
+        return pickle.load(f)
+
+
+@pytest.fixture(scope="module")
+def documents():
+    """Fixture with preprocessed messages from the training dataset"""
+    df = pd.read_csv(Path(__file__).parent.parent / 'data' / 'spam.csv', encoding='latin-1')
+    preprocessor = TextPreprocessor()
+    return [preprocessor(text) for text in df['v2'].head(500)] + ["", "unseenterm"]
+
+
+def test_compact_vectorizer_matches_tfidf(vectorizer, documents):
+    """Test that the compact vectorizer produces the same matrix"""
+    expected = vectorizer.transform(documents)
+    actual = CompactTfidfVectorizer(vectorizer).transform(documents)
+
+    assert actual.shape == expected.shape
+    assert np.array_equal(actual.indptr, expected.indptr)
+    assert np.array_equal(actual.indices, expected.indices)
+    assert np.allclose(actual.data, expected.data)
+
+
+@pytest.mark.parametrize("column_cache_size", [50000, 5])
+def test_compact_vectorizer_term_column_cache(vectorizer, documents, column_cache_size):
+    """Test that transforms served from a warm or overflowing term column cache match TfidfVectorizer"""
+    expected = vectorizer.transform(documents)
+    compact = CompactTfidfVectorizer(vectorizer)
+    compact.column_cache_size = column_cache_size
+
+    for _ in range(2):
+        assert (compact.transform(documents) != expected).nnz == 0
+    assert compact.__getstate__()['_column_cache'] == {}
+
+
+def test_exported_artifacts_are_memory_mapped(vectorizer, tmp_path):
+    """Test that exported artifacts load with memory-mapped arrays"""
+    with open("models/model.pkl", "rb") as f:
+        model = pickle.load(f)
+    model_path, vectorizer_path = export_artifacts(model, vectorizer, str(tmp_path))
+
+    assert isinstance(load_artifact(model_path).feature_log_prob_, np.memmap)
+    assert isinstance(load_artifact(vectorizer_path).term_hashes, np.memmap)
+
+
+def test_load_artifact_falls_back_to_pickle(tmp_path):
+    """Test that a missing joblib artifact falls back to the pickle next to it"""
+    with open(tmp_path / "model.pkl", "wb") as f:
+        pickle.dump({"fallback": True}, f)
+
+    assert load_artifact(str(tmp_path / "model.joblib")) == {"fallback": True}
+
+
+def test_classifier_predictions_match_across_formats():
+    """Test that joblib and pickle artifacts give the same predictions"""
+    pickled = SpamClassifier("models/model.pkl", "models/vectorizer.pkl")
+    mapped = SpamClassifier("models/model.joblib", "models/vectorizer.joblib")
+    texts = ["WINNER! Claim your free prize now", "Are we still on for dinner?"]
+
+    for (label, confidence, _), (expected_label, expected_confidence, _) in zip(
+            mapped.predict_batch(texts), pickled.predict_batch(texts)):
+        assert label == expected_label
+        assert confidence == pytest.approx(expected_confidence)
+
+
+def test_compact_vectorizer_loads_sorted_term_artifacts(vectorizer, documents):
+    """Test that artifacts exported with a sorted term array still load and transform the same"""
+    compact = CompactTfidfVectorizer(vectorizer)
+    terms = sorted(vectorizer.vocabulary_)
+    state = compact.__getstate__()
+    del state['term_hashes']
+    state['terms'] = np.array([term.encode('utf-8') for term in terms], dtype=bytes)
+    state['columns'] = np.array([vectorizer.vocabulary_[term] for term in terms], dtype=np.int32)
+
+    legacy = CompactTfidfVectorizer.__new__(CompactTfidfVectorizer)
+    legacy.__setstate__(state)
+
+    assert not hasattr(legacy, 'terms')
+    assert (legacy.transform(documents) != compact.transform(documents)).nnz == 0
+
+
+
+def test_compact_vectorizer_artifact_is_smaller(vectorizer, tmp_path):
+    """Test that the exported vectorizer is smaller than the pickled TfidfVectorizer"""
+    with open("models/model.pkl", "rb") as f:
+        model = pickle.load(f)
+    _, vectorizer_path = export_artifacts(model, vectorizer, str(tmp_path))
+
+    assert Path(vectorizer_path).stat().st_size < 0.75 * len(pickle.dumps(vectorizer))
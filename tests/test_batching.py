@@ -0,0 +1,90 @@
+import pytest
+import sys
+import threading
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.batching import MicroBatcher
+
+
+class RecordingScorer:
+    """Batch scorer that records the size of every call"""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def __call__(self, texts):
+        self.batch_sizes.append(len(texts))
+        if any(text == "boom" for text in texts):
+            raise ValueError("bad input")
+        return [(text.upper(), len(text)) for text in texts], "v-test"
+
+
+@pytest.fixture
+def scorer():
+    """Fixture to create a recording batch scorer"""
+    return RecordingScorer()
+
+
+def _predict_concurrently(batcher, texts):
+    """Submit texts from separate threads and collect results in order"""
+    results = [None] * len(texts)
+
+    def worker(index):
+        results[index] = batcher.predict(texts[index], timeout=5)
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(len(texts))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_requests_are_coalesced(scorer):
+    """Test that concurrent submissions share model calls and get their own results"""
+    batcher = MicroBatcher(scorer, max_batch_size=16, max_wait_ms=200)
+    texts = [f"message {index}" for index in range(8)]
+    results = _predict_concurrently(batcher, texts)
+    batcher.stop()
+
+    assert results == [(text.upper(), len(text), "v-test") for text in texts]
+    assert sum(scorer.batch_sizes) == 8
+    assert len(scorer.batch_sizes) < 8
+
+
+def test_batches_respect_max_batch_size(scorer):
+    """Test that no micro-batch exceeds the configured size"""
+    batcher = MicroBatcher(scorer, max_batch_size=3, max_wait_ms=50)
+    futures = [batcher.submit(f"message {index}") for index in range(10)]
+    for future in futures:
+        future.result(timeout=5)
+    batcher.stop()
+
+    assert max(scorer.batch_sizes) <= 3
+    assert sum(scorer.batch_sizes) == 10
+
+
+def test_failing_input_only_fails_its_own_request(scorer):
+    """Test that a scoring error is isolated to the request that caused it"""
+    batcher = MicroBatcher(scorer, max_batch_size=4, max_wait_ms=50)
+    good = batcher.submit("hello")
+    bad = batcher.submit("boom")
+
+    assert good.result(timeout=5) == ("HELLO", 5, "v-test")
+    with pytest.raises(ValueError):
+        bad.result(timeout=5)
+    batcher.stop()
+
+
+def test_on_batch_reports_batch_size(scorer):
+    """Test that the batch callback sees every dispatched batch"""
+    observed = []
+    batcher = MicroBatcher(scorer, max_batch_size=4, max_wait_ms=0,
+                           on_batch=lambda size, depth: observed.append(size))
+    batcher.predict("hello", timeout=5)
+    batcher.stop()
+
+    assert observed == [1]
@@ -0,0 +1,69 @@
+import pytest
+import json
+import os
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.suite import DEFAULT_BASELINE, bench_batch_vectorize, bench_predict_stages, compare_to_baseline, run_suite
+
+
+def _metric(value, unit="us", higher_is_better=False, gated=True):
+    """Build a benchmark metric"""
+    return {"value": value, "unit": unit, "higher_is_better": higher_is_better, "gated": gated}
+
+
+def test_compare_flags_slower_latency_and_lower_throughput():
+    """Test that latency increases and throughput drops past the threshold are regressions"""
+    baseline = {"stage_predict_p50_us": _metric(1000), "endpoint_throughput_rps": _metric(200, "req/s", True)}
+    current = {"stage_predict_p50_us": _metric(2000), "endpoint_throughput_rps": _metric(100, "req/s", True)}
+
+    regressions = compare_to_baseline(current, baseline, threshold=0.25)
+
+    assert len(regressions) == 2
+    assert regressions[0].startswith("stage_predict_p50_us")
+
+
+def test_compare_ignores_noise_and_ungated_metrics():
+    """Test that small absolute changes, ungated and new metrics never fail the gate"""
+    baseline = {"stage_model_p50_us": _metric(10), "stage_model_p95_us": _metric(1000, gated=False)}
+    current = {
+        "stage_model_p50_us": _metric(30),
+        "stage_model_p95_us": _metric(5000, gated=False),
+        "new_metric_p50_us": _metric(100000)
+    }
+
+    assert compare_to_baseline(current, baseline, threshold=0.25) == []
+
+
+def test_batch_vectorize_benchmark_reports_cold_warm_and_reference():
+    """Test that the batch benchmark times the compact vectorizer cold and warm against sklearn"""
+    metrics = bench_batch_vectorize(batch_size=50, repeat=1)
+
+    assert set(metrics) == {"batch_vectorize_cold_us", "batch_vectorize_us", "batch_vectorize_sklearn_us"}
+    assert metrics["batch_vectorize_us"]["gated"] and not metrics["batch_vectorize_sklearn_us"]["gated"]
+
+
+def test_predict_stage_benchmark_times_real_predict_calls():
+    """Test that stage timings come from the stages predict itself reports"""
+    from src.predict import SpamClassifier
+
+    classifier = SpamClassifier(model_path="models/model.pkl", vectorizer_path="models/vectorizer.pkl",
+                                cache_size=0, near_duplicate_size=0)
+    metrics = bench_predict_stages(classifier, repeat=8)
+
+    stages = {name[len("stage_"):-len("_p50_us")] for name in metrics if name.endswith("_p50_us")}
+    assert stages == {"preprocess", "vectorize", "model", "logging", "predict"}
+
+
+@pytest.mark.skipif(not os.getenv("RUN_BENCHMARKS"), reason="set RUN_BENCHMARKS=1 to run the benchmark suite")
+def test_benchmark_suite_against_baseline():
+    """Test that no gated benchmark regresses against the stored baseline"""
+    report = run_suite()
+    with open(DEFAULT_BASELINE) as f:
+        baseline = json.load(f)
+    threshold = float(os.getenv("BENCHMARK_THRESHOLD", 0.5))
+
+    assert compare_to_baseline(report["metrics"], baseline["metrics"], threshold) == []
@@ -0,0 +1,117 @@
+import pytest
+import json
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import src.bulk_score as bulk_score_module
+from src.bulk_score import bulk_score, load_checkpoint, read_chunks, save_checkpoint
+from src.predict import SpamClassifier
+
+TEXTS = [
+    "WINNER! Claim your free prize now", "See you at lunch", "Free entry in a weekly competition",
+    "Call me when you get home", "URGENT: your account has won cash", "Are we still meeting today?",
+    "Text WIN to 80086 for a free ringtone"
+]
+
+
+@pytest.fixture
+def jsonl_input(tmp_path):
+    """Fixture writing the sample messages as JSONL with string ids"""
+    path = tmp_path / "messages.jsonl"
+    path.write_text("".join(json.dumps({"id": f"m{index}", "text": text}) + "\n" for index, text in enumerate(TEXTS)))
+    return path
+
+
+def read_jsonl(path):
+    return [json.loads(line) for line in Path(path).read_text().splitlines()]
+
+
+def test_read_chunks_streams_csv_in_chunks(tmp_path):
+    """Test that CSV input is split into chunks with row-number ids"""
+    path = tmp_path / "messages.csv"
+    path.write_text("text\n" + "\n".join(f'"{text}"' for text in TEXTS) + "\n")
+
+    chunks = list(read_chunks(str(path), 'csv', chunk_size=3))
+
+    assert [len(texts) for _, texts in chunks] == [3, 3, 1]
+    assert chunks[2] == ([6], [TEXTS[6]])
+
+
+def test_bulk_score_matches_classifier(jsonl_input, tmp_path):
+    """Test that bulk results match single predictions, in input order with the input ids"""
+    output = tmp_path / "scores.jsonl"
+
+    summary = bulk_score(str(jsonl_input), str(output), id_field="id", chunk_size=3)
+    classifier = SpamClassifier(model_path="models/model.pkl", vectorizer_path="models/vectorizer.pkl")
+    results = read_jsonl(output)
+
+    assert summary['rows'] == len(TEXTS)
+    assert summary['rows_per_second'] > 0
+    assert [result['id'] for result in results] == [f"m{index}" for index in range(len(TEXTS))]
+    for result, text in zip(results, TEXTS):
+        prediction, confidence, _ = classifier.predict(text)
+        assert (result['prediction'], result['confidence']) == (prediction, confidence)
+
+
+def test_bulk_score_resumes_from_checkpoint(jsonl_input, tmp_path, monkeypatch):
+    """Test that an interrupted run resumes after its last checkpoint without duplicates"""
+    expected = tmp_path / "expected.csv"
+    bulk_score(str(jsonl_input), str(expected), id_field="id", chunk_size=2)
+
+    output = tmp_path / "scores.csv"
+    checkpoint = tmp_path / "scores.checkpoint"
+    score_chunk = bulk_score_module._score_chunk
+    calls = []
+
+    def fail_on_third_chunk(texts):
+        calls.append(texts)
+        if len(calls) == 3:
+            raise KeyboardInterrupt
+        return score_chunk(texts)
+
+    monkeypatch.setattr(bulk_score_module, '_score_chunk', fail_on_third_chunk)
+    with pytest.raises(KeyboardInterrupt):
+        bulk_score(str(jsonl_input), str(output), id_field="id", chunk_size=2, checkpoint_path=str(checkpoint))
+    monkeypatch.setattr(bulk_score_module, '_score_chunk', score_chunk)
+
+    assert load_checkpoint(str(checkpoint))['chunks_done'] == 1
+    # Simulate a chunk that was partly written when the run died
+    with open(output, 'a') as f:
+        f.write("m2,spam,0.5,torn")
+
+    summary = bulk_score(str(jsonl_input), str(output), id_field="id", chunk_size=2, checkpoint_path=str(checkpoint))
+
+    assert summary['resumed_rows'] == 2
+    assert summary['rows'] == len(TEXTS) - 2
+    assert output.read_text() == expected.read_text()
+    assert load_checkpoint(str(checkpoint))['complete'] is True
+
+
+def test_bulk_score_restarts_when_output_is_missing(jsonl_input, tmp_path):
+    """Test that a checkpoint whose output was removed rescores from the first row"""
+    expected = tmp_path / "expected.csv"
+    bulk_score(str(jsonl_input), str(expected), id_field="id", chunk_size=2)
+
+    output = tmp_path / "scores.csv"
+    checkpoint = tmp_path / "scores.checkpoint"
+    save_checkpoint(str(checkpoint), {"input": str(jsonl_input), "output": str(output), "chunk_size": 2,
+                                      "chunks_done": 1, "rows_done": 2, "output_bytes": 100})
+
+    summary = bulk_score(str(jsonl_input), str(output), id_field="id", chunk_size=2, checkpoint_path=str(checkpoint))
+
+    assert summary['resumed_rows'] == 0
+    assert output.read_text() == expected.read_text()
+
+
+def test_bulk_score_with_process_pool(jsonl_input, tmp_path):
+    """Test that scoring across worker processes gives the same output as serial scoring"""
+    serial = tmp_path / "serial.jsonl"
+    parallel = tmp_path / "parallel.jsonl"
+
+    bulk_score(str(jsonl_input), str(serial), chunk_size=2)
+    bulk_score(str(jsonl_input), str(parallel), chunk_size=2, workers=2)
+
+    assert parallel.read_text() == serial.read_text()
@@ -0,0 +1,59 @@
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src import corpus_cache
+from src.corpus_cache import save_corpus, load_corpus, cache_path, load_or_transform_corpus
+from src.preprocess import transform_text
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    """Fixture writing a small raw dataset file"""
+    path = tmp_path / "spam.csv"
+    path.write_text("v1,v2\nspam,Win a free prize\nham,See you later\n")
+    return str(path)
+
+
+def test_corpus_round_trip(tmp_path):
+    """Test that saved corpora load back unchanged"""
+    texts = ["free prize", "", "café résumé", "call now"]
+    path = tmp_path / "corpus.npz"
+    save_corpus(path, texts)
+
+    assert load_corpus(path) == texts
+
+
+def test_cache_path_changes_with_preprocessor_version(dataset, tmp_path, monkeypatch):
+    """Test that a preprocessing change invalidates the cache key"""
+    original = cache_path(dataset, str(tmp_path))
+    monkeypatch.setattr(corpus_cache, "preprocessor_version", lambda: "changed")
+
+    assert cache_path(dataset, str(tmp_path)) != original
+
+
+def test_cache_path_changes_with_dataset(dataset, tmp_path):
+    """Test that a dataset change invalidates the cache key"""
+    original = cache_path(dataset, str(tmp_path))
+    with open(dataset, "a") as f:
+        f.write("ham,One more row\n")
+
+    assert cache_path(dataset, str(tmp_path)) != original
+
+
+def test_load_or_transform_corpus_reuses_cache(dataset, tmp_path, monkeypatch):
+    """Test that a second run loads the corpus instead of re-preprocessing"""
+    texts = ["Win a free prize", "See you later"]
+    cache_dir = str(tmp_path / "cache")
+    first = load_or_transform_corpus(texts, dataset, cache_dir=cache_dir)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("corpus should have been loaded from cache")
+
+    monkeypatch.setattr(corpus_cache, "transform_corpus", fail)
+    second = load_or_transform_corpus(texts, dataset, cache_dir=cache_dir)
+
+    assert first == second == [transform_text(text) for text in texts]
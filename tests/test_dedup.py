@@ -0,0 +1,67 @@
+import pytest
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.dedup import NearDuplicateIndex
+from src.preprocess import transform_text
+
+TEMPLATE = ("WINNER!! As a valued network customer you have been selected to receive a {amount} prize reward! "
+            "To claim call {number}. Claim code {code}. Valid {hours} hours only.")
+FIRST = transform_text(TEMPLATE.format(amount="£900", number="09061701461", code="KL341", hours=12))
+VARIANT = transform_text(TEMPLATE.format(amount="£500", number="09061709932", code="QX117", hours=24))
+HAM = transform_text("Hey are we still meeting for lunch tomorrow? Let me know")
+
+
+@pytest.fixture
+def index():
+    """Fixture with one spam cluster indexed"""
+    index = NearDuplicateIndex(max_size=2, ttl_seconds=60)
+    index.add(index.signature(FIRST), 'spam', 0.99, 'v1')
+    return index
+
+
+def test_variant_matches_cluster(index):
+    """Test that a templated variant is answered from the cluster and an unrelated message is not"""
+    prediction, confidence, cluster_id = index.lookup(index.signature(VARIANT), 'v1')
+
+    assert (prediction, confidence) == ('spam', 0.99)
+    assert index.lookup(index.signature(HAM), 'v1') is None
+    assert index.lookup(index.signature(VARIANT), 'v2') is None
+    assert [(cluster['cluster_id'], cluster['hits']) for cluster in index.top_clusters()] == [(cluster_id, 1)]
+    assert index.stats()['hit_ratio'] == pytest.approx(1 / 3)
+
+
+def test_only_confident_spam_starts_clusters(index):
+    """Test that ham and low-confidence spam are not indexed"""
+    assert index.add(index.signature(HAM), 'not_spam', 0.99, 'v1') is None
+    assert index.add(index.signature(HAM), 'spam', 0.6, 'v1') is None
+    assert index.add(None, 'spam', 0.99, 'v1') is None
+    assert index.stats()['size'] == 1
+
+
+def test_clusters_expire_and_are_bounded(index, monkeypatch):
+    """Test that clusters expire after the TTL and the oldest is evicted when full"""
+    index.add(index.signature("free entri weekli competit win fa cup final"), 'spam', 0.95, 'v1')
+    index.add(index.signature("urgent mobil award 2000 bonu caller prize"), 'spam', 0.95, 'v1')
+    assert index.stats()['size'] == 2
+    assert index.stats()['evicted'] == 1
+    assert index.lookup(index.signature(VARIANT), 'v1') is None
+
+    expired_at = time.monotonic() + 61
+    monkeypatch.setattr('src.dedup.time.monotonic', lambda: expired_at)
+    assert index.top_clusters() == []
+    assert index.stats()['expired'] == 2
+
+
+def test_group_joins_batch_variants_to_their_first_message():
+    """Test that variants within one batch are grouped under the first of them, without touching the index"""
+    index = NearDuplicateIndex(max_size=2, ttl_seconds=60)
+    third = transform_text(TEMPLATE.format(amount="£250", number="09061704411", code="ZB552", hours=48))
+    signatures = [index.signature(HAM), index.signature(FIRST), None, index.signature(VARIANT), index.signature(third)]
+
+    assert index.group(signatures) == [0, 1, 2, 1, 1]
+    assert index.stats()['size'] == 0
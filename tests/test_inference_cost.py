@@ -0,0 +1,68 @@
+import pytest
+import pickle
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.inference_cost import benchmark_inference, in_memory_size, over_latency_budget
+from src.preprocess import transform_text
+
+
+@pytest.fixture(scope="module")
+def artifacts():
+    """Fixture loading the shipped model and vectorizer"""
+    with open('models/model.pkl', 'rb') as f:
+        model = pickle.load(f)
+    with open('models/vectorizer.pkl', 'rb') as f:
+        vectorizer = pickle.load(f)
+    return model, vectorizer
+
+
+def test_benchmark_inference_reports_latency_and_size(artifacts):
+    """Test that latency percentiles, batch throughput and sizes are all measured"""
+    model, vectorizer = artifacts
+    texts = [transform_text(text) for text in ["Win a free prize now!", "See you at lunch", "Call me later"] * 10]
+
+    cost = benchmark_inference(model, vectorizer, texts, single_samples=20, batch_size=8)
+
+    assert 0 < cost['single_p50_ms'] <= cost['single_p95_ms']
+    assert cost['batch_messages_per_second'] > 0
+    assert cost['model_bytes'] > 0
+    assert cost['vectorizer_memory_bytes'] > 0
+
+
+def test_benchmark_inference_rejects_empty_texts(artifacts):
+    """Test that benchmarking without texts fails with a clear error"""
+    model, vectorizer = artifacts
+
+    with pytest.raises(ValueError, match="at least one text"):
+        benchmark_inference(model, vectorizer, [])
+
+
+def test_in_memory_size_counts_array_buffers():
+    """Test that numpy buffers are included in the in-memory size"""
+    import numpy as np
+
+    assert in_memory_size(np.zeros(100000)) >= 800000
+
+
+def test_over_latency_budget_uses_p95():
+    """Test the latency budget check against p95 single-message latency"""
+    cost = {'single_p50_ms': 0.5, 'single_p95_ms': 2.0}
+
+    assert over_latency_budget(cost, None) is False
+    assert over_latency_budget(cost, 5.0) is False
+    assert over_latency_budget(cost, 1.0) is True
+
+
+def test_in_memory_size_includes_tree_nodes():
+    """Test that tree ensembles are not reported as nearly empty"""
+    import numpy as np
+    from sklearn.ensemble import RandomForestClassifier
+
+    rng = np.random.RandomState(0)
+    forest = RandomForestClassifier(n_estimators=10, random_state=0).fit(rng.rand(300, 10), rng.randint(0, 2, 300))
+
+    assert in_memory_size(forest) > len(pickle.dumps(forest)) / 2
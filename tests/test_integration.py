@@ -41,3 +41,47 @@ def test_health_status_with_models():
         assert health['status'] == 'healthy'
     else:
         assert health['status'] == 'unhealthy'
+
+
+@pytest.fixture
+def classifier():
+    """Fixture to create a classifier that has not served a prediction yet"""
+    from src.predict import SpamClassifier
+    return SpamClassifier(
+        model_path="models/model.pkl",
+        vectorizer_path="models/vectorizer.pkl"
+    )
+
+
+def test_probes_use_in_memory_state_without_filesystem(classifier, monkeypatch):
+    """Test that probes given a classifier never touch the filesystem"""
+    def no_filesystem(*args, **kwargs):
+        raise AssertionError("probe touched the filesystem")
+
+    monkeypatch.setattr('os.path.exists', no_filesystem)
+    monkeypatch.setattr('os.stat', no_filesystem)
+    health = get_health_status(classifier)
+    readiness = get_readiness_status(classifier)
+
+    assert health['status'] == 'healthy'
+    assert health['model_loaded'] is True
+    assert health['model_loaded_at'].endswith('Z')
+    assert health['last_prediction_at'] is None
+    assert readiness['loaded'] is True
+
+
+def test_readiness_waits_for_first_inference(classifier):
+    """Test the warm-up gate: ready only after the model has run inference"""
+    assert get_readiness_status(classifier)['ready'] is False
+
+    classifier.warm_up()
+
+    assert get_readiness_status(classifier)['ready'] is True
+
+
+def test_prediction_opens_readiness_gate_and_records_time(classifier):
+    """Test that a successful prediction marks the model warm and is timestamped"""
+    classifier.predict("See you at lunch")
+
+    assert get_readiness_status(classifier)['ready'] is True
+    assert get_health_status(classifier)['last_prediction_at'] is not None
@@ -0,0 +1,89 @@
+import pytest
+import io
+import json
+import logging
+import queue
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.logger import BoundedQueueHandler, JSONFormatter, PredictionSampler, setup_logger
+
+
+def _record(message="hello", prediction=None, created=None):
+    """Build a log record, optionally tagged with a prediction"""
+    record = logging.LogRecord("spam_classifier.test", logging.INFO, __file__, 1, message, None, None)
+    if prediction is not None:
+        record.prediction = prediction
+    if created is not None:
+        record.created = created
+    return record
+
+
+def test_json_formatter_uses_record_creation_time():
+    """Test that the timestamp reflects when the record was created"""
+    data = json.loads(JSONFormatter().format(_record(prediction="spam", created=0.0)))
+
+    assert data["timestamp"] == "1970-01-01T00:00:00Z"
+    assert data["prediction"] == "spam"
+
+
+def test_queue_handler_drops_when_full():
+    """Test that the drop policy discards and counts records once the queue is full"""
+    handler = BoundedQueueHandler(queue.Queue(maxsize=2), policy="drop")
+    for index in range(5):
+        handler.handle(_record(f"message {index}"))
+
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
+
+
+def test_queue_handler_rejects_unknown_policy():
+    """Test that only the drop and block policies are accepted"""
+    with pytest.raises(ValueError):
+        BoundedQueueHandler(queue.Queue(maxsize=1), policy="spill")
+
+
+def test_queued_records_keep_exception_text():
+    """Test that exceptions survive being formatted on the listener thread"""
+    handler = BoundedQueueHandler(queue.Queue(), policy="block")
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        record = _record("failed")
+        record.exc_info = sys.exc_info()
+        handler.handle(record)
+
+    data = json.loads(JSONFormatter().format(handler.queue.get_nowait()))
+    assert data["message"] == "failed"
+    assert "RuntimeError: boom" in data["exception"]
+
+
+def test_prediction_sampler_keeps_one_in_n_not_spam():
+    """Test that not_spam records are sampled while everything else passes"""
+    sampler = PredictionSampler(3)
+    not_spam = [sampler.filter(_record(prediction="not_spam")) for _ in range(9)]
+
+    assert sum(not_spam) == 3
+    assert all(sampler.filter(_record(prediction="spam")) for _ in range(3))
+    assert sampler.filter(_record())
+
+
+def test_async_logger_writes_in_background(monkeypatch):
+    """Test that LOG_ASYNC routes records through the background listener"""
+    from src.utils import logger as log_setup
+
+    monkeypatch.setenv("LOG_ASYNC", "true")
+    monkeypatch.setattr(log_setup, "_queue_handler", None)
+    monkeypatch.setattr(log_setup, "_queue_listener", None)
+    logger = setup_logger("spam_classifier.test_async")
+    stream = io.StringIO()
+    log_setup._queue_listener.handlers[0].setStream(stream)
+
+    logger.info("queued message", extra={'prediction': 'spam'})
+    log_setup._queue_handler.queue.join()
+
+    assert isinstance(logger.handlers[0], BoundedQueueHandler)
+    assert json.loads(stream.getvalue())["message"] == "queued message"
@@ -1,12 +1,13 @@
 import pytest
 import os
 import sys
+import time
 from pathlib import Path
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.predict import SpamClassifier
+from src.predict import SpamClassifier, PredictionCache, ModelNotReadyError
 
 
 @pytest.fixture
@@ -83,3 +84,282 @@ def test_confidence_score_range(classifier):
     for text in texts:
         _, confidence, _ = classifier.predict(text)
         assert 0 <= confidence <= 1, f"Confidence {confidence} out of range for text: {text}"
+
+
+def test_predict_batch_matches_single_predictions(classifier):
+    """Test that batch predictions agree with one-at-a-time predictions"""
+    texts = [
+        "URGENT! You have won $1000. Click here to claim now!",
+        "Hi, I'll be there at 5pm for our meeting.",
+        ""
+    ]
+    results = classifier.predict_batch(texts)
+
+    assert len(results) == len(texts)
+    for text, (prediction, confidence, request_id) in zip(texts, results):
+        single_prediction, single_confidence, _ = classifier.predict(text)
+        assert prediction == single_prediction
+        assert confidence == pytest.approx(single_confidence)
+        assert len(request_id) > 0
+
+
+def test_predict_batch_unique_request_ids(classifier):
+    """Test that each item in a batch gets its own request ID"""
+    results = classifier.predict_batch(["Test message"] * 5)
+    request_ids = [request_id for _, _, request_id in results]
+
+    assert len(set(request_ids)) == 5
+
+
+def test_predict_batch_empty(classifier):
+    """Test that an empty batch returns no predictions"""
+    assert classifier.predict_batch([]) == []
+
+
+@pytest.fixture
+def cached_classifier():
+    """Fixture to create classifier instance with the prediction cache enabled"""
+    return SpamClassifier(
+        model_path="models/model.pkl",
+        vectorizer_path="models/vectorizer.pkl",
+        cache_size=2,
+        cache_ttl=300
+    )
+
+
+def test_prediction_cache_disabled_by_default(classifier):
+    """Test that the prediction cache is off unless configured"""
+    assert classifier.prediction_cache is None
+
+
+def test_prediction_cache_serves_repeated_messages(cached_classifier):
+    """Test that a repeated message is answered from the cache"""
+    text = "WINNER!! Claim your free prize now"
+    first = cached_classifier.predict(text)
+    second = cached_classifier.predict(text)
+    stats = cached_classifier.prediction_cache.stats()
+
+    assert first[:2] == second[:2]
+    assert first[2] != second[2]
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+    assert stats['hit_ratio'] == 0.5
+
+
+def test_prediction_cache_is_bounded(cached_classifier):
+    """Test that the least recently used prediction is evicted"""
+    for text in ["first message", "second message", "third message"]:
+        cached_classifier.predict(text)
+
+    assert cached_classifier.prediction_cache.stats()['size'] == 2
+
+
+def test_prediction_cache_expires_entries():
+    """Test that cached predictions expire after their TTL"""
+    cache = PredictionCache(max_size=10, ttl_seconds=0.01)
+    key = PredictionCache.make_key("free prize", "v1")
+    cache.put(key, "spam", 0.9)
+    time.sleep(0.02)
+
+    assert cache.get(key) is None
+
+
+def test_prediction_cache_keyed_on_model_version():
+    """Test that cache keys differ between model versions"""
+    assert PredictionCache.make_key("free prize", "v1") != PredictionCache.make_key("free prize", "v2")
+
+
+def test_prediction_cache_cleared_on_model_reload(cached_classifier):
+    """Test that reloading the model invalidates cached predictions"""
+    cached_classifier.predict("Free entry to win cash")
+    cached_classifier.load_model()
+
+    assert cached_classifier.prediction_cache.stats()['size'] == 0
+
+
+def test_predict_batch_uses_prediction_cache(cached_classifier):
+    """Test that batch predictions reuse and fill the prediction cache"""
+    cached_classifier.predict("Free entry to win cash")
+    results = cached_classifier.predict_batch(["Free entry to win cash", "See you at lunch"])
+    single_prediction, single_confidence, _ = cached_classifier.predict("See you at lunch")
+
+    assert results[1][:2] == (single_prediction, single_confidence)
+    assert cached_classifier.prediction_cache.stats()['hits'] == 2
+
+
+@pytest.fixture
+def artifact_dir(tmp_path):
+    """Fixture to copy the model artifacts into a temporary directory"""
+    for name in ["model.pkl", "vectorizer.pkl"]:
+        (tmp_path / name).write_bytes((Path("models") / name).read_bytes())
+    return tmp_path
+
+
+def test_reload_swaps_model_and_reports_version(artifact_dir):
+    """Test that reloading serves the new model under its new version"""
+    classifier = SpamClassifier(
+        model_path=str(artifact_dir / "model.pkl"),
+        vectorizer_path=str(artifact_dir / "vectorizer.pkl")
+    )
+    old_model = classifier.model
+    version = classifier.reload(model_version="v2.0.0")
+
+    assert version == "v2.0.0"
+    assert classifier.model is not old_model
+    assert classifier.predict_with_version("Win cash now")[3] == "v2.0.0"
+    assert classifier.predict_batch_with_version(["Win cash now"])[1] == "v2.0.0"
+    assert classifier.get_model_info()['reload_count'] == 1
+
+
+def test_reload_defaults_to_artifact_fingerprint_version(classifier):
+    """Test that an unversioned reload is tagged with a hash of the artifacts"""
+    version = classifier.reload()
+
+    assert version.startswith(f"{classifier.base_version}+")
+    assert classifier.reload() == version
+
+
+def test_failed_reload_keeps_serving_current_model(artifact_dir):
+    """Test that a broken artifact never replaces the served model"""
+    classifier = SpamClassifier(
+        model_path=str(artifact_dir / "model.pkl"),
+        vectorizer_path=str(artifact_dir / "vectorizer.pkl")
+    )
+    events = []
+    classifier.add_reload_listener(lambda previous, version, error: events.append(error))
+    (artifact_dir / "model.pkl").write_bytes(b"not a pickle")
+
+    with pytest.raises(Exception):
+        classifier.reload()
+
+    assert classifier.model_version == classifier.base_version
+    assert classifier.predict("Win cash now")[0] in ['spam', 'not_spam']
+    assert len(events) == 1 and events[0] is not None
+
+
+def test_watcher_reloads_changed_artifacts(artifact_dir):
+    """Test that the file watcher picks up rewritten artifacts"""
+    classifier = SpamClassifier(
+        model_path=str(artifact_dir / "model.pkl"),
+        vectorizer_path=str(artifact_dir / "vectorizer.pkl")
+    )
+    classifier.start_watching(interval=0.05)
+    try:
+        model_file = artifact_dir / "model.pkl"
+        stat = model_file.stat()
+        os.utime(model_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        deadline = time.time() + 5
+        while classifier.reload_count == 0 and time.time() < deadline:
+            time.sleep(0.05)
+    finally:
+        classifier.stop_watching()
+
+    assert classifier.reload_count == 1
+    assert classifier.model_version != classifier.base_version
+
+
+def test_stage_listener_reports_each_stage(classifier):
+    """Test that per-stage timings are reported for single and batch predictions"""
+    observed = []
+    classifier.add_stage_listener(lambda stage, seconds, batch_size: observed.append((stage, seconds, batch_size)))
+    classifier.predict("Win cash now")
+    classifier.predict_batch(["Win cash now", "See you at lunch"])
+
+    single = {stage for stage, _, batch_size in observed if batch_size == 1}
+    batch = {stage for stage, _, batch_size in observed if batch_size == 2}
+    assert single == {"preprocess", "vectorize", "model", "logging"}
+    assert batch == single
+    assert all(seconds >= 0 for _, seconds, _ in observed)
+
+
+def test_background_load_serves_probes_before_model_is_ready():
+    """Test that a classifier created without loading reports loading, then loads in the background"""
+    classifier = SpamClassifier(model_path="models/model.pkl", vectorizer_path="models/vectorizer.pkl", load=False)
+
+    assert classifier.get_state()['loading'] is True
+    with pytest.raises(ModelNotReadyError):
+        classifier.predict("hello")
+
+    timings = []
+    classifier.load_in_background(on_complete=lambda load, warm_up: timings.append((load, warm_up)))
+
+    assert classifier.wait_until_ready(60) is True
+    assert classifier.get_state()['warmed_up'] is True
+    assert len(timings) == 1 and all(seconds > 0 for seconds in timings[0])
+
+
+def test_failed_background_load_is_recorded(tmp_path):
+    """Test that a background load failure is kept for the liveness probe"""
+    classifier = SpamClassifier(model_path=str(tmp_path / "missing.pkl"),
+                                vectorizer_path=str(tmp_path / "missing.pkl"), load=False)
+    classifier.load_in_background()
+
+    assert classifier.wait_until_ready(60) is False
+    assert classifier.get_state()['load_error'] is not None
+
+
+def test_watcher_recovers_from_failed_startup(tmp_path):
+    """Test that artifacts appearing after a failed startup are loaded and clear the load error"""
+    classifier = SpamClassifier(model_path=str(tmp_path / "model.pkl"),
+                                vectorizer_path=str(tmp_path / "vectorizer.pkl"), load=False)
+    classifier.load_in_background()
+    assert classifier.wait_until_ready(60) is False
+
+    classifier.start_watching(interval=0.05)
+    try:
+        for name in ["model.pkl", "vectorizer.pkl"]:
+            (tmp_path / name).write_bytes((Path("models") / name).read_bytes())
+
+        deadline = time.time() + 5
+        while classifier.reload_count == 0 and time.time() < deadline:
+            time.sleep(0.05)
+    finally:
+        classifier.stop_watching()
+
+    state = classifier.get_state()
+    assert state['loaded'] is True
+    assert state['load_error'] is None
+    assert classifier.predict("Win cash now")[0] in ['spam', 'not_spam']
+
+
+def test_near_duplicate_index_answers_spam_variants():
+    """Test that templated variants of a recent spam message skip the model, singly and in batches"""
+    classifier = SpamClassifier(model_path="models/model.pkl", vectorizer_path="models/vectorizer.pkl",
+                                near_duplicate_size=10, near_duplicate_ttl=60)
+    template = "WINNER!! You have been selected to receive a {} prize reward! To claim call {}. Claim code {}."
+    first = classifier.predict(template.format("£900", "09061701461", "KL341"))
+    scored = classifier.predict_batch([template.format("£500", "09061709932", "QX117"), "See you at lunch"])
+    variant = classifier.predict(template.format("£250", "09061704411", "ZB552"))
+    stats = classifier.near_duplicates.stats()
+
+    assert first[0] == scored[0][0] == variant[0] == 'spam'
+    assert scored[0][1] == variant[1] == first[1]
+    assert scored[1][0] == 'not_spam'
+    assert (stats['hits'], stats['misses'], stats['size']) == (2, 2, 1)
+
+    classifier.load_model()
+    assert classifier.near_duplicates.stats()['size'] == 0
+
+
+def test_near_duplicate_batch_starts_one_cluster_per_campaign():
+    """Test that variants of a new campaign in one batch are scored once and share one cluster"""
+    classifier = SpamClassifier(model_path="models/model.pkl", vectorizer_path="models/vectorizer.pkl",
+                                near_duplicate_size=10, near_duplicate_ttl=60)
+    template = "WINNER!! You have been selected to receive a {} prize reward! To claim call {}. Claim code {}."
+    scored_sizes = []
+    classifier.add_score_listener(lambda vector_input, labels, confidences, version:
+                                  scored_sizes.append(len(labels)))
+
+    results = classifier.predict_batch([
+        template.format("£900", "09061701461", "KL341"),
+        "See you at lunch",
+        template.format("£500", "09061709932", "QX117"),
+        template.format("£250", "09061704411", "ZB552")
+    ])
+    stats = classifier.near_duplicates.stats()
+
+    assert [result[0] for result in results] == ['spam', 'not_spam', 'spam', 'spam']
+    assert results[0][1] == results[2][1] == results[3][1]
+    assert scored_sizes == [2]
+    assert (stats['hits'], stats['misses'], stats['size']) == (2, 2, 1)
@@ -1,5 +1,13 @@
 import pytest
-from src.preprocess import transform_text, get_text_stats
+import pandas as pd
+from pathlib import Path
+import nltk
+from nltk.stem.porter import PorterStemmer
+from src.preprocess import (
+    NLTK_DATA_DIR, transform_text, get_text_stats, TextPreprocessor,
+    stem_token, get_stem_cache_info, clear_stem_cache, STEM_CACHE_SIZE,
+    transform_corpus
+)
 
 
 def test_transform_text_lowercase():
@@ -75,3 +83,86 @@ def test_transform_text_special_characters():
     assert len(result) > 0
     assert '$' not in result
     assert '>' not in result
+
+
+@pytest.fixture(scope="module")
+def preprocessor():
+    """Fixture to create a shared TextPreprocessor instance"""
+    return TextPreprocessor()
+
+
+@pytest.fixture(scope="module")
+def spam_corpus():
+    """Fixture loading the raw messages from the training dataset"""
+    df = pd.read_csv(Path(__file__).parent.parent / 'data' / 'spam.csv', encoding='latin-1')
+    return df['v2'].tolist()
+
+
+def test_text_preprocessor_matches_transform_text_on_dataset(preprocessor, spam_corpus):
+    """Test that TextPreprocessor output is identical to transform_text on every message"""
+    mismatches = [
+        text for text in spam_corpus
+        if preprocessor.transform(text) != transform_text(text)
+    ]
+    assert mismatches == []
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "   ",
+    "I cannot go, wanna come? gonna be late... gimme a call!",
+    "Don't worry, it's James' car. 'Tis fine 'twas d'ye more'n",
+    "Meet me at 5. Call 1,000 times: ok. Bye.",
+    "He said \"hello.\" Then left. ''",
+    "etc.\n ]\nwin",
+    "ok. mr. smith went to the u.s. st. louis etc. ''",
+    "hello.world (test.) [x] {y} <z> --dash-- a---b a,,b x:y 3:30",
+    "£1000 cash!!! Txt WIN to 80086 now*** @home #1 $5 & 10%",
+])
+def test_text_preprocessor_matches_transform_text_edge_cases(preprocessor, text):
+    """Test TextPreprocessor against transform_text on tokenizer edge cases"""
+    assert preprocessor.transform(text) == transform_text(text)
+
+
+def test_text_preprocessor_is_callable(preprocessor):
+    """Test that a TextPreprocessor can be called like transform_text"""
+    text = "Free entry in 2 a wkly comp to win FA Cup final tkts"
+    assert preprocessor(text) == transform_text(text)
+
+
+def test_stem_cache_counts_hits_and_misses():
+    """Test that repeated tokens are served from the stem cache"""
+    clear_stem_cache()
+    transform_text("free free free call")
+    info = get_stem_cache_info()
+
+    assert info['misses'] == 2
+    assert info['hits'] == 2
+    assert info['size'] == 2
+    assert info['max_size'] == STEM_CACHE_SIZE
+
+
+def test_stem_token_matches_porter_stemmer():
+    """Test that cached stems match the uncached stemmer"""
+    for token in ["jumping", "calls", "free", "winner", "claimed"]:
+        assert stem_token(token) == PorterStemmer().stem(token)
+
+
+def test_transform_corpus_parallel_preserves_order(spam_corpus):
+    """Test that parallel corpus preprocessing keeps row order"""
+    texts = spam_corpus[:200]
+    expected = [transform_text(text) for text in texts]
+
+    assert transform_corpus(texts, workers=2, chunk_size=30) == expected
+
+
+def test_transform_corpus_serial():
+    """Test that a single worker transforms the corpus in-process"""
+    texts = ["Free prize waiting", "Call me later"]
+    assert transform_corpus(texts, workers=1) == [transform_text(text) for text in texts]
+
+
+def test_nltk_resources_are_vendored():
+    """Test that stopwords and Punkt tables resolve to the bundled data directory"""
+    for resource in ('corpora/stopwords/english', 'tokenizers/punkt_tab/english/'):
+        assert str(nltk.data.find(resource)).startswith(NLTK_DATA_DIR)
@@ -0,0 +1,28 @@
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.profiler import SamplingProfiler
+
+
+def busy_wait(seconds):
+    """Spin on the CPU for the given number of seconds"""
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_profiler_samples_profiled_thread():
+    """Test that samples come from the profiled code in folded-stack format"""
+    with SamplingProfiler(interval=0.001) as profiler:
+        busy_wait(0.2)
+
+    lines = profiler.folded().splitlines()
+    assert lines
+    assert any("busy_wait (test_profiler.py" in line for line in lines)
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0
+    assert ";" in stack
@@ -0,0 +1,119 @@
+import pytest
+import pickle
+import shutil
+import sys
+from pathlib import Path
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.predict import SpamClassifier, ModelNotReadyError
+from src.preprocess import transform_text
+from src.registry import ModelRegistry
+
+MODELS_DIR = Path(__file__).parent.parent / 'models'
+
+
+@pytest.fixture(scope="module")
+def artifact_dir(tmp_path_factory):
+    """Fixture writing the shipped model and a logistic regression trained on the same vectorizer"""
+    path = tmp_path_factory.mktemp("registry")
+    shutil.copy(MODELS_DIR / 'model.pkl', path / 'nb.pkl')
+    shutil.copy(MODELS_DIR / 'vectorizer.pkl', path / 'vectorizer.pkl')
+
+    df = pd.read_csv(Path(__file__).parent.parent / 'data' / 'spam.csv', encoding='latin-1').head(1000)
+    with open(MODELS_DIR / 'vectorizer.pkl', 'rb') as f:
+        vectorizer = pickle.load(f)
+    features = vectorizer.transform([transform_text(text) for text in df['v2']])
+    model = LogisticRegression(max_iter=1000).fit(features, (df['v1'] == 'spam').astype(int))
+    with open(path / 'lr.pkl', 'wb') as f:
+        pickle.dump(model, f)
+    return path
+
+
+@pytest.fixture
+def registry(artifact_dir):
+    """Fixture registering both models against the shared vectorizer"""
+    registry = ModelRegistry()
+    registry.register('nb', str(artifact_dir / 'nb.pkl'), str(artifact_dir / 'vectorizer.pkl'), weight=3)
+    registry.register('lr', str(artifact_dir / 'lr.pkl'), str(artifact_dir / 'vectorizer.pkl'), weight=1)
+    return registry
+
+
+def test_models_with_same_vectorizer_share_one_copy(registry):
+    """Test that a vectorizer file is loaded once however many models use it"""
+    assert len(registry) == 2
+    assert len(registry._vectorizers) == 1
+    assert len({entry['vectorizer'] for entry in registry.get_models_info()}) == 1
+
+
+def test_compare_vectorizes_once_for_shared_vectorizer(registry, monkeypatch):
+    """Test that scoring one text with several models runs the TF-IDF transform once"""
+    vectorizer = next(iter(registry._vectorizers.values()))
+    calls = []
+    transform = vectorizer.transform
+    monkeypatch.setattr(vectorizer, 'transform', lambda texts: calls.append(texts) or transform(texts))
+
+    _, results = registry.compare("WINNER! Claim your free prize now")
+
+    assert set(results) == {'nb', 'lr'}
+    assert len(calls) == 1
+
+
+def test_registry_predictions_match_single_model_classifier(registry, artifact_dir):
+    """Test that a registry model scores exactly like SpamClassifier on the same artifacts"""
+    classifier = SpamClassifier(model_path=str(artifact_dir / 'nb.pkl'),
+                                vectorizer_path=str(artifact_dir / 'vectorizer.pkl'))
+    text = "Congratulations! You've won a free ticket"
+
+    name, loaded = registry.route('nb')
+    label, confidence, _, _ = classifier.predict_with_version(text, loaded)
+    expected_label, expected_confidence, _ = classifier.predict(text)
+
+    assert name == 'nb'
+    assert (label, confidence) == (expected_label, expected_confidence)
+
+
+def test_weighted_routing_is_sticky_and_skips_unweighted_models(registry, artifact_dir):
+    """Test that a routing key always reaches the same model and weight 0 is never routed"""
+    assert all(registry.select(routing_key='user-42') == registry.select(routing_key='user-42') for _ in range(10))
+
+    registry.register('lr', str(artifact_dir / 'lr.pkl'), str(artifact_dir / 'vectorizer.pkl'), weight=0)
+    assert {registry.select(routing_key=f'user-{i}') for i in range(50)} == {'nb'}
+    assert registry.select(model='lr') == 'lr'
+
+
+def test_weighted_routing_follows_weights(registry):
+    """Test that traffic is split roughly in proportion to the weights"""
+    picks = [registry.select(routing_key=f'user-{i}') for i in range(2000)]
+
+    assert 0.7 < picks.count('nb') / len(picks) < 0.8
+
+
+def test_unknown_and_unroutable_models_raise():
+    """Test selection errors for unknown names and an empty registry"""
+    registry = ModelRegistry()
+
+    with pytest.raises(KeyError):
+        registry.select(model='missing')
+    with pytest.raises(ModelNotReadyError):
+        registry.select()
+
+
+def test_registry_from_config(artifact_dir, tmp_path):
+    """Test building a registry from a JSON config file"""
+    config = tmp_path / 'registry.json'
+    config.write_text(
+        '{"models": [{"name": "nb", "model_path": "%s", "vectorizer_path": "%s", '
+        '"weight": 1, "model_version": "v2"}]}'
+        % (artifact_dir / 'nb.pkl', artifact_dir / 'vectorizer.pkl')
+    )
+    registry = ModelRegistry.from_config(str(config))
+
+    name, loaded = registry.route()
+    results, model_version = SpamClassifier(load=False).predict_batch_with_version(["hello", "free prize"], loaded)
+
+    assert (name, model_version) == ('nb', 'v2')
+    assert len(results) == 2
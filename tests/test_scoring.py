@@ -0,0 +1,69 @@
+import pytest
+import sys
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.svm import SVC, LinearSVC
+from src.artifacts import load_artifact
+from src.preprocess import transform_corpus
+from src.scoring import LinearScorer, ModelScorer, build_scorer
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    """Fixture to vectorize a slice of the training data"""
+    df = pd.read_csv("data/spam.csv", encoding="latin-1")[['v1', 'v2']].head(1200)
+    vectorizer = load_artifact("models/vectorizer.pkl")
+    X = vectorizer.transform(transform_corpus(df['v2'].tolist()))
+    y = (df['v1'] == 'spam').astype(int).values
+    return X[:800], y[:800], X[800:]
+
+
+def _reference(model, X):
+    """Labels from predict and confidences from predict_proba or the decision margin"""
+    if hasattr(model, 'predict_proba'):
+        return model.predict(X), model.predict_proba(X).max(axis=1)
+    return model.predict(X), np.abs(model.decision_function(X))
+
+
+@pytest.mark.parametrize("model, scorer_type", [
+    (MultinomialNB(), LinearScorer),
+    (SGDClassifier(loss='log_loss', random_state=42), LinearScorer),
+    (SGDClassifier(random_state=42), LinearScorer),
+    (LogisticRegression(), LinearScorer),
+    (LinearSVC(), LinearScorer),
+    (SVC(kernel='linear', probability=True, random_state=42), LinearScorer),
+    (SVC(kernel='rbf', probability=True, random_state=42), ModelScorer),
+    (RandomForestClassifier(n_estimators=10, random_state=42), ModelScorer),
+])
+def test_scorer_matches_sklearn(dataset, model, scorer_type):
+    """Test that each scorer reproduces sklearn's labels and confidences"""
+    X_train, y_train, X_test = dataset
+    model.fit(X_train, y_train)
+    scorer = build_scorer(model)
+    predictions, confidences = scorer.score(X_test)
+    expected_predictions, expected_confidences = _reference(model, X_test)
+
+    assert isinstance(scorer, scorer_type)
+    np.testing.assert_array_equal(predictions, expected_predictions)
+    np.testing.assert_allclose(confidences, expected_confidences, rtol=0, atol=1e-9)
+
+
+def test_linear_scorer_single_row_and_empty_row(dataset):
+    """Test the single-message fast path, including a message with no known terms"""
+    X_train, y_train, X_test = dataset
+    model = MultinomialNB().fit(X_train, y_train)
+    scorer = build_scorer(model)
+
+    for row in [X_test[:1], X_test[:1] * 0]:
+        predictions, confidences = scorer.score(row)
+        expected_predictions, expected_confidences = _reference(model, row)
+        assert predictions[0] == expected_predictions[0]
+        assert confidences[0] == pytest.approx(expected_confidences[0], abs=1e-12)
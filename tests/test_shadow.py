@@ -0,0 +1,101 @@
+import pytest
+import sys
+import threading
+from pathlib import Path
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.predict import SpamClassifier
+from src.shadow import ShadowEvaluator
+
+
+@pytest.fixture
+def classifier():
+    """Fixture to create classifier instance"""
+    return SpamClassifier(
+        model_path="models/model.pkl",
+        vectorizer_path="models/vectorizer.pkl"
+    )
+
+
+class BlockingModel:
+    """Candidate whose scoring waits until released, standing in for a slow model"""
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def predict(self, vector_input):
+        self.release.wait(10)
+        return np.zeros(vector_input.shape[0], dtype=int)
+
+
+def test_shadow_of_same_model_always_agrees(classifier):
+    """Test that a candidate identical to the primary agrees on every scored text"""
+    shadow = ShadowEvaluator(classifier.model, max_pending=1000)
+    classifier.add_score_listener(shadow.submit)
+
+    classifier.predict("WINNER! Claim your free prize now")
+    classifier.predict_batch(["See you at lunch", "Free entry in a weekly competition"])
+    shadow.shutdown()
+    stats = shadow.stats()
+
+    assert stats['scored'] == 2
+    assert stats['agreements'] == 3
+    assert stats['agreement_rate'] == 1.0
+    assert stats['dropped'] == 0
+
+
+def test_shadow_drops_work_under_back_pressure(classifier):
+    """Test that a saturated shadow pool drops inputs instead of delaying predictions"""
+    model = BlockingModel()
+    shadow = ShadowEvaluator(model, max_pending=1)
+    classifier.add_score_listener(shadow.submit)
+
+    classifier.predict("first message")
+    classifier.predict("second message")
+    classifier.predict("third message")
+    model.release.set()
+    shadow.shutdown()
+    stats = shadow.stats()
+
+    assert stats['submitted'] == 1
+    assert stats['dropped'] == 2
+    assert stats['scored'] == 1
+
+
+def test_shadow_failures_are_counted_not_raised(classifier):
+    """Test that a candidate that cannot score the input never breaks the primary prediction"""
+    shadow = ShadowEvaluator(object())
+    classifier.add_score_listener(shadow.submit)
+
+    prediction, _, _ = classifier.predict("Win a free prize now!")
+    shadow.shutdown()
+
+    assert prediction in ['spam', 'not_spam']
+    assert shadow.stats()['errors'] == 1
+
+
+def test_shadow_reports_disagreement():
+    """Test that disagreement and the result callback are recorded per row"""
+    from scipy.sparse import csr_matrix
+
+    results = []
+    shadow = ShadowEvaluator(BlockingModel(), on_result=lambda *result: results.append(result))
+    shadow.model.release.set()
+
+    shadow.submit(csr_matrix(np.ones((2, 3))), ['spam', 'not_spam'], [0.9, 0.8], 'v1')
+    shadow.shutdown()
+
+    assert shadow.stats()['disagreements'] == 1
+    assert results[0][:2] == (1, 1)
+
+
+def test_shadow_checks_feature_count(classifier):
+    """Test that a candidate fitted on a different vectorizer is rejected"""
+    from sklearn.naive_bayes import MultinomialNB
+
+    ShadowEvaluator(classifier.model).check_features(classifier.vectorizer)
+    with pytest.raises(ValueError, match="expects 3 features"):
+        ShadowEvaluator(MultinomialNB().fit(np.eye(3), [0, 1, 1])).check_features(classifier.vectorizer)
@@ -0,0 +1,72 @@
+import pytest
+import sys
+import warnings
+from pathlib import Path
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.sweep import build_grid, parse_ngram_range, run_trials, select_best
+
+TEXTS = [
+    "win free prize claim now", "free entri weekli competit", "urgent call claim cash prize",
+    "see you at lunch", "are we still meet today", "call me when you get home",
+    "congratul you won free ticket", "ok lar joke wif u"
+]
+LABELS = np.array([1, 1, 1, 0, 0, 0, 1, 0])
+
+
+def test_parse_ngram_range():
+    """Test parsing n-gram ranges written as min-max"""
+    assert parse_ngram_range("1-2") == (1, 2)
+
+
+def test_build_grid_covers_every_combination():
+    """Test that the grid has one trial per algorithm x max_features x ngram_range"""
+    grid = build_grid(['naive_bayes', 'sgd'], [100, 200], [(1, 1), (1, 2)])
+
+    assert len(grid) == 8
+    assert {'algorithm': 'sgd', 'max_features': 200, 'ngram_range': (1, 2)} in grid
+    with pytest.raises(ValueError):
+        build_grid(['unknown'], [100], [(1, 1)])
+
+
+def test_run_trials_reuses_shared_features():
+    """Test that trials sharing vectorizer settings are evaluated on the same fitted features"""
+    vectorizer = TfidfVectorizer(max_features=50, ngram_range=(1, 1))
+    features = {(50, (1, 1)): (vectorizer.fit_transform(TEXTS), vectorizer.transform(TEXTS))}
+    trials = build_grid(['naive_bayes', 'sgd'], [50], [(1, 1)])
+
+    results = list(run_trials(trials, features, (LABELS, LABELS), workers=1))
+
+    assert {result['algorithm'] for result in results} == {'naive_bayes', 'sgd'}
+    assert all(0 <= result['f1_score'] <= 1 for result in results)
+
+
+def test_select_best_trades_metric_against_latency():
+    """Test that the latency weight and limit change which trial wins"""
+    results = [
+        {'algorithm': 'svm', 'f1_score': 0.95, 'latency_ms': 2.0, 'single_p95_ms': 3.0},
+        {'algorithm': 'naive_bayes', 'f1_score': 0.93, 'latency_ms': 0.5, 'single_p95_ms': 0.8}
+    ]
+
+    assert select_best(results)['algorithm'] == 'svm'
+    assert select_best(results, latency_weight=0.02)['algorithm'] == 'naive_bayes'
+    assert select_best(results, latency_budget_ms=1.0)['algorithm'] == 'naive_bayes'
+    with pytest.raises(ValueError):
+        select_best(results, latency_budget_ms=0.1)
+
+
+def test_run_trials_scores_undefined_metrics_as_zero():
+    """Test that precision, recall and F1 are 0 without warnings when a test split has no positives"""
+    vectorizer = TfidfVectorizer(max_features=50)
+    features = {(50, (1, 1)): (vectorizer.fit_transform(TEXTS), vectorizer.transform(TEXTS[3:6]))}
+    trials = build_grid(['naive_bayes'], [50], [(1, 1)])
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        result = next(run_trials(trials, features, (LABELS, np.zeros(3, dtype=int)), workers=1))
+
+    assert result['recall'] == result['f1_score'] == 0.0
@@ -0,0 +1,95 @@
+import pytest
+import json
+import os
+import pickle
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.predict import SpamClassifier
+from src.train import encode_labels, publish_artifacts, train_model_incremental, train_model_streaming
+
+MODELS_DIR = str(Path(__file__).parent.parent / 'models')
+CAMPAIGN = "Hi mum, I lost my phone, this is my new number, can you send me some money"
+
+
+@pytest.fixture
+def base_artifacts():
+    """Fixture loading the shipped model and vectorizer"""
+    with open(os.path.join(MODELS_DIR, 'model.pkl'), 'rb') as f:
+        model = pickle.load(f)
+    with open(os.path.join(MODELS_DIR, 'vectorizer.pkl'), 'rb') as f:
+        vectorizer = pickle.load(f)
+    return model, vectorizer
+
+
+@pytest.fixture
+def mlflow_dir(tmp_path, monkeypatch):
+    """Fixture keeping MLflow runs in a temporary directory"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("MLFLOW_TRACKING_URI", f"file://{tmp_path / 'mlruns'}")
+    return tmp_path
+
+
+def test_encode_labels():
+    """Test that spam/ham and 1/0 labels map to 0/1"""
+    assert encode_labels(["spam", "HAM", "1", 0]).tolist() == [1, 0, 1, 0]
+    with pytest.raises(ValueError):
+        encode_labels(["maybe"])
+
+
+def test_publish_artifacts_swaps_current_pointer(base_artifacts, tmp_path):
+    """Test that each publish adds a version, moves the pointer and prunes old versions"""
+    model, vectorizer = base_artifacts
+
+    first = publish_artifacts(model, vectorizer, str(tmp_path), keep=1)
+    classifier = SpamClassifier(str(tmp_path / 'current' / 'model.joblib'),
+                                str(tmp_path / 'current' / 'vectorizer.joblib'))
+    signature = classifier._artifact_signature()
+
+    model.partial_fit(vectorizer.transform(["lost phone new number send money"]), [1])
+    second = publish_artifacts(model, vectorizer, str(tmp_path), keep=1)
+
+    assert os.path.realpath(tmp_path / 'current') == os.path.realpath(second)
+    assert not os.path.exists(first)
+    assert os.listdir(tmp_path / 'versions') == [os.path.basename(second)]
+    assert classifier._artifact_signature() != signature
+
+
+def test_incremental_update_learns_from_feedback(mlflow_dir):
+    """Test that feedback updates the current model and publishes it without touching the base"""
+    feedback = mlflow_dir / "feedback.jsonl"
+    feedback.write_text("".join(
+        json.dumps({"text": text, "label": label}) + "\n"
+        for text, label in [(CAMPAIGN, "spam"), ("Lunch at 1 tomorrow?", "ham")]
+    ))
+    output_dir = mlflow_dir / "published"
+    base = SpamClassifier(os.path.join(MODELS_DIR, 'model.pkl'), os.path.join(MODELS_DIR, 'vectorizer.pkl'))
+
+    version_dir = train_model_incremental(str(feedback), base_dir=MODELS_DIR, output_dir=str(output_dir),
+                                          sample_weight=50.0)
+
+    updated = SpamClassifier(os.path.join(version_dir, 'model.pkl'), os.path.join(version_dir, 'vectorizer.pkl'))
+    assert base.predict(CAMPAIGN)[0] == 'not_spam'
+    assert updated.predict(CAMPAIGN)[0] == 'spam'
+    assert os.path.realpath(output_dir / 'current') == os.path.realpath(version_dir)
+    assert not os.path.exists(os.path.join(MODELS_DIR, 'current'))
+
+
+def test_streaming_training_without_holdout_skips_cost_check(mlflow_dir):
+    """Test that streaming training with no held-out rows saves the model instead of failing the benchmark"""
+    data_path = mlflow_dir / "spam.csv"
+    data_path.write_text("v1,v2\n" + "".join(
+        f"{label},{text} {i}\n" for i in range(20)
+        for label, text in [("spam", "Win a free prize now"), ("ham", "See you at lunch")]
+    ), encoding='latin-1')
+    output_dir = mlflow_dir / "models"
+
+    train_model_streaming(data_path=str(data_path), test_fraction=0.0, output_dir=str(output_dir),
+                          n_features=2 ** 10)
+
+    assert os.path.exists(output_dir / 'model.pkl')
+    with open('training_stats.json') as f:
+        assert json.load(f)['inference'] is None